@@ -0,0 +1,66 @@
+import zlib
+
+
+def _escape(text):
+    return str(text).replace("\\", "\\\\").replace("(", "\\(").replace(")", "\\)")
+
+
+class SimplePDF:
+    """
+    Penulis PDF minimal (teks Helvetica + garis) untuk membuat statement sintetis
+    tanpa dependensi tambahan. Koordinat memakai sistem PDF: (0, 0) di kiri bawah.
+    """
+
+    def __init__(self, width=842, height=595):
+        # Default A4 landscape, seperti kebanyakan export rekening koran
+        self.width = width
+        self.height = height
+        self.pages = []
+        self._ops = None
+
+    def new_page(self):
+        self._ops = []
+        self.pages.append(self._ops)
+
+    def text(self, x, y, value, size=8):
+        self._ops.append(f"BT /F1 {size} Tf {x:.2f} {y:.2f} Td ({_escape(value)}) Tj ET")
+
+    def line(self, x1, y1, x2, y2, width=0.5):
+        self._ops.append(f"{width} w {x1:.2f} {y1:.2f} m {x2:.2f} {y2:.2f} l S")
+
+    def grid(self, xs, ys):
+        """Garis tabel: garis vertikal di tiap xs dan horizontal di tiap ys."""
+        for y in ys:
+            self.line(xs[0], y, xs[-1], y)
+        for x in xs:
+            self.line(x, ys[0], x, ys[-1])
+
+    def save(self, path):
+        n_pages = len(self.pages)
+        # Objek: 1 catalog, 2 pages, 3 font, lalu (page, content) per halaman
+        page_ids = [4 + i * 2 for i in range(n_pages)]
+        objects = {
+            1: b"<< /Type /Catalog /Pages 2 0 R >>",
+            2: ("<< /Type /Pages /Kids [%s] /Count %d >>"
+                % (" ".join(f"{pid} 0 R" for pid in page_ids), n_pages)).encode("latin-1"),
+            3: b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica /Encoding /WinAnsiEncoding >>",
+        }
+        for pid, ops in zip(page_ids, self.pages):
+            stream = zlib.compress("\n".join(ops).encode("latin-1"))
+            objects[pid] = (f"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 {self.width} {self.height}] "
+                            f"/Resources << /Font << /F1 3 0 R >> >> /Contents {pid + 1} 0 R >>").encode("latin-1")
+            objects[pid + 1] = (f"<< /Length {len(stream)} /Filter /FlateDecode >>\nstream\n".encode("latin-1")
+                                + stream + b"\nendstream")
+
+        with open(path, "wb") as f:
+            f.write(b"%PDF-1.4\n")
+            offsets = {}
+            for oid in sorted(objects):
+                offsets[oid] = f.tell()
+                f.write(f"{oid} 0 obj\n".encode("latin-1") + objects[oid] + b"\nendobj\n")
+            xref = f.tell()
+            size = max(objects) + 1
+            f.write(f"xref\n0 {size}\n0000000000 65535 f \n".encode("latin-1"))
+            for oid in range(1, size):
+                f.write(f"{offsets[oid]:010d} 00000 n \n".encode("latin-1"))
+            f.write(f"trailer\n<< /Size {size} /Root 1 0 R >>\nstartxref\n{xref}\n%%EOF\n".encode("latin-1"))
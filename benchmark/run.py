@@ -0,0 +1,190 @@
+"""
+Benchmark parser dengan statement sintetis.
+
+    python -m benchmark.run
+    python -m benchmark.run --banks BNI BRI --pages 10 100 --rows 30 --multiline 0.4
+    python -m benchmark.run --save baseline.json
+    python -m benchmark.run --compare baseline.json
+    python -m benchmark.run --formats xlsx csv parquet sqlite
+
+Tiap pengukuran berjalan di proses baru (spawn) supaya peak RSS tidak tercampur
+dengan pengukuran sebelumnya. Waktu hanya mencakup pemanggilan fungsi parser;
+import pdfplumber/pandas dilakukan sebelum timer dimulai. Kolom write_seconds
+adalah tahap "write" parser (DataFrame -> file output), untuk membandingkan biaya
+tiap format output; kosong di mode --stream karena penulisan berjalan bersama ekstraksi.
+"""
+import os
+import sys
+import json
+import time
+import argparse
+import tempfile
+import importlib
+import contextlib
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+
+if __package__ in (None, ""):
+    sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmark.synthetic import LAYOUTS
+from parser.writers import OUTPUT_FORMATS
+
+# Batas penurunan (relatif ke baseline) yang dianggap regresi
+REGRESSION_TOLERANCE = 0.15
+
+
+def peak_rss_mb():
+    """Peak RSS proses ini dalam MB. None jika tidak tersedia di platform ini."""
+    try:
+        import resource
+    except ImportError:
+        try:
+            import psutil
+        except ImportError:
+            return None
+        info = psutil.Process().memory_info()
+        return getattr(info, "peak_wset", info.rss) / (1024 * 1024)
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # macOS melaporkan byte, Linux kilobyte
+    return peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024
+
+
+class _StageTimes:
+    """Recorder minimal untuk parser.common.set_recorder: hanya menjumlahkan waktu per tahap."""
+
+    def __init__(self):
+        self.stages = {}
+
+    def add_stage(self, name, seconds):
+        self.stages[name] = self.stages.get(name, 0.0) + seconds
+
+    def add_page(self, page_number, seconds):
+        pass
+
+
+def _measure(module_name, function_name, pdf_path, output_path, kwargs):
+    """Dijalankan di proses baru: panggil parser sekali, return (hasil, detik, detik tahap write, peak RSS)."""
+    for name in ("pdfplumber", "pandas", "xlsxwriter", "pyarrow"):
+        with contextlib.suppress(ImportError):
+            importlib.import_module(name)
+    from parser.common import set_recorder
+    func = getattr(importlib.import_module(module_name), function_name)
+
+    times = _StageTimes()
+    set_recorder(times)
+    with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull):
+        start = time.perf_counter()
+        result = func(pdf_path, output_path, **kwargs)
+        elapsed = time.perf_counter() - start
+    return (result if isinstance(result, int) else 0), elapsed, times.stages.get("write"), peak_rss_mb()
+
+
+def run_case(bank, pages, rows_per_page, multiline, workdir, repeat=1, stream=False, seed=0, fmt="xlsx"):
+    """Generate PDF sintetis untuk satu bank lalu ukur parsernya (output format `fmt`). Return dict hasil."""
+    generate, module_name, function_name = LAYOUTS[bank]
+    pdf_path = os.path.join(workdir, f"{bank}_{pages}p_{rows_per_page}r.pdf")
+    output_path = os.path.join(workdir, f"{bank}_{pages}p_{rows_per_page}r{OUTPUT_FORMATS[fmt]}")
+    if not os.path.exists(pdf_path):
+        generate(pdf_path, pages=pages, rows_per_page=rows_per_page, multiline=multiline, seed=seed)
+
+    kwargs = {"stream": True} if stream else {}
+    ctx = multiprocessing.get_context("spawn")
+    best = None
+    for _ in range(repeat):
+        with ProcessPoolExecutor(max_workers=1, mp_context=ctx) as pool:
+            measured = pool.submit(_measure, module_name, function_name, pdf_path, output_path, kwargs).result()
+        if best is None or measured[1] < best[1]:
+            best = measured
+
+    rows, seconds, write_seconds, rss = best
+    return {
+        "bank": bank, "pages": pages, "rows_per_page": rows_per_page, "multiline": multiline,
+        "stream": stream, "format": fmt, "rows": rows, "seconds": round(seconds, 4),
+        "write_seconds": round(write_seconds, 4) if write_seconds is not None else None,
+        "pages_per_sec": round(pages / seconds, 2) if seconds else None,
+        "rows_per_sec": round(rows / seconds, 2) if seconds else None,
+        "peak_rss_mb": round(rss, 1) if rss is not None else None,
+    }
+
+
+def _case_key(r):
+    return f"{r['bank']}|{r['pages']}|{r['rows_per_page']}|{r['multiline']}|{r['stream']}|{r.get('format', 'xlsx')}"
+
+
+def compare(results, baseline, tolerance=REGRESSION_TOLERANCE):
+    """Bandingkan dengan baseline. Return list pesan regresi (kosong jika aman)."""
+    base = {_case_key(r): r for r in baseline}
+    problems = []
+    for r in results:
+        old = base.get(_case_key(r))
+        if not old:
+            continue
+        label = f"{r['bank']} {r['pages']} hal {r.get('format', 'xlsx')}"
+        if old["rows"] != r["rows"]:
+            problems.append(f"{label}: jumlah baris berubah {old['rows']} -> {r['rows']}")
+        if old["pages_per_sec"] and r["pages_per_sec"] and r["pages_per_sec"] < old["pages_per_sec"] * (1 - tolerance):
+            problems.append(f"{label}: pages/sec turun {old['pages_per_sec']} -> {r['pages_per_sec']}")
+        if old["peak_rss_mb"] and r["peak_rss_mb"] and r["peak_rss_mb"] > old["peak_rss_mb"] * (1 + tolerance):
+            problems.append(f"{label}: peak RSS naik {old['peak_rss_mb']} -> {r['peak_rss_mb']} MB")
+    return problems
+
+
+def print_table(results):
+    cols = ["bank", "pages", "format", "rows", "seconds", "write_seconds", "pages_per_sec", "rows_per_sec", "peak_rss_mb"]
+    widths = [max(len(c), *(len(str(r[c])) for r in results)) for c in cols]
+    print("  ".join(c.ljust(w) for c, w in zip(cols, widths)))
+    print("  ".join("-" * w for w in widths))
+    for r in results:
+        print("  ".join(str(r[c]).ljust(w) for c, w in zip(cols, widths)))
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description="Benchmark parser FinExtract dengan PDF sintetis.")
+    ap.add_argument("--banks", nargs="+", default=list(LAYOUTS), choices=list(LAYOUTS))
+    ap.add_argument("--pages", nargs="+", type=int, default=[10, 100])
+    ap.add_argument("--rows", type=int, default=25, help="baris tabel per halaman")
+    ap.add_argument("--multiline", type=float, default=0.2, help="fraksi transaksi dengan remark multi-baris")
+    ap.add_argument("--repeat", type=int, default=1, help="ambil waktu terbaik dari N kali jalan")
+    ap.add_argument("--stream", action="store_true", help="pakai mode output streaming parser")
+    ap.add_argument("--formats", nargs="+", default=["xlsx"], choices=list(OUTPUT_FORMATS),
+                    help="format output yang diukur (biaya tulis per format)")
+    ap.add_argument("--seed", type=int, default=0)
+    ap.add_argument("--workdir", help="folder PDF sintetis (default: folder sementara, dihapus setelah selesai)")
+    ap.add_argument("--save", help="simpan hasil ke file JSON (baseline)")
+    ap.add_argument("--compare", help="bandingkan dengan baseline JSON; exit 1 jika ada regresi")
+    args = ap.parse_args(argv)
+
+    with contextlib.ExitStack() as stack:
+        workdir = args.workdir or stack.enter_context(tempfile.TemporaryDirectory(prefix="finextract_bench_"))
+        os.makedirs(workdir, exist_ok=True)
+        results = []
+        for bank in args.banks:
+            for pages in args.pages:
+                for fmt in args.formats:
+                    print(f"[{bank}] {pages} halaman x {args.rows} baris -> {fmt}...", flush=True)
+                    results.append(run_case(bank, pages, args.rows, args.multiline, workdir,
+                                            repeat=args.repeat, stream=args.stream, seed=args.seed, fmt=fmt))
+
+    print()
+    print_table(results)
+
+    if args.save:
+        with open(args.save, "w") as f:
+            json.dump(results, f, indent=2)
+        print(f"\nHasil disimpan ke {args.save}")
+
+    if args.compare:
+        with open(args.compare, "r") as f:
+            problems = compare(results, json.load(f))
+        if problems:
+            print("\nREGRESI:")
+            for p in problems:
+                print(f"  - {p}")
+            return 1
+        print("\nTidak ada regresi dibanding baseline.")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
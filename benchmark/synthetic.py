@@ -0,0 +1,210 @@
+import random
+from datetime import date, timedelta
+from benchmark.pdfgen import SimplePDF
+
+REMARK_WORDS = ["TRANSFER", "KE", "DARI", "PEMBAYARAN", "INV", "PT", "SUMBER", "MAKMUR", "JAYA", "ABADI",
+                "SETORAN", "TUNAI", "BIAYA", "ADM", "GAJI", "KARYAWAN", "TAGIHAN", "LISTRIK", "CV", "SENTOSA"]
+
+LINE_HEIGHT = 10
+TOP_MARGIN = 70
+BOTTOM_MARGIN = 40
+
+
+class _Statement:
+    """Data transaksi acak yang deterministik (seed), dipakai semua generator."""
+
+    def __init__(self, seed=0, multiline=0.2):
+        self.rng = random.Random(seed)
+        self.multiline = multiline
+        self.day = date(2025, 1, 1)
+        self.balance = 50_000_000.0
+        self.no = 0
+
+    def remark(self, words=(3, 6)):
+        return " ".join(self.rng.choice(REMARK_WORDS) for _ in range(self.rng.randint(*words)))
+
+    def has_extra_line(self):
+        return self.rng.random() < self.multiline
+
+    def next_transaction(self):
+        """Return (tanggal, amount, is_debit, balance) transaksi berikutnya."""
+        self.no += 1
+        if self.rng.random() < 0.3:
+            self.day += timedelta(days=1)
+        amount = round(self.rng.uniform(10_000, 25_000_000), -2)
+        is_debit = self.rng.random() < 0.5 and amount < self.balance
+        self.balance += -amount if is_debit else amount
+        return self.day, amount, is_debit, self.balance
+
+    def ref(self):
+        return str(self.rng.randint(10_000_000, 99_999_999))
+
+
+def money(value):
+    return f"{value:,.2f}"
+
+
+def _page_height(rows_per_page, max_lines=2):
+    return max(595, TOP_MARGIN + BOTTOM_MARGIN + rows_per_page * (max_lines * LINE_HEIGHT + 4))
+
+
+def _column_edges(widths, left=30):
+    xs = [left]
+    for w in widths:
+        xs.append(xs[-1] + w)
+    return xs
+
+
+def _draw_title(pdf, lines):
+    y = pdf.height - 30
+    for line in lines:
+        pdf.text(30, y, line, size=10)
+        y -= 14
+
+
+def _draw_ruled_rows(pdf, xs, rows, top):
+    """Gambar baris tabel bergaris; sel boleh berisi beberapa baris teks ('\\n')."""
+    ys = [top]
+    y = top
+    for row in rows:
+        n_lines = max(len(str(cell).split("\n")) for cell in row)
+        height = n_lines * LINE_HEIGHT + 4
+        for x, cell in zip(xs, row):
+            for k, part in enumerate(str(cell).split("\n")):
+                if part:
+                    pdf.text(x + 2, y - 10 - k * LINE_HEIGHT, part)
+        y -= height
+        ys.append(y)
+    pdf.grid(xs, ys)
+
+
+def _ruled_pdf(path, title, headers, widths, rows, pages, rows_per_page, header_every_page=True):
+    pdf = SimplePDF(height=_page_height(rows_per_page))
+    xs = _column_edges(widths)
+    for p in range(pages):
+        pdf.new_page()
+        _draw_title(pdf, title + [f"Halaman {p + 1} dari {pages}"])
+        page_rows = [next(rows) for _ in range(rows_per_page)]
+        if header_every_page or p == 0:
+            page_rows.insert(0, headers)
+        _draw_ruled_rows(pdf, xs, page_rows, pdf.height - TOP_MARGIN)
+    pdf.save(path)
+
+
+# --- Generator per layout bank ---
+
+def generate_bni(path, pages=10, rows_per_page=25, multiline=0.2, seed=0):
+    """Tabel bergaris BNI; baris lanjutan Remark berupa baris tanpa No. (bisa pindah halaman)."""
+    st = _Statement(seed, multiline)
+
+    def rows():
+        while True:
+            day, amount, is_debit, balance = st.next_transaction()
+            yield [str(st.no), day.strftime("%d/%m/%y"), st.remark(), st.ref(), "",
+                   money(amount), "D" if is_debit else "C", money(balance)]
+            if st.has_extra_line():
+                yield ["", "", st.remark((2, 4)), "", "", "", "", ""]
+
+    headers = ["No.", "Post Date", "Branch", "Journal No.", "Description", "Amount", "Db/Cr", "Balance"]
+    title = ["PT BANK NEGARA INDONESIA (PERSERO) TBK", "BNIDIRECT - ACCOUNT STATEMENT"]
+    _ruled_pdf(path, title, headers, [35, 60, 240, 70, 90, 90, 40, 100], rows(), pages, rows_per_page)
+
+
+def generate_bri(path, pages=10, rows_per_page=25, multiline=0.2, seed=0):
+    """Layout teks BRI: satu baris per transaksi, uraian lanjutan di baris berikutnya."""
+    st = _Statement(seed, multiline)
+    pdf = SimplePDF(height=_page_height(rows_per_page, max_lines=2) + rows_per_page * 4)
+    xs = [30, 125, 380, 450, 560, 670]
+    for p in range(pages):
+        pdf.new_page()
+        _draw_title(pdf, ["PT BANK RAKYAT INDONESIA (PERSERO) TBK", "LAPORAN TRANSAKSI IBBIZ"])
+        y = pdf.height - TOP_MARGIN
+        for x, h in zip(xs, ["Tanggal Transaksi", "Uraian Transaksi", "Teller", "Debet", "Kredit", "Saldo"]):
+            pdf.text(x, y, h)
+        y -= 2 * LINE_HEIGHT
+        for _ in range(rows_per_page):
+            day, amount, is_debit, balance = st.next_transaction()
+            cells = [day.strftime("%d/%m/%y") + f" {st.rng.randint(0, 23):02d}:{st.rng.randint(0, 59):02d}:00",
+                     st.remark(), st.ref(), money(amount if is_debit else 0), money(0 if is_debit else amount),
+                     money(balance)]
+            for x, cell in zip(xs, cells):
+                pdf.text(x, y, cell)
+            y -= LINE_HEIGHT + 4
+            if st.has_extra_line():
+                pdf.text(xs[1], y, st.remark((2, 4)))
+                y -= LINE_HEIGHT + 4
+        pdf.text(30, BOTTOM_MARGIN - 20, f"Halaman {p + 1} dari {pages}")
+    pdf.save(path)
+
+
+def generate_ocbc(path, pages=10, rows_per_page=25, multiline=0.2, seed=0):
+    """Tabel bergaris OCBC; uraian lanjutan berupa baris tanpa tanggal."""
+    st = _Statement(seed, multiline)
+
+    def rows():
+        yield ["", "", "SALDO AWAL", "", "", money(st.balance)]
+        while True:
+            day, amount, is_debit, balance = st.next_transaction()
+            d = day.strftime("%d/%m")
+            yield [d, d, st.remark(), money(amount) if is_debit else "", "" if is_debit else money(amount),
+                   money(balance)]
+            if st.has_extra_line():
+                yield ["", "", st.remark((2, 4)), "", "", ""]
+
+    headers = ["TGL TRANS", "TGL VALUTA", "URAIAN", "DEBET", "KREDIT", "SALDO"]
+    title = ["PT BANK OCBC NISP TBK", "LAPORAN REKENING"]
+    _ruled_pdf(path, title, headers, [60, 60, 300, 110, 110, 120], rows(), pages, rows_per_page)
+
+
+def generate_mandiri(path, pages=10, rows_per_page=25, multiline=0.2, seed=0):
+    """Tabel bergaris Mandiri (header hanya di halaman pertama); Remark multi-baris di dalam sel."""
+    st = _Statement(seed, multiline)
+
+    def rows():
+        while True:
+            day, amount, is_debit, balance = st.next_transaction()
+            remark = st.remark()
+            if st.has_extra_line():
+                remark += "\n" + st.remark((2, 4))
+            yield [day.strftime("%d/%m/%Y"), remark, st.ref(), money(amount) if is_debit else "0.00",
+                   "0.00" if is_debit else money(amount), money(balance)]
+
+    headers = ["Posting Date", "Remark", "Reference No", "Debit", "Credit", "Balance"]
+    title = ["PT BANK MANDIRI (PERSERO) TBK", "ACCOUNT STATEMENT"]
+    _ruled_pdf(path, title, headers, [80, 280, 90, 110, 110, 120], rows(), pages, rows_per_page,
+               header_every_page=False)
+
+
+def generate_livin(path, pages=10, rows_per_page=25, multiline=0.2, seed=0):
+    """Layout tabel tanpa garis export Livin' by Mandiri; Remark lanjutan di baris berikutnya."""
+    st = _Statement(seed, multiline)
+    pdf = SimplePDF(height=_page_height(rows_per_page, max_lines=2) + rows_per_page * 4)
+    xs = [30, 150, 400, 500, 600, 700]
+    for p in range(pages):
+        pdf.new_page()
+        _draw_title(pdf, ["LIVIN' BY MANDIRI", "Riwayat Transaksi"])
+        y = pdf.height - TOP_MARGIN
+        for x, h in zip(xs, ["Posting Date", "Remark", "Reference No", "Debit", "Credit", "Balance"]):
+            pdf.text(x, y, h)
+        y -= 2 * LINE_HEIGHT
+        for _ in range(rows_per_page):
+            day, amount, is_debit, balance = st.next_transaction()
+            cells = [day.strftime("%d %b %Y"), st.remark(), st.ref(), money(amount) if is_debit else "0.00",
+                     "0.00" if is_debit else money(amount), money(balance)]
+            for x, cell in zip(xs, cells):
+                pdf.text(x, y, cell)
+            y -= LINE_HEIGHT + 4
+            if st.has_extra_line():
+                pdf.text(xs[1], y, st.remark((2, 4)))
+                y -= LINE_HEIGHT + 4
+    pdf.save(path)
+
+
+# (generator, modul parser, fungsi parser)
+LAYOUTS = {
+    "BNI": (generate_bni, "parser.BNI", "extract_bni_data"),
+    "BRI": (generate_bri, "parser.BRI", "extract_bri_text"),
+    "OCBC": (generate_ocbc, "parser.OCBC", "process_ocbc_final"),
+    "Mandiri": (generate_mandiri, "parser.Mandiri", "process_bank_statement"),
+    "Livin": (generate_livin, "parser.Livin", "process_livin_statement"),
+}
@@ -0,0 +1,121 @@
+import os
+import json
+import time
+import shutil
+import hashlib
+import tempfile
+
+DEFAULT_CACHE_DIR = os.path.join(os.path.expanduser("~"), "FinExtract_Cache")
+
+# File .tmp lebih tua dari ini dianggap sisa penulisan yang crash (bukan store yang sedang berjalan)
+STALE_TMP_SECONDS = 3600
+
+
+def file_sha256(path, block_size=1024 * 1024):
+    """Hash isi file (bukan nama/path), dibaca per blok agar hemat memori."""
+    h = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(block_size), b""):
+            h.update(block)
+    return h.hexdigest()
+
+
+class ResultCache:
+    """
+    Cache hasil ekstraksi di disk, dikunci dengan hash isi PDF + modul parser +
+    versi parser (PARSER_VERSION). Isi entry: file output + metadata (jumlah baris).
+
+    Tidak ada index bersama: LRU memakai mtime file entry (disentuh saat hit), jadi
+    aman dipakai bersamaan oleh beberapa proses worker.
+    """
+
+    def __init__(self, cache_dir=None, max_bytes=500 * 1024 * 1024):
+        self.cache_dir = cache_dir or DEFAULT_CACHE_DIR
+        self.max_bytes = max_bytes
+
+    def _key(self, file_hash, module_name, version, ext):
+        raw = f"{file_hash}|{module_name}|{version}|{ext}"
+        return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+    def _paths(self, key, ext):
+        return os.path.join(self.cache_dir, key + ext), os.path.join(self.cache_dir, key + ".json")
+
+    def fetch(self, file_hash, module_name, version, dest_path):
+        """Salin hasil cache ke dest_path. Return jumlah baris, atau None jika tidak ada."""
+        ext = os.path.splitext(dest_path)[1].lower()
+        data_path, meta_path = self._paths(self._key(file_hash, module_name, version, ext), ext)
+        try:
+            with open(meta_path, "r") as f:
+                meta = json.load(f)
+            shutil.copyfile(data_path, dest_path)
+        except (OSError, ValueError):
+            return None
+        # Tandai baru dipakai (LRU)
+        try:
+            os.utime(data_path)
+            os.utime(meta_path)
+        except OSError: pass
+        return meta.get("rows")
+
+    def store(self, file_hash, module_name, version, output_path, rows):
+        """Simpan salinan output_path ke cache lalu jalankan eviction."""
+        ext = os.path.splitext(output_path)[1].lower()
+        data_path, meta_path = self._paths(self._key(file_hash, module_name, version, ext), ext)
+        tmp_paths = []
+        try:
+            os.makedirs(self.cache_dir, exist_ok=True)
+            # Tulis ke file sementara lalu rename, supaya entry tidak pernah setengah jadi
+            fd, tmp_data = tempfile.mkstemp(dir=self.cache_dir, suffix=".tmp")
+            tmp_paths.append(tmp_data)
+            os.close(fd)
+            shutil.copyfile(output_path, tmp_data)
+            os.replace(tmp_data, data_path)
+            fd, tmp_meta = tempfile.mkstemp(dir=self.cache_dir, suffix=".tmp")
+            tmp_paths.append(tmp_meta)
+            with os.fdopen(fd, "w") as f:
+                json.dump({"rows": rows, "module": module_name, "version": version}, f)
+            os.replace(tmp_meta, meta_path)
+        except OSError:
+            # Disk penuh dll.: jangan tinggalkan file sementara
+            for path in tmp_paths:
+                try:
+                    os.remove(path)
+                except OSError: pass
+            return
+        self.evict()
+
+    def evict(self):
+        """
+        Hapus entry yang paling lama tidak dipakai sampai total ukuran <= max_bytes.
+        File .tmp sisa proses yang crash (lebih tua dari STALE_TMP_SECONDS) ikut dibersihkan.
+        """
+        try:
+            names = os.listdir(self.cache_dir)
+        except OSError:
+            return
+        stale = time.time() - STALE_TMP_SECONDS
+        entries = []
+        for name in names:
+            if name.endswith(".json"):
+                continue
+            path = os.path.join(self.cache_dir, name)
+            try:
+                st = os.stat(path)
+                if name.endswith(".tmp"):
+                    if st.st_mtime < stale:
+                        os.remove(path)
+                    continue
+            except OSError:
+                # Dihapus/di-rename proses lain di tengah scan
+                continue
+            entries.append((st.st_mtime, st.st_size, path))
+
+        total = sum(size for _, size, _ in entries)
+        for _, size, path in sorted(entries):
+            if total <= self.max_bytes:
+                break
+            try:
+                os.remove(path)
+                os.remove(os.path.splitext(path)[0] + ".json")
+            except OSError: pass
+            total -= size
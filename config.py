@@ -1,3 +1,5 @@
+from parser.registry import auto_parsers
+
 # --- KONFIGURASI TEMA MENYELURUH ---
 THEME_CONFIG = {
     "Default (Blue)": {
@@ -24,10 +26,54 @@ THEME_CONFIG = {
     },
 }
 
-AUTO_BANKS = [
-    ('parser.BNI', 'extract_bni_data', ['BANK NEGARA INDONESIA', 'BNIDIRECT']),
-    ('parser.Mandiri', 'process_bank_statement', ['BANK MANDIRI', 'MANDIRI', 'ACCOUNT STATEMENT']),
-    ('parser.Livin', 'process_livin_statement', ['LIVIN BY MANDIRI']),
-    ('parser.OCBC', 'process_ocbc_final', ['OCBC NISP', 'BANK OCBC', 'OCBC']),
-    ('parser.BRI', 'extract_bri_text', ['BANK RAKYAT INDONESIA', 'BRIDIRECT', 'IBBIZ', 'IBIZ', 'BRI'])
-]
\ No newline at end of file
+# (modul, fungsi, keyword) parser yang dicoba AUTO; dibentuk dari parser.registry
+AUTO_BANKS = [(p.module, p.function, p.keywords) for p in auto_parsers()]
+
+# Skor probe minimum (0..1) agar AUTO menjalankan parser terbaik
+AUTO_MIN_SCORE = 0.3
+
+# Jumlah worker proses untuk batch multi-file (None = jumlah CPU)
+MAX_WORKERS = None
+
+# Cache hasil ekstraksi (dikunci hash isi PDF + parser + versi parser)
+CACHE_ENABLED = True
+CACHE_MAX_MB = 500
+
+# Dokumen dengan halaman >= nilai ini ditulis streaming ke xlsx memori konstan (0 = nonaktif)
+STREAM_MIN_PAGES = 300
+
+# Metrik waktu per tahap, ditulis ke ~/FinExtract_Metrics/run-*.jsonl per batch
+METRICS_ENABLED = True
+
+# Panel log GUI menyimpan sejumlah baris terakhir saja (baris lama dipangkas)
+LOG_MAX_LINES = 2000
+# Simpan log lengkap ke ~/FinExtract_Logs/log-*.txt
+LOG_FILE_ENABLED = False
+
+# Jika file output sudah ada (dipilih sekali per batch, tanpa popup per file):
+# "ask" = tanya sekali di awal batch jika ada output yang sudah ada
+OVERWRITE_POLICIES = {
+    "ask": "Tanya sekali per batch",
+    "overwrite": "Timpa semua",
+    "skip": "Lewati yang sudah ada",
+    "version": "Simpan dengan nama baru (file (2).xlsx)",
+    "newer": "Lewati jika output lebih baru dari PDF",
+}
+OVERWRITE_POLICY = "ask"
+
+# Format file output: "xlsx" (default), "csv", "parquet" (butuh pyarrow) atau "sqlite".
+# CSV/Parquet/SQLite memakai kolom seragam semua bank (parser.writers.CANONICAL_COLUMNS)
+OUTPUT_FORMAT = "xlsx"
+
+# Ledger transaksi SQLite per folder output (finextract_ledger.sqlite): semua statement
+# di-append tanpa duplikat, untuk ekspor gabungan per rekening & periode (lihat ledger.py)
+LEDGER_ENABLED = False
+
+# Journal batch di ~/FinExtract_Batches/batch-*.jsonl: status tiap file (pending/done/failed/skipped),
+# agar batch yang terputus (aplikasi ditutup/crash) bisa dilanjutkan lewat "Lanjutkan Batch"
+JOURNAL_ENABLED = True
+
+# Mode watch-folder (python watch.py): detik antar scan folder inbox, dan berapa lama
+# ukuran file harus tetap sebelum dianggap selesai disalin
+WATCH_INTERVAL = 5
+WATCH_STABLE_SECONDS = 5
@@ -0,0 +1,106 @@
+import io
+
+
+class DocumentContext:
+    """
+    Konteks dokumen per job. File PDF di-parse sekali, lalu objek yang sama
+    dipakai bersama untuk cek enkripsi, deteksi AUTO, dan parser bank.
+    """
+
+    def __init__(self, pdf_path, password=None):
+        self.pdf_path = pdf_path
+        self.password = password
+        self._reader = None
+        self._pdf = None
+        self._first_page_text = None
+
+    # --- pypdf: cek enkripsi & dekripsi ---
+    @property
+    def reader(self):
+        """PdfReader (pypdf), dibuat sekali per dokumen. None jika pypdf tidak tersedia."""
+        if self._reader is None:
+            try:
+                from pypdf import PdfReader
+            except ImportError:
+                return None
+            self._reader = PdfReader(self.pdf_path)
+        return self._reader
+
+    def is_encrypted(self):
+        reader = self.reader
+        return bool(reader and getattr(reader, "is_encrypted", False))
+
+    def decrypt(self, password):
+        """Coba decrypt dengan password. True jika berhasil."""
+        reader = self.reader
+        if reader is None:
+            return False
+        try:
+            res = reader.decrypt(password)
+        except Exception:
+            return False
+        # Beberapa versi menandai is_encrypted=False setelah decrypt berhasil
+        if res or not getattr(reader, "is_encrypted", False):
+            self.password = password
+            return True
+        return False
+
+    def _decrypted_buffer(self):
+        """
+        Salinan terdekripsi di memori (BytesIO) dari reader yang sama, hanya
+        dipakai jika pdfplumber tidak bisa mendekripsi file itu sendiri.
+        """
+        from pypdf import PdfWriter
+        reader = self.reader
+        if reader.is_encrypted:
+            reader.decrypt(self.password)
+        writer = PdfWriter()
+        for p in reader.pages:
+            writer.add_page(p)
+        buf = io.BytesIO()
+        writer.write(buf)
+        buf.seek(0)
+        return buf
+
+    # --- pdfplumber: dipakai detector & parser ---
+    @property
+    def pdf(self):
+        """Objek PDF pdfplumber yang dibagi ke semua parser (dibuka sekali)."""
+        if self._pdf is None:
+            import pdfplumber
+            if self.password is None:
+                self._pdf = pdfplumber.open(self.pdf_path)
+            else:
+                # Dekripsi langsung oleh pdfplumber/pdfminer, tanpa salinan di disk.
+                try:
+                    self._pdf = pdfplumber.open(self.pdf_path, password=self.password)
+                except Exception:
+                    # Backend tidak mendukung skema enkripsinya -> buffer di memori
+                    if self.reader is None:
+                        raise
+                    self._pdf = pdfplumber.open(self._decrypted_buffer())
+        return self._pdf
+
+    def first_page_text(self):
+        """Teks halaman pertama (uppercase) untuk deteksi keyword, di-cache."""
+        if self._first_page_text is None:
+            text = ""
+            try:
+                if len(self.pdf.pages) > 0:
+                    text = (self.pdf.pages[0].extract_text() or "").upper()
+            except Exception: pass
+            self._first_page_text = text
+        return self._first_page_text
+
+    def close(self):
+        if self._pdf is not None:
+            try: self._pdf.close()
+            except Exception: pass
+            self._pdf = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+        return False
@@ -4,7 +4,7 @@ import tkinter as tk
 import subprocess
 import customtkinter as ctk
 from tkinter import filedialog, messagebox
-from config import THEME_CONFIG
+from config import THEME_CONFIG, LOG_MAX_LINES, OVERWRITE_POLICIES, OVERWRITE_POLICY
 
 # --- Mac OS Font Fix ---
 if sys.platform == "darwin":
@@ -22,7 +22,7 @@ class SettingsDialog(ctk.CTkToplevel):
         super().__init__(parent)
         self.parent = parent
         self.title("Settings")
-        self.geometry("400x450")
+        self.geometry("400x680")
         self.resizable(False, False)
         self.attributes("-topmost", True) 
         self.focus_force()
@@ -32,6 +32,7 @@ class SettingsDialog(ctk.CTkToplevel):
 
         self.var_mode = tk.StringVar(value=ctk.get_appearance_mode())
         self.var_theme = tk.StringVar(value=parent.current_theme_key)
+        self.var_overwrite = tk.StringVar(value=parent.overwrite_policy)
 
         self.lbl_title = ctk.CTkLabel(self, text="Pengaturan", font=ctk.CTkFont(size=20, weight="bold"), 
                                       text_color=self.current_theme["text"])
@@ -59,6 +60,17 @@ class SettingsDialog(ctk.CTkToplevel):
                                     fg_color=self.current_theme["btn_main"], hover_color=self.current_theme["btn_hover"], text_color=self.current_theme["text"])
             rb.pack(padx=20, pady=5, anchor="w")
 
+        # Frame Kebijakan Overwrite
+        self.frame_overwrite = ctk.CTkFrame(self, fg_color=self.current_theme["frame_bg"], border_width=1, border_color=self.current_theme["border"])
+        self.frame_overwrite.pack(padx=20, pady=10, fill="x")
+        self.lbl_overwrite = ctk.CTkLabel(self.frame_overwrite, text="Jika File Output Sudah Ada:", font=ctk.CTkFont(weight="bold"), text_color=self.current_theme["text"])
+        self.lbl_overwrite.pack(padx=10, pady=(10, 5), anchor="w")
+
+        for val, label in OVERWRITE_POLICIES.items():
+            rb = ctk.CTkRadioButton(self.frame_overwrite, text=label, variable=self.var_overwrite, value=val, command=self.on_overwrite_change,
+                                    fg_color=self.current_theme["btn_main"], hover_color=self.current_theme["btn_hover"], text_color=self.current_theme["text"])
+            rb.pack(padx=20, pady=5, anchor="w")
+
         self.btn_close = ctk.CTkButton(self, text="Tutup", command=self.destroy, fg_color=self.current_theme["btn_main"], hover_color=self.current_theme["btn_hover"])
         self.btn_close.pack(pady=20)
 
@@ -68,6 +80,9 @@ class SettingsDialog(ctk.CTkToplevel):
     def on_theme_change(self):
         self.after(10, lambda: self.parent.change_theme_event(self.var_theme.get()))
 
+    def on_overwrite_change(self):
+        self.parent.change_overwrite_policy_event(self.var_overwrite.get())
+
     def update_colors(self, theme_config):
         try:
             self.current_theme = theme_config
@@ -75,14 +90,16 @@ class SettingsDialog(ctk.CTkToplevel):
             self.lbl_title.configure(text_color=theme_config["text"])
             self.frame_mode.configure(fg_color=theme_config["frame_bg"], border_color=theme_config["border"])
             self.frame_theme.configure(fg_color=theme_config["frame_bg"], border_color=theme_config["border"])
+            self.frame_overwrite.configure(fg_color=theme_config["frame_bg"], border_color=theme_config["border"])
             self.lbl_mode.configure(text_color=theme_config["text"])
             self.lbl_theme.configure(text_color=theme_config["text"])
+            self.lbl_overwrite.configure(text_color=theme_config["text"])
             self.btn_close.configure(fg_color=theme_config["btn_main"], hover_color=theme_config["btn_hover"])
             
             for widget in self.frame_mode.winfo_children():
                 if isinstance(widget, ctk.CTkRadioButton):
                     widget.configure(fg_color=theme_config["btn_main"], hover_color=theme_config["btn_hover"], text_color=theme_config["text"])
-            for widget in self.frame_theme.winfo_children():
+            for widget in self.frame_theme.winfo_children() + self.frame_overwrite.winfo_children():
                 if isinstance(widget, ctk.CTkRadioButton):
                     widget.configure(fg_color=theme_config["btn_main"], hover_color=theme_config["btn_hover"], text_color=theme_config["text"])
         except Exception: pass
@@ -134,6 +151,47 @@ class PasswordDialog(ctk.CTkToplevel):
         self.wait_window()
         return self._password
 
+class OverwritePolicyDialog(ctk.CTkToplevel):
+    """Pilih kebijakan overwrite sekali untuk seluruh batch (bukan popup per file)."""
+    def __init__(self, parent, title="File output sudah ada", text="", theme_data=None):
+        super().__init__(parent)
+        self.title(title)
+        self.transient(parent)
+        self.grab_set()
+        self.resizable(False, False)
+        self.theme = theme_data if theme_data else THEME_CONFIG["Default (Blue)"]
+        self.configure(fg_color=self.theme["window_bg"])
+
+        self.label = ctk.CTkLabel(self, text=text, wraplength=320, justify="left", text_color=self.theme["text"])
+        self.label.pack(padx=20, pady=(20, 10), fill="x")
+
+        self.var_policy = tk.StringVar(value="overwrite")
+        for val, label in OVERWRITE_POLICIES.items():
+            if val == "ask":
+                continue
+            rb = ctk.CTkRadioButton(self, text=label, variable=self.var_policy, value=val,
+                                    fg_color=self.theme["btn_main"], hover_color=self.theme["btn_hover"], text_color=self.theme["text"])
+            rb.pack(padx=30, pady=5, anchor="w")
+
+        button_frame = ctk.CTkFrame(self, fg_color="transparent")
+        button_frame.pack(padx=20, pady=(10, 20), fill="x")
+        self.ok_button = ctk.CTkButton(button_frame, text="OK", command=self._ok_event, fg_color=self.theme["btn_main"], hover_color=self.theme["btn_hover"])
+        self.ok_button.pack(side="left", fill="x", expand=True, padx=(0,5))
+        self.cancel_button = ctk.CTkButton(button_frame, text="Batalkan Batch", fg_color="gray", hover_color="gray50", command=self._cancel_event)
+        self.cancel_button.pack(side="right", fill="x", expand=True, padx=(5,0))
+        self.bind("<Return>", self._ok_event)
+        self._policy = None
+
+    def _ok_event(self, event=None):
+        self._policy = self.var_policy.get()
+        self.destroy()
+    def _cancel_event(self):
+        self._policy = None
+        self.destroy()
+    def get_input(self):
+        self.wait_window()
+        return self._policy
+
 class FinextractUI(ctk.CTk):
     def __init__(self, settings_callback=None):
         super().__init__()
@@ -146,7 +204,10 @@ class FinextractUI(ctk.CTk):
         self.geometry(f'{window_width}x{window_height}+{int(screen_width/2 - window_width/2)}+{int(screen_height/2 - window_height/2)}')
         
         self.settings_window = None 
+        self.log_max_lines = LOG_MAX_LINES
+        self._log_lines = 0
         self.current_theme_key = "Default (Blue)"
+        self.overwrite_policy = OVERWRITE_POLICY
         self.save_settings_callback = settings_callback
         self.process_callback = None # Function to call when bank button is clicked
         
@@ -196,6 +257,10 @@ Cara Penggunaan:
         self.btn_bri.grid(row=4, column=0, padx=20, pady=10)
         self.btn_auto = ctk.CTkButton(self.sidebar, text="✨ Auto Detect Bank", fg_color="#27ae60", hover_color="#219150", command=lambda: self.trigger_process('AUTO', ''))
         self.btn_auto.grid(row=6, column=0, padx=20, pady=(20, 10))
+        # Tombol yang memulai batch; dinonaktifkan selama batch berjalan
+        self.process_buttons = [self.btn_bni, self.btn_mandiri, self.btn_ocbc, self.btn_bri, self.btn_livin, self.btn_auto]
+        self.btn_resume = ctk.CTkButton(self.sidebar, text="⟳ Lanjutkan Batch", command=self.trigger_resume)
+        self.btn_resume.grid(row=7, column=0, padx=20, pady=10, sticky="n")
 
         self.btn_settings = ctk.CTkButton(self.sidebar, text="⚙ Settings", command=self.open_settings)
         self.btn_settings.grid(row=8, column=0, padx=20, pady=(20, 10), sticky="s")
@@ -260,16 +325,29 @@ Cara Penggunaan:
         self.btn_open_file = ctk.CTkButton(self.action_frame, text="Buka File Output", width=150, state="disabled", command=self.open_output_file)
         self.btn_open_file.pack(side="right", padx=(0, 5), pady=5)
 
+        # Progress & tombol batal (aktif hanya selama proses berjalan)
+        self.btn_cancel = ctk.CTkButton(self.action_frame, text="Batal", width=80, state="disabled",
+                                        fg_color="#E74C3C", hover_color="#C0392B", command=self.trigger_cancel)
+        self.btn_cancel.pack(side="left", padx=(0, 10), pady=5)
+        self.progress_bar = ctk.CTkProgressBar(self.action_frame, width=180)
+        self.progress_bar.set(0)
+        self.progress_bar.pack(side="left", padx=(0, 10), pady=5)
+        self.lbl_progress = ctk.CTkLabel(self.action_frame, text="", anchor="w")
+        self.lbl_progress.pack(side="left", fill="x", expand=True, pady=5)
+        self.cancel_callback = None
+        self.resume_callback = None
+        self._batch_progress = (0, 1)
+
         # Collections for theming
         self.all_buttons = [
             self.btn_bni, self.btn_mandiri, self.btn_ocbc, self.btn_bri, self.btn_livin,
-            self.btn_auto, self.btn_settings, 
+            self.btn_auto, self.btn_resume, self.btn_settings, 
             self.btn_in, self.btn_out,
             self.btn_clear_log, self.btn_open_folder, self.btn_open_file
         ]
         self.all_labels = [
             self.lbl_sidebar_title, self.lbl_credit,
-            self.lbl_input, self.lbl_output, self.lbl_log_title
+            self.lbl_input, self.lbl_output, self.lbl_log_title, self.lbl_progress
         ]
         self.all_frames = [self.io_frame]
         self.all_entries = [self.input_textbox, self.output_entry]
@@ -278,6 +356,47 @@ Cara Penggunaan:
     def set_process_callback(self, callback):
         self.process_callback = callback
 
+    def set_cancel_callback(self, callback):
+        self.cancel_callback = callback
+
+    def set_resume_callback(self, callback):
+        self.resume_callback = callback
+
+    def trigger_resume(self):
+        if self.resume_callback:
+            self.resume_callback()
+
+    def trigger_cancel(self):
+        if self.cancel_callback:
+            self.btn_cancel.configure(state="disabled")
+            self.lbl_progress.configure(text="Membatalkan...")
+            self.cancel_callback()
+
+    def set_running(self, running):
+        """Aktif/nonaktifkan tombol Batal & tombol mulai batch, dan reset progress di awal/akhir batch."""
+        self.btn_cancel.configure(state="normal" if running else "disabled")
+        for btn in self.process_buttons + [self.btn_resume]:
+            btn.configure(state="disabled" if running else "normal")
+        if running:
+            self._batch_progress = (0, 1)
+            self.progress_bar.set(0)
+            self.lbl_progress.configure(text="")
+
+    def update_progress(self, kind, info):
+        """kind "BATCH": {done, total} file; kind "PAGE": {file, page, pages} untuk file yang sedang diproses."""
+        if kind == "BATCH":
+            self._batch_progress = (info["done"], max(info["total"], 1))
+            self.progress_bar.set(info["done"] / max(info["total"], 1))
+            return
+        done, total = self._batch_progress
+        pages = info.get("pages")
+        fraction = info["page"] / pages if pages else 0
+        self.progress_bar.set(min((done + fraction) / total, 1))
+        text = f"{info['file']}: halaman {info['page']}" + (f"/{pages}" if pages else "")
+        if total > 1:
+            text = f"File {min(done + 1, total)}/{total} - " + text
+        self.lbl_progress.configure(text=text)
+
     def trigger_process(self, module, func):
         if self.process_callback:
             self.process_callback(module, func)
@@ -302,9 +421,35 @@ Cara Penggunaan:
         self.btn_open_folder.configure(state="disabled")
 
     def log_message(self, message, level="DEFAULT"):
+        self.log_messages([(message, level)])
+
+    def log_messages(self, messages):
+        """
+        Tulis banyak pesan log sekaligus: satu insert per blok pesan berlevel sama
+        dan satu see("end") per panggilan. Panel hanya menyimpan log_max_lines baris
+        terakhir (setelah teks sambutan); baris lama dipangkas.
+        """
+        if not messages:
+            return
+        messages = messages[-self.log_max_lines:]
         try:
             self.logbox.configure(state="normal")
-            self.logbox.insert("end", message + "\n", level)
+            run, run_level = [], None
+            for message, level in messages:
+                if run and level != run_level:
+                    self.logbox.insert("end", "".join(run), run_level)
+                    run = []
+                run_level = level
+                run.append(message + "\n")
+            self.logbox.insert("end", "".join(run), run_level)
+            self._log_lines += sum(message.count("\n") + 1 for message, _ in messages)
+
+            # Dipangkas per blok (10% di atas batas) agar delete tidak terjadi tiap tick
+            excess = self._log_lines - self.log_max_lines
+            if excess > self.log_max_lines // 10:
+                start = self.welcome_text.count('\n') + 1
+                self.logbox.delete(f"{start}.0", f"{start + excess}.0")
+                self._log_lines -= excess
             self.logbox.see("end")
             self.logbox.configure(state="disabled")
         except Exception: pass
@@ -317,9 +462,13 @@ Cara Penggunaan:
         dialog.geometry(f"+{self.winfo_x() + (self.winfo_width() - dialog.winfo_reqwidth()) // 2}+{self.winfo_y() + (self.winfo_height() - dialog.winfo_reqheight()) // 2}")                    
         return dialog.get_input()
 
-    def ask_overwrite(self, title, message):
+    def ask_overwrite_policy(self, title, message):
         self.bell()
-        return messagebox.askyesnocancel(title=title, message=message)
+        theme_data = THEME_CONFIG.get(self.current_theme_key)
+        dialog = OverwritePolicyDialog(self, title=title, text=message, theme_data=theme_data)
+        self.update_idletasks()
+        dialog.geometry(f"+{self.winfo_x() + (self.winfo_width() - dialog.winfo_reqwidth()) // 2}+{self.winfo_y() + (self.winfo_height() - dialog.winfo_reqheight()) // 2}")
+        return dialog.get_input()
 
     # --- Standard UI Methods ---
     def browse_input(self):
@@ -364,6 +513,7 @@ Cara Penggunaan:
         delete_start = f"{welcome_lines + 1}.0"
         self.logbox.delete(delete_start, tk.END)
         self.logbox.configure(state="disabled")
+        self._log_lines = 0
 
     def open_settings(self):
         if self.settings_window is None or not self.settings_window.winfo_exists():
@@ -377,6 +527,10 @@ Cara Penggunaan:
         self.after(50, lambda: self.apply_theme(self.current_theme_key))
         if self.save_settings_callback: self.save_settings_callback()
 
+    def change_overwrite_policy_event(self, policy):
+        self.overwrite_policy = policy
+        if self.save_settings_callback: self.save_settings_callback()
+
     def change_theme_event(self, theme_name: str):
         self.apply_theme(theme_name)
         if self.save_settings_callback: self.save_settings_callback()
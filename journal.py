@@ -0,0 +1,139 @@
+import os
+import json
+import time
+
+DEFAULT_JOURNAL_DIR = os.path.join(os.path.expanduser("~"), "FinExtract_Batches")
+
+# Status per file input. Batch bisa dilanjutkan selama masih ada file PENDING/FAILED.
+PENDING = "pending"
+DONE = "done"
+FAILED = "failed"
+SKIPPED = "skipped"
+UNFINISHED = (PENDING, FAILED)
+
+# Setting yang tidak pernah ditulis ke journal (berisi password)
+PRIVATE_SETTINGS = ("password_patterns",)
+
+
+class BatchJournal:
+    """
+    Journal batch di disk (JSON-lines, append-only): baris pertama berisi
+    parameter batch, lalu satu baris per perubahan status file (status, hash isi,
+    path output). Tiap baris langsung di-flush + fsync, jadi status tetap
+    tersimpan walau aplikasi ditutup, crash, atau kehabisan memori di tengah batch.
+    Status terakhir tiap file menang saat journal dibaca ulang.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self.batch = {}
+        self.files = {}  # pdf_path -> event status terakhir
+
+    @classmethod
+    def create(cls, module_name, function_name, file_list, output_folder, settings=None, journal_dir=None):
+        journal_dir = journal_dir or DEFAULT_JOURNAL_DIR
+        os.makedirs(journal_dir, exist_ok=True)
+        # Nama unik & urut waktu (milidetik): dua batch dalam detik yang sama tidak berbagi file
+        while True:
+            now = time.time()
+            stamp = time.strftime("%Y%m%d-%H%M%S", time.localtime(now)) + f"{int(now * 1000) % 1000:03d}"
+            path = os.path.join(journal_dir, f"batch-{stamp}-{os.getpid()}.jsonl")
+            if not os.path.exists(path):
+                break
+            time.sleep(0.001)
+        journal = cls(path)
+        settings = {k: v for k, v in (settings or {}).items() if k not in PRIVATE_SETTINGS}
+        journal._append({"type": "batch", "ts": round(time.time(), 3), "module_name": module_name,
+                         "function_name": function_name, "files": list(file_list),
+                         "output_folder": output_folder, "settings": settings})
+        return journal
+
+    @classmethod
+    def load(cls, path):
+        """Baca ulang journal. Baris terakhir yang terpotong (crash saat menulis) diabaikan."""
+        journal = cls(path)
+        with open(path, "r", encoding="utf-8") as f:
+            for line in f:
+                try:
+                    event = json.loads(line)
+                except ValueError:
+                    continue
+                if event.get("type") == "batch":
+                    journal.batch = event
+                elif event.get("type") == "file":
+                    journal.files[event["pdf_path"]] = event
+        return journal
+
+    def _append(self, event):
+        if event.get("type") == "batch":
+            self.batch = event
+        elif event.get("type") == "file":
+            self.files[event["pdf_path"]] = event
+        try:
+            with open(self.path, "a", encoding="utf-8") as f:
+                f.write(json.dumps(event) + "\n")
+                f.flush()
+                os.fsync(f.fileno())
+        except OSError: pass
+
+    def mark(self, pdf_path, status, file_hash=None, excel_path=None):
+        """Catat status baru satu file; hash/path output lama dipertahankan jika tidak diisi."""
+        prev = self.files.get(pdf_path, {})
+        self._append({"type": "file", "ts": round(time.time(), 3), "pdf_path": pdf_path, "status": status,
+                      "file_hash": file_hash or prev.get("file_hash"),
+                      "excel_path": excel_path or prev.get("excel_path")})
+
+    def status(self, pdf_path):
+        return self.files.get(pdf_path, {}).get("status", PENDING)
+
+    def unfinished(self):
+        """File input (urutan asli batch) yang belum selesai: pending (termasuk belum pernah dicatat) atau gagal."""
+        return [p for p in self.batch.get("files", []) if self.status(p) in UNFINISHED]
+
+    def output_paths(self):
+        """pdf_path -> path output yang sudah direncanakan (dipakai ulang saat batch dilanjutkan)."""
+        return {p: e["excel_path"] for p, e in self.files.items() if e.get("excel_path")}
+
+    def discard(self):
+        """Hapus file journal: batch selesai semua, atau dibatalkan sebelum ekstraksi dimulai."""
+        try:
+            os.remove(self.path)
+        except OSError: pass
+
+
+def _journal_names(journal_dir):
+    return [n for n in os.listdir(journal_dir) if n.startswith("batch-") and n.endswith(".jsonl")]
+
+def prune_journals(keep=None, journal_dir=None):
+    """Hapus semua journal batch selain `keep` (path); batch yang sudah mulai menggantikan batch lama."""
+    journal_dir = journal_dir or DEFAULT_JOURNAL_DIR
+    try:
+        names = _journal_names(journal_dir)
+    except OSError:
+        return
+    for name in names:
+        path = os.path.join(journal_dir, name)
+        if keep and os.path.abspath(path) == os.path.abspath(keep):
+            continue
+        try:
+            os.remove(path)
+        except OSError: pass
+
+
+def latest_unfinished(journal_dir=None):
+    """
+    Journal batch terakhir jika masih punya file belum selesai, else None. Hanya
+    batch terakhir yang bisa dilanjutkan; batch baru menggantikan batch lama.
+    """
+    journal_dir = journal_dir or DEFAULT_JOURNAL_DIR
+    try:
+        names = _journal_names(journal_dir)
+    except OSError:
+        return None
+    if not names:
+        return None
+    try:
+        journal = BatchJournal.load(os.path.join(journal_dir, max(names)))
+    except OSError:
+        return None
+    return journal if journal.batch and journal.unfinished() else None
@@ -0,0 +1,300 @@
+"""
+Ledger transaksi: satu database SQLite per workspace (folder output) yang
+menampung transaksi semua statement yang pernah diekstrak, tanpa duplikat.
+
+Tiap statement baru cukup di-append (INSERT OR IGNORE); riwayat lama tidak
+ditulis ulang. Unique index pada (rekening, tanggal, referensi, debit, kredit,
+saldo) membuat impor ulang / statement yang tumpang tindih idempoten.
+
+Ekspor gabungan per rekening dan periode:
+
+    python ledger.py <ledger.sqlite> <output.xlsx|.csv|.parquet|.sqlite> [--account NO] [--start YYYY-MM-DD] [--end YYYY-MM-DD]
+"""
+import os
+import re
+import sys
+import time
+import sqlite3
+import argparse
+from datetime import date, datetime
+
+from parser.writers import CANONICAL_COLUMNS, AMOUNT_COLUMNS
+from parser.normalize import DATE_PATTERN, date_value
+
+# Nama file ledger di folder output (workspace)
+LEDGER_FILE = "finextract_ledger.sqlite"
+
+# Detik menunggu lock jika ledger sedang ditulis proses lain (worker batch paralel)
+LOCK_TIMEOUT = 60
+
+# Baris per executemany saat impor bertahap (LedgerImport); lock ledger hanya dipegang selama satu chunk
+CHUNK_ROWS = 5000
+
+_ISO_DATE = re.compile(r"^\d{4}-\d{2}-\d{2}$")
+# Tanggal tanpa tahun (OCBC: 'dd/mm'), tahunnya diambil dari periode statement
+_SHORT_DATE = re.compile(r"^\s*(\d{1,2})[/-](\d{1,2})\s*$")
+_PERIOD_YEAR = re.compile(r"PERIO\w*\D{0,40}?((?:19|20)\d{2})", re.IGNORECASE)
+
+# Kolom ekspor: rekening + kolom kanonik (parser.writers)
+LEDGER_COLUMNS = ["account", *CANONICAL_COLUMNS]
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS transactions (
+    id INTEGER PRIMARY KEY,
+    account TEXT NOT NULL,
+    posting_date TEXT NOT NULL DEFAULT '',
+    value_date TEXT,
+    description TEXT,
+    reference TEXT NOT NULL DEFAULT '',
+    debit INTEGER NOT NULL DEFAULT 0,
+    credit INTEGER NOT NULL DEFAULT 0,
+    balance INTEGER NOT NULL DEFAULT 0,
+    file_hash TEXT
+);
+CREATE UNIQUE INDEX IF NOT EXISTS transactions_key
+    ON transactions (account, posting_date, reference, debit, credit, balance);
+CREATE INDEX IF NOT EXISTS transactions_period ON transactions (account, posting_date);
+CREATE TABLE IF NOT EXISTS imports (
+    file_hash TEXT PRIMARY KEY,
+    file TEXT,
+    account TEXT,
+    rows INTEGER,
+    inserted INTEGER,
+    imported_at TEXT
+);
+"""
+
+
+def statement_period(text):
+    """
+    (awal, akhir) periode statement dari teks halaman pertama: rentang tanggal
+    lengkap yang tertulis, atau satu tahun penuh dari 'Periode ... 2025'. None jika tidak ada.
+    """
+    dates = [d.date() for d in (date_value(m) for m in re.findall(DATE_PATTERN, text or ""))
+             if isinstance(d, datetime)]
+    if dates:
+        return min(dates), max(dates)
+    m = _PERIOD_YEAR.search(text or "")
+    if m:
+        year = int(m.group(1))
+        return date(year, 1, 1), date(year, 12, 31)
+    return None
+
+def resolve_date(value, period=None):
+    """
+    Tanggal kanonik -> 'YYYY-MM-DD'. 'dd/mm' tanpa tahun dilengkapi dari periode
+    statement (tahun yang membuat tanggal jatuh di dalam periode). Return None jika
+    tidak bisa dijadikan ISO.
+    """
+    if _ISO_DATE.match(value):
+        return value
+    m = _SHORT_DATE.match(value)
+    if not m or not period:
+        return None
+    start, end = period
+    day, month = int(m.group(1)), int(m.group(2))
+    candidates = []
+    for year in range(start.year, end.year + 1):
+        try:
+            candidates.append(date(year, month, day))
+        except ValueError:
+            continue
+    inside = [d for d in candidates if start <= d <= end]
+    if inside:
+        return inside[0].isoformat()
+    # Di luar periode (misal saldo awal sehari sebelumnya): hanya jika tahunnya tidak ambigu
+    if start.year == end.year and candidates:
+        return candidates[0].isoformat()
+    return None
+
+
+class LedgerImport:
+    """
+    Impor satu statement secara bertahap: baris kanonik ditampung per CHUNK_ROWS
+    lalu ditulis dengan executemany, jadi memori tetap konstan untuk statement
+    sebesar apa pun. Dipasang sebagai row sink parser (append/extend). commit()
+    mencatat impor; rollback() menghapus baris yang sudah masuk jika ekstraksi gagal.
+
+    Tanggal posting yang tidak bisa dijadikan ISO (lihat resolve_date) ditolak dan
+    dihitung di `rejected`. `period` boleh berupa callable, dipanggil sekali saat
+    tanggal tanpa tahun pertama kali muncul.
+    """
+
+    def __init__(self, ledger, account, file_hash=None, file=None, period=None):
+        self.ledger = ledger
+        self.account = account
+        self.file_hash = file_hash
+        self.file = file
+        self._period = period
+        self.batch = []
+        self.rows = 0
+        self.inserted = 0
+        self.rejected = 0
+        self._first_id = None
+
+    @property
+    def period(self):
+        if callable(self._period):
+            self._period = self._period()
+        return self._period
+
+    def _date(self, value):
+        if value is None or value == "":
+            return value
+        return resolve_date(str(value), self.period)
+
+    def append(self, row):
+        posting_date, value_date, description, reference, debit, credit, balance = row
+        self.rows += 1
+        iso = self._date(posting_date)
+        if iso is None:
+            self.rejected += 1
+            return
+        self.batch.append((self.account, iso or "", self._date(value_date), description, reference or "",
+                           debit or 0, credit or 0, balance or 0, self.file_hash))
+        if len(self.batch) >= CHUNK_ROWS:
+            self.flush()
+
+    def extend(self, rows):
+        for row in rows:
+            self.append(row)
+
+    def flush(self):
+        if not self.batch:
+            return
+        conn = self.ledger._connect()
+        try:
+            with conn:
+                if self._first_id is None:
+                    self._first_id = conn.execute("SELECT COALESCE(MAX(id), 0) FROM transactions").fetchone()[0]
+                before = conn.total_changes
+                conn.executemany(
+                    "INSERT OR IGNORE INTO transactions (account, posting_date, value_date, description, reference, "
+                    "debit, credit, balance, file_hash) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)", self.batch)
+                self.inserted += conn.total_changes - before
+        finally:
+            conn.close()
+        self.batch = []
+
+    def commit(self):
+        """
+        Tulis sisa baris dan catat impor. Impor dengan baris ditolak tidak dicatat,
+        jadi file itu diekstrak ulang (bukan dari cache) pada batch berikutnya.
+        Return jumlah baris baru.
+        """
+        self.flush()
+        if self.file_hash and not self.rejected:
+            conn = self.ledger._connect()
+            try:
+                with conn:
+                    conn.execute("INSERT OR REPLACE INTO imports VALUES (?, ?, ?, ?, ?, ?)",
+                                 (self.file_hash, self.file, self.account, self.rows, self.inserted,
+                                  time.strftime("%Y-%m-%d %H:%M:%S")))
+            finally:
+                conn.close()
+        return self.inserted
+
+    def rollback(self):
+        """Buang baris yang sudah ditulis impor ini (ekstraksi gagal/dibatalkan)."""
+        self.batch = []
+        if self._first_id is None:
+            return
+        conn = self.ledger._connect()
+        try:
+            with conn:
+                conn.execute("DELETE FROM transactions WHERE id > ? AND file_hash IS ?",
+                             (self._first_id, self.file_hash))
+        finally:
+            conn.close()
+        self._first_id = None
+        self.inserted = 0
+
+
+class Ledger:
+    """
+    Ledger SQLite satu workspace. Koneksi dibuka per operasi, jadi ledger yang
+    sama aman dipakai beberapa proses worker sekaligus; tulis bersamaan diantre
+    oleh lock SQLite (mode WAL, LOCK_TIMEOUT).
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self._ready = False
+
+    def _connect(self):
+        conn = sqlite3.connect(self.path, timeout=LOCK_TIMEOUT)
+        if not self._ready:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.executescript(_SCHEMA)
+            self._ready = True
+        return conn
+
+    def has_import(self, file_hash):
+        """True jika file dengan hash isi ini sudah pernah masuk ledger."""
+        conn = self._connect()
+        try:
+            return conn.execute("SELECT 1 FROM imports WHERE file_hash = ?", (file_hash,)).fetchone() is not None
+        finally:
+            conn.close()
+
+    def append(self, account, rows, file_hash=None, file=None, period=None):
+        """
+        Tambahkan baris kanonik (urut CANONICAL_COLUMNS, uang dalam integer sen) satu
+        statement, per CHUNK_ROWS (lihat LedgerImport). Baris yang sudah ada (kunci
+        unik sama) dilewati. Return jumlah baris baru.
+        """
+        job = LedgerImport(self, account, file_hash=file_hash, file=file, period=period)
+        job.extend(rows)
+        return job.commit()
+
+    def query(self, account=None, start=None, end=None):
+        """Generator baris (urut LEDGER_COLUMNS, uang dalam sen) per rekening & periode (tanggal ISO, inklusif), lewat index."""
+        where, args = [], []
+        if account:
+            where.append("account = ?")
+            args.append(account)
+        if start:
+            where.append("posting_date >= ?")
+            args.append(start)
+        if end:
+            where.append("posting_date <= ?")
+            args.append(end)
+        sql = (f"SELECT {', '.join(LEDGER_COLUMNS)} FROM transactions"
+               f"{' WHERE ' + ' AND '.join(where) if where else ''} ORDER BY account, posting_date, id")
+        conn = self._connect()
+        try:
+            yield from conn.execute(sql, args)
+        finally:
+            conn.close()
+
+    def export(self, output_path, account=None, start=None, end=None):
+        """Ekspor gabungan ke file output (format dari ekstensi, lihat parser.writers). Return jumlah baris."""
+        import pandas as pd
+        from parser.writers import dataframe_to_file
+        from parser.normalize import set_money_columns
+        df = pd.DataFrame(list(self.query(account, start, end)), columns=LEDGER_COLUMNS)
+        # Sen tetap integer di format data; Excel menampilkan rupiah
+        set_money_columns(df, list(AMOUNT_COLUMNS))
+        dataframe_to_file(df, output_path, canonical=False)
+        return len(df)
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description="Ekspor gabungan ledger transaksi FinExtract.")
+    ap.add_argument("ledger", help=f"file ledger ({LEDGER_FILE} di folder output)")
+    ap.add_argument("output", help="file output (.xlsx, .csv, .parquet, .sqlite)")
+    ap.add_argument("--account", help="nomor rekening")
+    ap.add_argument("--start", help="tanggal awal (YYYY-MM-DD)")
+    ap.add_argument("--end", help="tanggal akhir (YYYY-MM-DD)")
+    args = ap.parse_args(argv)
+
+    if not os.path.exists(args.ledger):
+        print(f"Ledger tidak ditemukan: {args.ledger}")
+        return 1
+    count = Ledger(args.ledger).export(args.output, args.account, args.start, args.end)
+    print(f"{count} transaksi diekspor ke {args.output}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
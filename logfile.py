@@ -0,0 +1,33 @@
+import os
+import time
+
+DEFAULT_LOG_DIR = os.path.join(os.path.expanduser("~"), "FinExtract_Logs")
+
+
+class LogFile:
+    """
+    Salinan lengkap log GUI ke file teks (satu file per sesi aplikasi), karena
+    panel log hanya menyimpan sejumlah baris terakhir. File dibuat saat pesan
+    pertama ditulis; tiap batch pesan ditulis dengan satu write.
+    """
+
+    def __init__(self, log_dir=None):
+        self.log_dir = log_dir or DEFAULT_LOG_DIR
+        self.path = os.path.join(self.log_dir, f"log-{time.strftime('%Y%m%d-%H%M%S')}.txt")
+        self._file = None
+
+    def write(self, messages):
+        """messages: list (pesan, level)."""
+        try:
+            if self._file is None:
+                os.makedirs(self.log_dir, exist_ok=True)
+                self._file = open(self.path, "a", encoding="utf-8")
+            stamp = time.strftime("%H:%M:%S")
+            self._file.write("".join(f"{stamp} [{level}] {message}\n" for message, level in messages))
+            self._file.flush()
+        except OSError: pass
+
+    def close(self):
+        if self._file is not None:
+            self._file.close()
+            self._file = None
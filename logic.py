@@ -1,11 +1,25 @@
 import os
 import json
 import threading
-import importlib
 import traceback
-import tempfile
 import queue
-from config import AUTO_BANKS
+import shutil
+import sqlite3
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from config import AUTO_BANKS, AUTO_MIN_SCORE, MAX_WORKERS, CACHE_ENABLED, CACHE_MAX_MB, STREAM_MIN_PAGES, METRICS_ENABLED, \
+    LOG_MAX_LINES, LOG_FILE_ENABLED, OVERWRITE_POLICY, OVERWRITE_POLICIES, OUTPUT_FORMAT, \
+    LEDGER_ENABLED, JOURNAL_ENABLED
+from document import DocumentContext
+from cache import ResultCache, file_sha256
+from passwords import PasswordCache, account_key
+from outputs import OutputPlanner
+from ledger import Ledger, LedgerImport, LEDGER_FILE, statement_period
+from journal import BatchJournal, latest_unfinished, prune_journals, PENDING, DONE, FAILED, SKIPPED
+from metrics import FileMetrics, RunMetrics
+from parser.common import Cancelled, set_recorder, set_progress, set_cancel, source_path
+from parser.registry import get_parser, auto_parsers
+from parser.writers import OUTPUT_FORMATS, check_format, set_row_sink
 
 class CoreLogic:
     def __init__(self, status_queue, request_queue):
@@ -13,13 +27,29 @@ class CoreLogic:
         self.request_queue = request_queue
         self.config_file = os.path.join(os.path.expanduser("~"), "FinExtract_Settings.json")
         self.AUTO_BANKS = AUTO_BANKS
+        self.cache = None
+        self.stream_min_pages = STREAM_MIN_PAGES
+        self.metrics = None
+        self.cancel_event = None
+        self.passwords = None
+        self.overwrite_policy = OVERWRITE_POLICY
+        self.output_format = OUTPUT_FORMAT
+        self.ledger = None
+        self.journal = None
+        self.running = False
 
     def load_settings(self):
-        default = {"appearance_mode": "System", "theme_name": "Default (Blue)"}
+        default = {"appearance_mode": "System", "theme_name": "Default (Blue)", "max_workers": MAX_WORKERS,
+                   "cache_enabled": CACHE_ENABLED, "cache_max_mb": CACHE_MAX_MB,
+                   "stream_min_pages": STREAM_MIN_PAGES, "metrics_enabled": METRICS_ENABLED,
+                   "log_max_lines": LOG_MAX_LINES, "log_file_enabled": LOG_FILE_ENABLED,
+                   "overwrite_policy": OVERWRITE_POLICY, "output_format": OUTPUT_FORMAT,
+                   "ledger_enabled": LEDGER_ENABLED, "journal_enabled": JOURNAL_ENABLED,
+                   "watch_folders": [], "watch_output_folder": ""}
         try:
             if os.path.exists(self.config_file):
                 with open(self.config_file, "r") as f:
-                    return json.load(f)
+                    return {**default, **json.load(f)}
         except Exception: pass
         return default
 
@@ -29,17 +59,66 @@ class CoreLogic:
                 json.dump(settings, f)
         except Exception: pass
 
-    def start_processing_thread(self, module_name, function_name, file_list, output_folder):
+    def start_processing_thread(self, module_name, function_name, file_list, output_folder, settings=None):
+        """Mulai batch di thread background. Return False jika masih ada batch yang berjalan."""
+        if self.running:
+            return False
+        self.running = True
         t = threading.Thread(
-            target=self._process_queue, 
-            args=(module_name, function_name, file_list, output_folder), 
+            target=self._process_queue,
+            args=(module_name, function_name, file_list, output_folder, settings),
             daemon=True
         )
         t.start()
+        return True
+
+    def resumable_batch(self):
+        """Journal batch terakhir yang masih punya file belum selesai, atau None."""
+        return latest_unfinished()
+
+    def resume_processing_thread(self, journal, settings=None):
+        """
+        Lanjutkan batch dari journal: hanya file pending/gagal yang diproses ulang,
+        dengan bank, folder output dan setting batch aslinya. Return False jika
+        masih ada batch yang berjalan.
+        """
+        if self.running:
+            return False
+        self.running = True
+        batch = journal.batch
+        # Setting batch asli menang; password tidak pernah ditulis ke journal, jadi diambil dari setting sekarang
+        settings = {**(settings or {}), **batch.get("settings", {})}
+        t = threading.Thread(
+            target=self._process_queue,
+            args=(batch["module_name"], batch["function_name"], journal.unfinished(), batch["output_folder"],
+                  settings, journal),
+            daemon=True
+        )
+        t.start()
+        return True
+
+    def cancel(self):
+        """Minta batch yang sedang berjalan berhenti (dipanggil dari GUI)."""
+        if self.cancel_event is not None:
+            self.cancel_event.set()
+
+    def cancelled(self):
+        return self.cancel_event is not None and self.cancel_event.is_set()
+
+    def _progress(self, kind, **info):
+        """Event progress untuk GUI: kind "PAGE" (halaman file aktif) atau "BATCH" (file selesai)."""
+        self.status_queue.put(("PROGRESS", info, kind))
 
     def _log(self, message, level="DEFAULT"):
         self.status_queue.put(("LOG", message, level))
 
+    def _metric(self, event):
+        """Kirim event metrik terstruktur. Di proses utama juga ditulis ke file metrik batch."""
+        if self.metrics:
+            self.metrics.record(event)
+        else:
+            self.status_queue.put(("METRIC", event, event.get("type")))
+
     def _request_gui(self, task_name, **kwargs):
         """Meminta GUI melakukan sesuatu (misal popup password) dan menunggu hasil"""
         result_q = queue.Queue()
@@ -47,171 +126,541 @@ class CoreLogic:
         try:
             return result_q.get(timeout=300)
         except queue.Empty:
-            return None    
+            return None
 
-    def _process_queue(self, module_name, function_name, file_list, output_folder):
+    def _process_queue(self, module_name, function_name, file_list, output_folder, settings=None, journal=None):
+        # Satu cancel token per batch; Event dari context spawn agar bisa dibagi ke worker proses
+        self.cancel_event = multiprocessing.get_context("spawn").Event()
+        set_cancel(self.cancel_event)
         try:
-            from pypdf import PdfReader, PdfWriter
-        except ImportError:
-            PdfReader = None
-            PdfWriter = None
+            self._run_batch(module_name, function_name, file_list, output_folder, settings, journal)
+        finally:
+            set_cancel(None)
+            # Password hanya hidup selama batch berjalan
+            self.passwords = None
+            self.journal = None
+            self.running = False
+            self.status_queue.put(("DONE", None, None))
 
-        files_processed = 0
+    def _run_batch(self, module_name, function_name, file_list, output_folder, settings=None, journal=None):
+        settings = settings or {}
+        file_list = [p.strip() for p in file_list if p and p.strip()]
+        cpu_workers = settings.get("max_workers") or MAX_WORKERS or os.cpu_count() or 1
+        if settings.get("cache_enabled", CACHE_ENABLED):
+            self.cache = ResultCache(max_bytes=int(settings.get("cache_max_mb", CACHE_MAX_MB)) * 1024 * 1024)
+        else:
+            self.cache = None
+        self.stream_min_pages = settings.get("stream_min_pages", STREAM_MIN_PAGES)
+        self.metrics = RunMetrics(self.status_queue) if settings.get("metrics_enabled", METRICS_ENABLED) else None
+        self.passwords = PasswordCache(settings.get("password_patterns"))
+        self.overwrite_policy = settings.get("overwrite_policy", OVERWRITE_POLICY)
+        self.output_format = settings.get("output_format", OUTPUT_FORMAT)
+        error = check_format(self.output_format)
+        if error:
+            self._log(error, level="ERROR")
+            return
+        self.ledger = None
+        if settings.get("ledger_enabled", LEDGER_ENABLED):
+            self.ledger = Ledger(os.path.join(output_folder, LEDGER_FILE))
+        self.journal = journal
+        if journal:
+            self._log(f"Melanjutkan batch: {len(file_list)} file belum selesai.", level="INFO")
+        elif settings.get("journal_enabled", JOURNAL_ENABLED):
+            self.journal = BatchJournal.create(module_name, function_name, file_list, output_folder, settings)
+
+        # Semua popup (password, overwrite) selesai di sini; ekstraksi berjalan tanpa input user
+        prepared = self._preflight(file_list, output_folder)
+        if prepared is None:
+            # Dibatalkan di dialog kebijakan: batch baru tidak pernah mulai, journal-nya dibuang
+            if self.journal and not journal:
+                self.journal.discard()
+            return
+        if self.journal:
+            # Batch ini yang sekarang bisa dilanjutkan; journal batch lama tidak dipakai lagi
+            prune_journals(keep=self.journal.path, journal_dir=os.path.dirname(self.journal.path))
+        jobs, duplicates = prepared
+        workers = min(cpu_workers, len(jobs))
+
+        if workers > 1:
+            files_processed = self._process_batch_pool(module_name, function_name, jobs, duplicates, workers)
+        else:
+            # Satu file: worker dipakai untuk ekstraksi paralel per rentang halaman
+            files_processed = self._process_batch_serial(module_name, function_name, jobs, duplicates,
+                                                         page_workers=cpu_workers)
+
+        if self.metrics and self.metrics.files:
+            summary = self.metrics.batch_summary(workers)
+            self._log(f"Ringkasan: {summary['files']} file, {summary['pages']} halaman, {summary['rows']} baris "
+                      f"dalam {summary['seconds']:.1f} dtk ({summary['pages_per_sec']} hal/dtk). "
+                      f"Metrik: {self.metrics.path}", level="INFO")
+
+        if self.cancelled():
+            self._log("========================================", level="SEPARATOR")
+            self._log(f"PROSES DIBATALKAN ({files_processed} file selesai).\n", level="ERROR")
+        elif files_processed > 0:
+            self._log("========================================", level="SEPARATOR")
+            self._log("SEMUA PROSES SELESAI.\n", level="SUCCESS")
+        else:
+            self._log("Tidak ada file yang diproses.", level="INFO")
+        if self.journal and self.journal.unfinished():
+            self._log(f"{len(self.journal.unfinished())} file belum selesai atau gagal. "
+                      f"Klik 'Lanjutkan Batch' untuk memproses ulang file tersebut saja.", level="INFO")
+        elif self.journal:
+            self.journal.discard()
+
+    def _preflight(self, file_list, output_folder):
+        """
+        Tahap interaktif seluruh batch, sebelum ekstraksi dimulai: kebijakan
+        overwrite, hash isi file (duplikat), cek enkripsi & password, dan path output.
+        Password dicoba dari PasswordCache batch dulu; popup hanya untuk file yang
+        belum terbuka. Return (jobs, duplicates), atau None jika batch dibatalkan.
+        """
+        planner = self._output_planner(file_list, output_folder)
+        if planner is None:
+            return None
+        jobs = []
+        seen = {}  # hash isi file -> job pertama (file identik cukup diproses sekali)
+        duplicates = []  # (job pertama, pdf_path, excel_path), disalin setelah job pertama selesai
         for pdf_path in file_list:
-            pdf_path = pdf_path.strip()
-            if not pdf_path: continue
-            password = None
-            try:
-                reader = PdfReader(pdf_path) if PdfReader else None
-                if reader and getattr(reader, "is_encrypted", False):
-                    # Beberapa PDF menyatakan 'encrypted' namun dapat dibuka tanpa password
-                    # (owner-only encryption atau password kosong). Coba decrypt dengan
-                    # password kosong dahulu; hanya minta input user jika gagal.
+            if self.cancelled():
+                break
+            file_hash = self._hash_file(pdf_path)
+            if file_hash and file_hash in seen:
+                excel_path = self._resolve_output(pdf_path, planner)
+                if excel_path:
+                    duplicates.append((seen[file_hash], pdf_path, excel_path))
+                    self._mark(pdf_path, PENDING, file_hash, excel_path)
+                continue
+
+            # Cukup reader pypdf untuk cek enkripsi; PDF dibuka penuh saat ekstraksi
+            with DocumentContext(pdf_path) as doc:
+                job = self.prepare_file(doc, planner, file_hash)
+            if not job:
+                # Dilewati kebijakan overwrite sudah dicatat _resolve_output; selain itu gagal (password dll.)
+                if self.journal and self.journal.status(pdf_path) != SKIPPED:
+                    self._mark(pdf_path, FAILED, file_hash)
+                continue
+            self._mark(pdf_path, PENDING, file_hash, job['excel_path'])
+            if file_hash:
+                seen[file_hash] = job
+            jobs.append(job)
+        return jobs, duplicates
+
+    def _process_batch_serial(self, module_name, function_name, jobs, duplicates, page_workers=None):
+        files_processed = 0
+        for i, job in enumerate(jobs):
+            if self.cancelled():
+                break
+            self._progress("BATCH", done=i, total=len(jobs))
+            with DocumentContext(job['pdf_path'], password=job['password']) as doc:
+                job['ok'] = self._extract_file(doc, module_name, function_name, job['excel_path'], page_workers,
+                                               job['file_hash'], job['stages'])
+            if self.cancelled() and not job['ok']:
+                break
+            self._mark(job['pdf_path'], DONE if job['ok'] else FAILED)
+            files_processed += 1
+        self._progress("BATCH", done=files_processed, total=len(jobs))
+        return files_processed + self._copy_duplicates(duplicates)
+
+    def _process_batch_pool(self, module_name, function_name, jobs, duplicates, workers):
+        """
+        Ekstraksi paralel di ProcessPoolExecutor. Job sudah disiapkan _preflight
+        (password & overwrite), jadi worker berjalan tanpa popup. Log & event "FILE"
+        dari worker diteruskan ke status_queue.
+        """
+        ctx = multiprocessing.get_context("spawn")
+        worker_q = ctx.Queue()
+        forwarder = threading.Thread(target=self._forward_worker_events, args=(worker_q,), daemon=True)
+        forwarder.start()
+        self._log(f"Mode batch paralel: {workers} worker.", level="INFO")
+
+        files_processed = 0
+        futures = {}
+        try:
+            with ProcessPoolExecutor(max_workers=workers, mp_context=ctx,
+                                     initializer=init_worker, initargs=(worker_q, self.cancel_event)) as pool:
+                for job in jobs:
+                    job.update(module_name=module_name, function_name=function_name,
+                               cache_max_bytes=self.cache.max_bytes if self.cache else None,
+                               stream_min_pages=self.stream_min_pages,
+                               ledger_path=self.ledger.path if self.ledger else None)
+                    futures[pool.submit(run_job, job)] = job
+
+                self._progress("BATCH", done=0, total=len(futures))
+                for n_done, future in enumerate(as_completed(futures), 1):
+                    if self.cancelled():
+                        # Job yang belum mulai tidak dijalankan; yang sedang berjalan berhenti sendiri
+                        for f in futures:
+                            f.cancel()
+                    if future.cancelled():
+                        continue
                     try:
-                        decrypted = False
-                        try:
-                            res = reader.decrypt("")
-                            if res:
-                                decrypted = True
-                                password = ""  # gunakan empty password
-                        except Exception:
-                            # Jika decrypt('') tidak didukung atau gagal, lanjutkan
-                            pass
-
-                        # Beberapa versi menandai is_encrypted=False setelah decrypt('') berhasil
-                        if not decrypted and not getattr(reader, "is_encrypted", False):
-                            decrypted = True
-                            password = ""
-
-                        if not decrypted:
-                            self._log(f"File '{os.path.basename(pdf_path)}' terproteksi.", level="INFO")
-                            password = self._request_gui(task_name='ask_password', text=f"Masukkan password:\n{os.path.basename(pdf_path)}", title="Password")
-                            if password is None:
-                                self._log("Dibatalkan pengguna.", level="ERROR")
-                                continue
-
-                            # Coba decrypt dengan password yg diberikan pengguna
-                            try:
-                                res = reader.decrypt(password) if reader else False
-                                # Jika decrypt gagal, laporkan kesalahan dan lanjut ke file berikutnya
-                                if not res and getattr(reader, "is_encrypted", False):
-                                    self._log("Password salah.", level="ERROR")
-                                    continue
-                            except Exception:
-                                self._log("Password salah.", level="ERROR")
-                                continue
+                        futures[future]['ok'] = future.result()
+                        if futures[future]['ok'] or not self.cancelled():
+                            self._mark(futures[future]['pdf_path'], DONE if futures[future]['ok'] else FAILED)
+                            files_processed += 1
                     except Exception as e:
-                        self._log(f"Error saat mencoba decrypt: {e}", level="ERROR")
-                        continue
-            except Exception as e:
-                self._log(f"Error cek enkripsi: {e}", level="ERROR")
-                continue
+                        self._mark(futures[future]['pdf_path'], FAILED)
+                        self._log(f"Error worker: {e}", level="ERROR")
+                    self._progress("BATCH", done=n_done, total=len(futures))
+        finally:
+            worker_q.put(None)
+            forwarder.join()
+        return files_processed + self._copy_duplicates(duplicates)
+
+    def _forward_worker_events(self, worker_q):
+        while True:
+            item = worker_q.get()
+            if item is None:
+                break
+            if item[0] == "METRIC" and self.metrics:
+                self.metrics.record(item[1])
+            else:
+                self.status_queue.put(item)
+
+    def _mark(self, pdf_path, status, file_hash=None, excel_path=None):
+        """Catat status file di journal batch (jika aktif)."""
+        if self.journal:
+            self.journal.mark(pdf_path, status, file_hash, excel_path)
+
+    def _hash_file(self, pdf_path):
+        try:
+            return file_sha256(pdf_path)
+        except OSError:
+            return None
+
+    def _copy_duplicates(self, duplicates):
+        """Salin output file duplikat setelah job pertamanya selesai. Return jumlah yang disalin."""
+        if self.cancelled():
+            return 0
+        for first_job, pdf_path, excel_path in duplicates:
+            self._copy_duplicate(first_job, pdf_path, excel_path)
+        return len(duplicates)
+
+    def _copy_duplicate(self, first_job, pdf_path, excel_path):
+        """File identik dengan file lain di batch yang sama: salin output-nya, tanpa ekstraksi ulang."""
+        src = first_job['excel_path']
+        if not first_job.get('ok') or not os.path.exists(src):
+            self._log(f"Duplikat dari {os.path.basename(first_job['pdf_path'])} (gagal diproses), dilewati: {os.path.basename(pdf_path)}", level="ERROR")
+            self._mark(pdf_path, FAILED)
+            return
+        if os.path.abspath(src) != os.path.abspath(excel_path):
+            shutil.copyfile(src, excel_path)
+        self._mark(pdf_path, DONE)
+        self._log(f"Duplikat dari {os.path.basename(first_job['pdf_path'])}, hasil disalin: {os.path.basename(pdf_path)}", level="SUCCESS")
+        self.status_queue.put(("FILE", excel_path, "SUCCESS"))
 
-            # Jika kita punya password (termasuk empty string), beberapa modul (pdfplumber/pdfminer)
-            # tidak menerima parameter password, maka kita buat salinan PDF yang sudah didekripsi.
-            temp_pdf_path = None
-            pdf_to_process = pdf_path
-            if password is not None and PdfWriter:
+    def prepare_file(self, doc, planner, file_hash=None):
+        """
+        Tahap interaktif per file (dipanggil _preflight dan watch.py): path output dan cek enkripsi/password.
+        Return dict job jika siap diekstrak, False jika dilewati.
+        """
+        pdf_path = doc.pdf_path
+        # Path output dulu: file yang dilewati kebijakan overwrite tidak perlu minta password
+        excel_path = self._resolve_output(pdf_path, planner)
+        if not excel_path:
+            return False
+
+        password = None
+        # Waktu cek enkripsi & decrypt (tanpa waktu menunggu input user)
+        fm = FileMetrics(pdf_path, emit=self._metric)
+        try:
+            with fm.stage("encryption_check"):
+                encrypted = doc.is_encrypted()
+            if encrypted:
+                # Beberapa PDF menyatakan 'encrypted' namun dapat dibuka tanpa password
+                # (owner-only encryption atau password kosong). Coba password kosong dan
+                # password yang sudah diketahui di batch ini; minta input user jika semua gagal.
                 try:
-                    reader2 = PdfReader(pdf_path)
-                    if reader2.is_encrypted:
-                        reader2.decrypt(password)
-                    writer = PdfWriter()
-                    for p in reader2.pages:
-                        writer.add_page(p)
-                    tmp = tempfile.NamedTemporaryFile(delete=False, suffix=".pdf")
-                    tmp.close()
-                    with open(tmp.name, "wb") as f:
-                        writer.write(f)
-                    temp_pdf_path = tmp.name
-                    pdf_to_process = temp_pdf_path
+                    password = self._try_known_passwords(doc, fm)
+                    if password is None:
+                        self._log(f"File '{os.path.basename(pdf_path)}' terproteksi.", level="INFO")
+                        password = self._request_gui(task_name='ask_password', text=f"Masukkan password:\n{os.path.basename(pdf_path)}", title="Password")
+                        if password is None:
+                            self._log("Dibatalkan pengguna.", level="ERROR")
+                            return False
+
+                        # Coba decrypt dengan password yg diberikan pengguna
+                        with fm.stage("decrypt"):
+                            password_ok = doc.decrypt(password)
+                        if not password_ok:
+                            self._log("Password salah.", level="ERROR")
+                            return False
+                        if self.passwords:
+                            self.passwords.remember(pdf_path, password)
                 except Exception as e:
-                    self._log(f"Warning: gagal membuat salinan decrypted: {e}", level="ERROR")
-            elif password is not None and not PdfWriter:
-                self._log("pypdf tidak tersedia; tidak dapat membuat salinan didekripsi. Beberapa file terenkripsi mungkin gagal dibuka oleh pdfplumber.", level="INFO")
-
-            base_name = os.path.basename(pdf_path)
-            file_name, _ = os.path.splitext(base_name)
-            excel_path = os.path.join(output_folder, f"{file_name}.xlsx")
-            if os.path.exists(excel_path):
-                response = self._request_gui(task_name='ask_overwrite', title="Overwrite?", message=f"File ada:\n{excel_path}\nTimpa?")
-                if response is None:
-                    if temp_pdf_path and os.path.exists(temp_pdf_path): os.remove(temp_pdf_path)
-                    return
-                elif not response:
-                    if temp_pdf_path and os.path.exists(temp_pdf_path): os.remove(temp_pdf_path)
-                    continue
+                    self._log(f"Error saat mencoba decrypt: {e}", level="ERROR")
+                    return False
+        except Exception as e:
+            self._log(f"Error cek enkripsi: {e}", level="ERROR")
+            return False
+
+        return {"pdf_path": pdf_path, "password": password, "excel_path": excel_path, "file_hash": file_hash,
+                "stages": fm.stages}
 
+    def _try_known_passwords(self, doc, fm):
+        """Password (kosong atau dari PasswordCache) yang berhasil membuka doc, atau None."""
+        candidates = self.passwords.candidates(doc.pdf_path) if self.passwords else [""]
+        for password in candidates:
+            with fm.stage("decrypt"):
+                ok = doc.decrypt(password)
+            if ok:
+                if password:
+                    self.passwords.remember(doc.pdf_path, password)
+                    self._log(f"Password tersimpan di batch ini dipakai: {os.path.basename(doc.pdf_path)}", level="INFO")
+                return password
+        return None
+
+    def _output_planner(self, file_list, output_folder):
+        """
+        OutputPlanner batch ini. Kebijakan "ask" ditanyakan ke GUI sekali saja, dan
+        hanya jika ada output yang sudah ada. None jika batch dibatalkan.
+        """
+        policy = self.overwrite_policy if self.overwrite_policy in OVERWRITE_POLICIES else OVERWRITE_POLICY
+        # Batch yang dilanjutkan memakai lagi path output yang sudah direncanakan, tanpa bertanya ulang
+        pinned = self.journal.output_paths() if self.journal else {}
+        pinned = {p: pinned[p] for p in file_list if p in pinned}
+        planner = OutputPlanner(output_folder, ext=OUTPUT_FORMATS[self.output_format], pinned=pinned)
+        existing = [p for p in file_list if p not in pinned and os.path.exists(planner.default_path(p))]
+        if policy == "ask":
+            policy = "overwrite"
+            if existing:
+                policy = self._request_gui(task_name='ask_overwrite_policy', title="File output sudah ada",
+                                           message=f"{len(existing)} dari {len(file_list)} file output sudah ada "
+                                                   f"di folder tujuan.\nPilih tindakan untuk seluruh batch:")
+                if policy not in OVERWRITE_POLICIES or policy == "ask":
+                    self._log("Dibatalkan pengguna.", level="ERROR")
+                    return None
+        if existing:
+            self._log(f"{len(existing)} file output sudah ada: {OVERWRITE_POLICIES[policy]}.", level="INFO")
+        planner.policy = policy
+        return planner
+
+    def _resolve_output(self, pdf_path, planner):
+        """Path output untuk pdf_path menurut kebijakan batch, atau False jika dilewati."""
+        excel_path = planner.plan(pdf_path)
+        if excel_path is None:
+            self._log(f"Output sudah ada, dilewati: {os.path.basename(pdf_path)}", level="INFO")
+            self._mark(pdf_path, SKIPPED)
+            return False
+        if os.path.basename(excel_path) != os.path.basename(planner.default_path(pdf_path)):
+            self._log(f"Output ditulis sebagai {os.path.basename(excel_path)}: {os.path.basename(pdf_path)}", level="INFO")
+        return excel_path
+
+    def _extract_file(self, doc, module_name, function_name, excel_path, page_workers=None, file_hash=None, stages=None):
+        """Tahap non-interaktif: deteksi (AUTO) dan ekstraksi. Aman dijalankan di proses worker."""
+        # Recorder dipasang ke parser.common agar parser ikut mencatat waktu per halaman/tahap
+        fm = FileMetrics(doc.pdf_path, emit=self._metric, stages=stages)
+        base_name = os.path.basename(doc.pdf_path)
+        set_recorder(fm)
+        set_progress(lambda page, pages: self._progress("PAGE", file=base_name, page=page, pages=pages))
+        # Baris kanonik output parser langsung diteruskan ke ledger per chunk
+        ledger_import = self._ledger_import(doc, file_hash) if self.ledger else None
+        set_row_sink(ledger_import)
+        ok = False
+        try:
+            ok = self._extract(doc, module_name, function_name, excel_path, page_workers, file_hash, fm)
+        except Cancelled:
+            self._log(f"Dibatalkan: {base_name}", level="ERROR")
+        finally:
+            set_recorder(None)
+            set_progress(None)
+            set_row_sink(None)
+            summary = fm.summary(ok)
+            self._metric(summary)
+        if ledger_import is not None:
+            with fm.stage("ledger"):
+                self._finish_ledger(ledger_import, ok)
+        if ok and summary['pages']:
+            self._log(f"Waktu: {summary['seconds']:.2f} dtk ({summary['pages']} halaman, "
+                      f"{summary['pages_per_sec']} hal/dtk).", level="INFO")
+        return ok
+
+    def _extract(self, doc, module_name, function_name, excel_path, page_workers, file_hash, fm):
+        base_name = os.path.basename(doc.pdf_path)
+        password = doc.password
+
+        # Cek cache sebelum PDF dibuka: hit berarti pdfplumber dilewati sepenuhnya.
+        # File yang belum masuk ledger tetap diekstrak, karena ledger butuh baris-barisnya.
+        if self.cache and file_hash and not (self.ledger and not self._ledger_has(file_hash)):
             if module_name == 'AUTO':
-                # Lapisan 1: Deteksi Keyword untuk Prioritas
-                pdf_text = ""
-                try:
-                    reader_txt = PdfReader(pdf_to_process)
-                    if len(reader_txt.pages) > 0:
-                        pdf_text = (reader_txt.pages[0].extract_text() or "").upper()
-                except: pass
-
-                # Urutkan: yang keyword-nya cocok dicoba duluan
-                prioritized = []
-                others = []
-                for b_mod, b_func, keywords in self.AUTO_BANKS:
-                    if any(kw.upper() in pdf_text for kw in keywords): prioritized.append((b_mod, b_func))
-                    else: others.append((b_mod, b_func))
-
-                found = False
-                for b_mod, b_func in prioritized + others:
-                    try:
-                        self._log(f"Mencoba format: {b_mod}...", level="INFO")
-                        result = self._run_module(b_mod, b_func, pdf_to_process, excel_path, password)
-                        if result and isinstance(result, int) and result > 0:
-                            self._log(f"Berhasil! Terdeteksi sebagai format {b_mod}.", level="SUCCESS")
-                            self.status_queue.put(("FILE", excel_path, "SUCCESS"))
-                            found = True
-                            break
-                    except Exception:
-                        continue
-                if not found:
-                    self._log(f"Gagal mendeteksi format untuk: {base_name}", level="ERROR")
+                candidates = [b_mod for b_mod, _, _ in self.AUTO_BANKS]
             else:
-                result = self._run_module(module_name, function_name, pdf_to_process, excel_path, password)
-                if result and isinstance(result, int) and result > 0:
+                candidates = [module_name]
+            for b_mod in candidates:
+                with fm.stage("cache_lookup"):
+                    rows = self._fetch_cached(b_mod, file_hash, excel_path)
+                if rows:
+                    fm.rows = rows
+                    self._log(f"Hasil cache dipakai ({b_mod}, {rows} baris): {base_name}", level="SUCCESS")
                     self.status_queue.put(("FILE", excel_path, "SUCCESS"))
+                    return True
 
-            if temp_pdf_path and os.path.exists(temp_pdf_path):
-                try: os.remove(temp_pdf_path)
-                except Exception: pass
-            files_processed += 1
+        try:
+            with fm.stage("open_pdf"):
+                source = doc.pdf
+                fm.n_pages = len(source.pages)
+        except Exception as e:
+            self._log(f"Error membuka PDF: {e}", level="ERROR")
+            return False
 
-        if files_processed > 0:
-            self._log("========================================", level="SEPARATOR")
-            self._log("SEMUA PROSES SELESAI.\n", level="SUCCESS")
+        # Dokumen besar ditulis streaming (memori konstan) jika parser mendukung
+        stream = bool(self.stream_min_pages) and fm.n_pages >= self.stream_min_pages
+
+        if module_name == 'AUTO':
+            # Probe ringan di halaman pertama, lalu hanya satu ekstraksi penuh
+            with fm.stage("detect"):
+                detected = self._detect_bank(doc)
+            if not detected:
+                self._log(f"Gagal mendeteksi format untuk: {base_name}", level="ERROR")
+                return False
+
+            b_mod, b_func, score = detected
+            self._log(f"Terdeteksi format {b_mod} (skor {score:.2f}).", level="INFO")
+            with fm.stage("extract"):
+                result = self._run_module(b_mod, b_func, source, excel_path, password, page_workers, file_hash, stream)
+            if result and isinstance(result, int) and result > 0:
+                fm.rows = result
+                self._log(f"Berhasil! Terdeteksi sebagai format {b_mod}.", level="SUCCESS")
+                self.status_queue.put(("FILE", excel_path, "SUCCESS"))
+                return True
+            self._log(f"Ekstraksi {b_mod} tidak menghasilkan data untuk: {base_name}", level="ERROR")
+            return False
         else:
-            self._log("Tidak ada file yang diproses.", level="INFO")   
+            with fm.stage("extract"):
+                result = self._run_module(module_name, function_name, source, excel_path, password, page_workers, file_hash, stream)
+            if result and isinstance(result, int) and result > 0:
+                fm.rows = result
+                self.status_queue.put(("FILE", excel_path, "SUCCESS"))
+                return True
+            return False
 
-    def _run_module(self, module_name, function_name, pdf_path, excel_path, password=None):
+    def _ledger_has(self, file_hash):
         try:
-            mod = importlib.import_module(module_name)
-            func = getattr(mod, function_name, None)
-            
-            if not func:
-                self._log(f"Fungsi {function_name} tidak ditemukan.", "ERROR")
-                return False
+            return self.ledger.has_import(file_hash)
+        except sqlite3.Error:
+            return False
+
+    def _ledger_import(self, doc, file_hash=None):
+        """Impor ledger bertahap untuk satu statement. Rekening diambil dari nomor di nama file."""
+        account = account_key(doc.pdf_path) or os.path.splitext(os.path.basename(doc.pdf_path))[0]
+        return LedgerImport(self.ledger, account, file_hash=file_hash, file=os.path.basename(doc.pdf_path),
+                            period=lambda: statement_period(doc.first_page_text()))
+
+    def _finish_ledger(self, job, ok):
+        """Commit impor ledger jika ekstraksi berhasil, jika tidak buang baris yang sudah masuk."""
+        try:
+            if not ok or not job.rows:
+                job.rollback()
+                return
+            inserted = job.commit()
+        except sqlite3.Error as e:
+            self._log(f"Error ledger: {e}", level="ERROR")
+            return
+        self._log(f"Ledger {job.account}: {inserted} transaksi baru, {job.rows - inserted - job.rejected} sudah ada.",
+                  level="INFO")
+        if job.rejected:
+            self._log(f"Ledger {job.account}: {job.rejected} baris dilewati (tanggal tanpa tahun, periode "
+                      f"statement tidak ditemukan).", level="ERROR")
+
+    def _detect_bank(self, doc):
+        """
+        Beri skor tiap parser AUTO di registry lewat ParserSpec.score (probe modul,
+        atau keyword kata utuh untuk parser tanpa probe), hanya halaman pertama.
+        Return (module, function, score) terbaik, atau None jika di bawah ambang.
+        """
+        try:
+            if len(doc.pdf.pages) == 0:
+                return None
+            first_page = doc.pdf.pages[0]
+        except Exception:
+            return None
+        text = doc.first_page_text()
+
+        best = None
+        for spec in auto_parsers():
+            try:
+                score = spec.score(first_page, text)
+            except Exception:
+                continue
+            if best is None or score > best[2]:
+                best = (spec.module, spec.function, score)
+
+        if best is None or best[2] < AUTO_MIN_SCORE:
+            return None
+        return best
+
+    def _fetch_cached(self, module_name, file_hash, excel_path):
+        spec = get_parser(module_name)
+        try:
+            version = spec.version if spec else 0
+        except Exception:
+            return None
+        return self.cache.fetch(file_hash, module_name, version, excel_path)
 
+    def _run_module(self, module_name, function_name, pdf_path, excel_path, password=None, page_workers=None, file_hash=None, stream=False):
+        # Cara memanggil & kemampuan parser (password, paralel per halaman, streaming)
+        # sudah dideklarasikan di parser.registry, jadi tanpa inspeksi signature
+        spec = get_parser(module_name)
+        if spec is None or spec.function != function_name:
+            self._log(f"Parser {module_name}.{function_name} tidak terdaftar.", "ERROR")
+            return False
+        if not spec.open_source:
+            pdf_path = source_path(pdf_path) or pdf_path
+        # Parser menulis ke file sementara; baru dipindah ke excel_path jika berhasil,
+        # jadi file output lama tidak tertimpa hasil setengah jadi (gagal/dibatalkan)
+        part_path = _partial_path(excel_path)
+        result = False
+        try:
             self._log("Running extraction...", "RUN")
-            # Inspeksi argumen function
-            import inspect
-            sig = inspect.signature(func)
-            call_args = {}
-            if 'pdf_path' in sig.parameters: call_args['pdf_path'] = pdf_path
-            if 'output_excel' in sig.parameters: call_args['output_excel'] = excel_path
-            if 'excel_path' in sig.parameters: call_args['excel_path'] = excel_path
-            if 'output_excel_path' in sig.parameters: call_args['output_excel_path'] = excel_path
-            if 'password' in sig.parameters and password: call_args['password'] = password
-
-            return func(**call_args)
-            
+            result = spec.run(pdf_path, part_path, password=password, page_workers=page_workers, stream=stream)
+            if result and isinstance(result, int) and result > 0 and os.path.exists(part_path):
+                os.replace(part_path, excel_path)
+                if self.cache and file_hash:
+                    self.cache.store(file_hash, module_name, spec.version, excel_path, result)
+            else:
+                result = False
+            return result
+
         except Exception as e:
             self._log(f"Error: {e}", "ERROR")
             return False
-        
-        
\ No newline at end of file
+        finally:
+            if os.path.exists(part_path):
+                try:
+                    os.remove(part_path)
+                except OSError: pass
+
+
+def _partial_path(excel_path):
+    """Path file sementara di folder yang sama dengan output (os.replace tetap atomik), ekstensi sama."""
+    folder, name = os.path.split(excel_path)
+    return os.path.join(folder, f".{name}.partial{os.path.splitext(name)[1]}")
+
+
+# --- Worker proses (ProcessPoolExecutor) ---
+# API publik untuk pemakai pool selain batch GUI (misal watch.py):
+#   ProcessPoolExecutor(initializer=init_worker, initargs=(status_queue, cancel_event))
+#   pool.submit(run_job, job)  # job = dict dari CoreLogic.prepare_file + module_name, function_name, dst.
+_worker_queue = None
+_worker_cancel = None
+
+def init_worker(status_queue, cancel_event=None):
+    """Initializer proses worker: tujuan log/event "FILE" dan cancel token batch."""
+    global _worker_queue, _worker_cancel
+    _worker_queue = status_queue
+    _worker_cancel = cancel_event
+    set_cancel(cancel_event)
+
+def run_job(job):
+    """Dijalankan di proses worker: ekstraksi satu file yang sudah disiapkan proses GUI."""
+    logic = CoreLogic(_worker_queue, None)
+    logic.cancel_event = _worker_cancel
+    if job.get('cache_max_bytes'):
+        logic.cache = ResultCache(max_bytes=job['cache_max_bytes'])
+    logic.stream_min_pages = job.get('stream_min_pages', STREAM_MIN_PAGES)
+    if job.get('ledger_path'):
+        logic.ledger = Ledger(job['ledger_path'])
+    with DocumentContext(job['pdf_path'], password=job['password']) as doc:
+        return logic._extract_file(doc, job['module_name'], job['function_name'], job['excel_path'],
+                                   file_hash=job.get('file_hash'), stages=job.get('stages'))
@@ -1,18 +1,55 @@
+import time
+_START = time.perf_counter()
+
 import sys
 import os
 import queue
+import threading
+import multiprocessing
+from startup import StartupReport, prewarm
+
+_REPORT = StartupReport(_START)
 import customtkinter as ctk
+import tkinter as tk
 from tkinter import messagebox
 
 # Import modul lokal
 from gui import FinextractUI
 from logic import CoreLogic
+from config import METRICS_ENABLED, LOG_MAX_LINES, LOG_FILE_ENABLED, OVERWRITE_POLICY
+from logfile import LogFile
+from metrics import DEFAULT_METRICS_DIR
+_REPORT.mark("ui_imports")
+
+# Batas pesan status_queue yang diproses per tick GUI; sisanya di tick berikutnya
+MAX_MESSAGES_PER_TICK = 5000
+
+# Jeda sebelum pre-warm dimulai, agar jendela sempat tampil lebih dulu
+PREWARM_DELAY_MS = 200
+
+# Queue dibaca saat ada pesan baru (event wake); timer ini hanya cadangan jika wake terlewat
+FALLBACK_POLL_MS = 1000
+WAKE_EVENT = "<<QueueWake>>"
+
+class WakeQueue(queue.Queue):
+    """queue.Queue yang memanggil wake() setiap kali item baru masuk, dari thread mana pun."""
+
+    def __init__(self, wake=None):
+        super().__init__()
+        self.wake = wake
+
+    def put(self, item, block=True, timeout=None):
+        super().put(item, block, timeout)
+        if self.wake:
+            self.wake()
 
 class MainController:
     def __init__(self):
-        #Setup Queues untuk komunikasi Thread
-        self.status_queue = queue.Queue()
-        self.request_queue = queue.Queue()
+        #Setup Queues untuk komunikasi Thread (put langsung membangunkan loop Tk)
+        self._wake_pending = threading.Event()
+        self._in_request = False
+        self.status_queue = WakeQueue(self.wake)
+        self.request_queue = WakeQueue(self.wake)
 
         #Inisialisasi Logic
         self.logic = CoreLogic(self.status_queue, self.request_queue)
@@ -24,20 +61,49 @@ class MainController:
         self.settings = self.logic.load_settings()
         ctk.set_appearance_mode(self.settings.get("appearance_mode", "System"))
         self.ui.apply_theme(self.settings.get("theme_name", "Default (Blue)"))
+        self.ui.overwrite_policy = self.settings.get("overwrite_policy", OVERWRITE_POLICY)
+        self.ui.log_max_lines = int(self.settings.get("log_max_lines", LOG_MAX_LINES))
+        self.log_file = LogFile() if self.settings.get("log_file_enabled", LOG_FILE_ENABLED) else None
+        if self.log_file:
+            self.ui.log_message(f"Log lengkap disimpan ke: {self.log_file.path}", "PATH")
+        journal = self.logic.resumable_batch()
+        if journal:
+            self.ui.log_message(f"Batch sebelumnya belum selesai ({len(journal.unfinished())} file). "
+                                f"Klik 'Lanjutkan Batch' untuk melanjutkannya.", "INFO")
 
         #Hubungkan Action GUI ke Logic
         self.ui.set_process_callback(self.start_processing)
+        self.ui.set_cancel_callback(self.logic.cancel)
+        self.ui.set_resume_callback(self.resume_batch)
+
+        #Pengecekan Queue: event wake + timer cadangan
+        self.ui.bind(WAKE_EVENT, lambda event: self.check_queues())
+        self.ui.after(FALLBACK_POLL_MS, self._poll)
+
+        #Muat modul berat di background setelah jendela tampil
+        _REPORT.mark("controller")
+        self.ui.after(PREWARM_DELAY_MS, self.start_prewarm)
 
-        #Mulai Loop Pengecekan Queue
-        self.ui.after(100, self.check_queues)
+    def start_prewarm(self):
+        _REPORT.mark("window")
+        prewarm(_REPORT, [mod for mod, _, _ in self.logic.AUTO_BANKS], on_done=self._prewarm_done)
+
+    def _prewarm_done(self, report):
+        """Dipanggil dari thread pre-warm: laporan dikirim lewat queue, bukan langsung ke GUI."""
+        if self.settings.get("metrics_enabled", METRICS_ENABLED):
+            report.save(DEFAULT_METRICS_DIR)
+        seconds = report.phases["prewarm"] - report.phases["window"]
+        self.status_queue.put(("LOG", f"Siap. Modul ekstraksi dimuat dalam {seconds:.1f} dtk "
+                                      f"(jendela tampil {report.phases['window']:.1f} dtk).", "INFO"))
 
     def save_settings(self):
         """Callback saat user mengubah setting di GUI"""
-        new_settings = {
+        self.settings.update({
             "appearance_mode": ctk.get_appearance_mode(),
-            "theme_name": self.ui.current_theme_key
-        }
-        self.logic.save_settings(new_settings)
+            "theme_name": self.ui.current_theme_key,
+            "overwrite_policy": self.ui.overwrite_policy
+        })
+        self.logic.save_settings(self.settings)
 
     def start_processing(self, module_name, function_name):
         """Dipanggil saat tombol bank diklik"""
@@ -50,46 +116,113 @@ class MainController:
         if not output_folder:
             messagebox.showerror("Error", "Harap pilih folder output.")
             return
+        if self.logic.running:
+            messagebox.showinfo("Proses Berjalan", "Tunggu batch yang sedang berjalan selesai, atau klik Batal.")
+            return
+
+        self.ui.disable_open_buttons()
+        self.ui.set_running(True)
+        self.logic.start_processing_thread(module_name, function_name, input_files, output_folder,
+                                           settings=self.settings)
 
+    def resume_batch(self):
+        """Dipanggil saat tombol Lanjutkan Batch diklik: proses ulang file batch terakhir yang belum selesai."""
+        if self.logic.running:
+            messagebox.showinfo("Proses Berjalan", "Tunggu batch yang sedang berjalan selesai, atau klik Batal.")
+            return
+        journal = self.logic.resumable_batch()
+        if journal is None:
+            messagebox.showinfo("Lanjutkan Batch", "Tidak ada batch yang belum selesai.")
+            return
         self.ui.disable_open_buttons()
-        self.logic.start_processing_thread(module_name, function_name, input_files, output_folder)
+        self.ui.set_running(True)
+        self.logic.resume_processing_thread(journal, settings=self.settings)
+
+    def wake(self):
+        """
+        Bangunkan loop Tk untuk membaca queue. Aman dipanggil dari thread lain
+        (event_generate diteruskan Tcl ke thread GUI); beberapa put berturut-turut
+        hanya menghasilkan satu event selama event sebelumnya belum diproses.
+        """
+        if self._wake_pending.is_set():
+            return
+        self._wake_pending.set()
+        try:
+            self.ui.event_generate(WAKE_EVENT, when="tail")
+        except (RuntimeError, tk.TclError):
+            # Loop Tk belum/tidak berjalan: pesan diambil oleh timer cadangan
+            self._wake_pending.clear()
+
+    def _poll(self):
+        self.check_queues()
+        self.ui.after(FALLBACK_POLL_MS, self._poll)
 
     def check_queues(self):
-        """Loop utama untuk update UI dari background thread"""
+        """Update UI dari background thread; dipanggil saat wake dan oleh timer cadangan"""
+        self._wake_pending.clear()
+        #Cek Log: pesan satu tick dikumpulkan lalu ditulis sekali; progress cukup yang terakhir
+        logs = []
+        progress = {}
+        done = False
+        more = False
         try:
-            #Cek Log
-            while True:
+            for _ in range(MAX_MESSAGES_PER_TICK):
                 msg_type, msg_content, level = self.status_queue.get_nowait()
                 if msg_type == "LOG":
-                    self.ui.log_message(msg_content, level)
+                    logs.append((msg_content, level))
                 elif msg_type == "FILE":
                     self.ui.enable_open_buttons(msg_content)
+                elif msg_type == "PROGRESS":
+                    if level == "BATCH":
+                        progress.pop("PAGE", None)
+                    progress[level] = msg_content
+                elif msg_type == "DONE":
+                    done = True
+            more = True
         except queue.Empty:
             pass
 
+        if logs:
+            self.ui.log_messages(logs)
+            if self.log_file:
+                self.log_file.write(logs)
+        for kind, info in progress.items():
+            self.ui.update_progress(kind, info)
+        if done:
+            self.ui.set_running(False)
+
         try:
-            #Cek Request (Popup Password / Overwrite)
-            while True:
+            #Cek Request (Popup Password / Kebijakan Overwrite). Selama popup terbuka, wake tetap
+            #memproses log, tapi request berikutnya menunggu popup ini selesai.
+            while not self._in_request:
                 task_name, kwargs, result_q = self.request_queue.get_nowait()
                 
-                if task_name == 'ask_password':
-                    result = self.ui.ask_password(kwargs.get('title'), kwargs.get('text'))
-                    result_q.put(result)
-                
-                elif task_name == 'ask_overwrite':
-                    result = self.ui.ask_overwrite(kwargs.get('title'), kwargs.get('message'))
-                    result_q.put(result)
+                self._in_request = True
+                try:
+                    if task_name == 'ask_password':
+                        result = self.ui.ask_password(kwargs.get('title'), kwargs.get('text'))
+                        result_q.put(result)
+
+                    elif task_name == 'ask_overwrite_policy':
+                        result = self.ui.ask_overwrite_policy(kwargs.get('title'), kwargs.get('message'))
+                        result_q.put(result)
+                finally:
+                    self._in_request = False
                     
         except queue.Empty:
             pass
-        
-        # Jadwalkan ulang
-        self.ui.after(100, self.check_queues)
+
+        # Antrian belum habis: lanjut di event berikutnya (setelah event GUI lain diproses)
+        if more:
+            self.wake()
 
     def run(self):
         self.ui.mainloop()
 
 if __name__ == '__main__':
+    # Wajib untuk ProcessPoolExecutor di build PyInstaller
+    multiprocessing.freeze_support()
+
     base_dir = os.path.dirname(os.path.abspath(__file__))
     if base_dir not in sys.path:
         sys.path.insert(0, base_dir)
@@ -0,0 +1,105 @@
+import os
+import json
+import time
+from contextlib import contextmanager
+
+DEFAULT_METRICS_DIR = os.path.join(os.path.expanduser("~"), "FinExtract_Metrics")
+
+# Jumlah halaman/file paling lambat yang dicantumkan di ringkasan
+SLOWEST_TOP = 5
+
+# Tahap di prepare_file (sebelum ekstraksi dimulai), ikut dihitung di total waktu file
+PREPARE_STAGES = ("encryption_check", "decrypt")
+
+
+class FileMetrics:
+    """
+    Pencatat waktu per tahap untuk satu file. Dipasang sebagai recorder di
+    parser.common (lihat set_recorder) agar parser ikut mencatat waktu per
+    halaman dan tahap DataFrame/penulisan Excel.
+    """
+
+    def __init__(self, pdf_path, emit=None, stages=None):
+        self.file = os.path.basename(pdf_path)
+        self.emit = emit
+        self.stages = dict(stages or {})
+        self.page_seconds = {}
+        self.n_pages = 0
+        self.rows = 0
+        self.start = time.perf_counter()
+
+    def add_stage(self, name, seconds):
+        self.stages[name] = self.stages.get(name, 0.0) + seconds
+        if self.emit:
+            self.emit({"type": "stage", "file": self.file, "stage": name, "seconds": round(seconds, 4)})
+
+    def add_page(self, page_number, seconds):
+        self.page_seconds[page_number] = self.page_seconds.get(page_number, 0.0) + seconds
+
+    @contextmanager
+    def stage(self, name):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.add_stage(name, time.perf_counter() - start)
+
+    def summary(self, ok):
+        seconds = time.perf_counter() - self.start + sum(v for k, v in self.stages.items() if k in PREPARE_STAGES)
+        n_pages = self.n_pages or len(self.page_seconds)
+        slowest = sorted(self.page_seconds.items(), key=lambda kv: kv[1], reverse=True)[:SLOWEST_TOP]
+        return {
+            "type": "file", "file": self.file, "ok": bool(ok), "rows": self.rows, "pages": n_pages,
+            "seconds": round(seconds, 4),
+            "pages_per_sec": round(n_pages / seconds, 2) if seconds and n_pages else None,
+            "rows_per_sec": round(self.rows / seconds, 2) if seconds else None,
+            "stages": {k: round(v, 4) for k, v in self.stages.items()},
+            "slowest_pages": [{"page": p, "seconds": round(s, 4)} for p, s in slowest],
+            "page_seconds": [round(self.page_seconds[p], 4) for p in sorted(self.page_seconds)],
+        }
+
+
+class RunMetrics:
+    """
+    Metrik satu batch: tiap event ditulis ke file JSON-lines per batch dan
+    diteruskan ke status_queue sebagai ("METRIC", event, type). Hanya dipakai di
+    proses utama; event dari worker masuk lewat status_queue yang diteruskan.
+    """
+
+    def __init__(self, status_queue, metrics_dir=None):
+        self.status_queue = status_queue
+        self.metrics_dir = metrics_dir or DEFAULT_METRICS_DIR
+        stamp = time.strftime("%Y%m%d-%H%M%S") + f"-{int(time.time() * 1000) % 1000:03d}"
+        self.path = os.path.join(self.metrics_dir, f"run-{stamp}.jsonl")
+        self.files = []
+        self.start = time.perf_counter()
+
+    def record(self, event):
+        event = {"ts": round(time.time(), 3), **event}
+        if event.get("type") == "file":
+            self.files.append(event)
+        try:
+            os.makedirs(self.metrics_dir, exist_ok=True)
+            with open(self.path, "a", encoding="utf-8") as f:
+                f.write(json.dumps(event) + "\n")
+        except OSError: pass
+        self.status_queue.put(("METRIC", event, event.get("type")))
+
+    def batch_summary(self, workers=1):
+        """Ringkasan batch dari semua ringkasan file yang sudah tercatat."""
+        seconds = time.perf_counter() - self.start
+        pages = sum(f["pages"] for f in self.files)
+        rows = sum(f["rows"] for f in self.files)
+        slowest_pages = sorted(({"file": f["file"], **p} for f in self.files for p in f["slowest_pages"]),
+                               key=lambda p: p["seconds"], reverse=True)[:SLOWEST_TOP]
+        slowest_files = sorted(self.files, key=lambda f: f["seconds"], reverse=True)[:SLOWEST_TOP]
+        event = {
+            "type": "batch", "files": len(self.files), "ok": sum(1 for f in self.files if f["ok"]),
+            "workers": workers, "pages": pages, "rows": rows, "seconds": round(seconds, 4),
+            "pages_per_sec": round(pages / seconds, 2) if seconds else None,
+            "rows_per_sec": round(rows / seconds, 2) if seconds else None,
+            "slowest_files": [{"file": f["file"], "seconds": f["seconds"]} for f in slowest_files],
+            "slowest_pages": slowest_pages,
+        }
+        self.record(event)
+        return event
@@ -0,0 +1,56 @@
+import os
+
+
+class OutputPlanner:
+    """
+    Path output tiap PDF dalam satu batch menurut kebijakan overwrite yang
+    dipilih sekali di awal (lihat config.OVERWRITE_POLICIES), tanpa bertanya ke
+    GUI per file:
+
+    overwrite : selalu tulis ke <nama>.xlsx (file lama ditimpa).
+    skip      : lewati PDF jika <nama>.xlsx sudah ada.
+    version   : tulis ke nama bebas berikutnya, <nama> (2).xlsx, <nama> (3).xlsx, ...
+    newer     : lewati jika <nama>.xlsx lebih baru dari PDF-nya, selain itu timpa.
+
+    Path yang sudah direncanakan di batch ini dianggap terpakai, jadi dua PDF
+    bernama sama tidak menulis ke file output yang sama.
+
+    pinned: pdf_path -> path output yang sudah direncanakan sebelumnya (batch yang
+    dilanjutkan dari journal); dipakai apa adanya tanpa melihat kebijakan.
+    """
+
+    def __init__(self, output_folder, policy="overwrite", ext=".xlsx", pinned=None):
+        self.output_folder = output_folder
+        self.policy = policy
+        self.ext = ext
+        self.pinned = dict(pinned or {})
+        self.planned = {os.path.abspath(p) for p in self.pinned.values()}
+
+    def default_path(self, pdf_path):
+        file_name, _ = os.path.splitext(os.path.basename(pdf_path))
+        return os.path.join(self.output_folder, f"{file_name}{self.ext}")
+
+    def _taken(self, path):
+        return os.path.abspath(path) in self.planned or os.path.exists(path)
+
+    def plan(self, pdf_path):
+        """Path output untuk pdf_path, atau None jika dilewati."""
+        if pdf_path in self.pinned:
+            return self.pinned[pdf_path]
+        path = self.default_path(pdf_path)
+        if os.path.abspath(path) not in self.planned and os.path.exists(path):
+            if self.policy == "skip":
+                return None
+            if self.policy == "newer":
+                try:
+                    if os.path.getmtime(path) >= os.path.getmtime(pdf_path):
+                        return None
+                except OSError: pass
+        if os.path.abspath(path) in self.planned or (self.policy == "version" and os.path.exists(path)):
+            base, ext = os.path.splitext(path)
+            n = 2
+            while self._taken(f"{base} ({n}){ext}"):
+                n += 1
+            path = f"{base} ({n}){ext}"
+        self.planned.add(os.path.abspath(path))
+        return path
@@ -1,144 +1,186 @@
-import re
 import os
+from parser.common import iter_page_records, match_ratio, has_ruling_lines, stage
+from parser.merge import RecordMerger
+from parser.template import TableTemplate
+from parser.normalize import Cents, money_column, money_value, date_column, date_value, set_money_columns
+from parser.writers import stream_to_file, dataframe_to_file
 
-def clean_number(value_str):
-    """Mengambil angka dari string."""
-    if not value_str: return 0.0
-    text = str(value_str).replace('\n', ' ').strip()
-    match = re.search(r'[\d,.]+', text)
-    if match:
-        clean_num = match.group(0).replace(',', '') # menghapus ribuan
-        try:
-            return float(clean_num)
-        except:
-            return 0.0
-    return 0.0
-
-def clean_db_cr_flag(value_str):
-    """Mencari indikator D atau C."""
-    if not value_str: return None
-    text = str(value_str).replace('\n', ' ').strip().upper()
-    
-    if ' D' in text or text.endswith('D') or text == 'D':
-        return 'D'
-    elif ' C' in text or text.endswith('C') or text == 'C':
-        return 'C'
-    return None
-
-def extract_bni_data(pdf_path, output_excel):
-    import pdfplumber
-    import pandas as pd
+# Naikkan jika output parser berubah (dipakai sebagai kunci cache hasil ekstraksi)
+PARSER_VERSION = 3
 
-    data_rows = []
-    print(f"\nMemproses file: {pdf_path}...")
-    
-    try:
-        with pdfplumber.open(pdf_path) as pdf:
-            for page_num, page in enumerate(pdf.pages):
-                table = page.extract_table({
-                    "vertical_strategy": "lines", 
-                    "horizontal_strategy": "lines",
-                    "snap_tolerance": 3,
-                })
-                
-                if not table: continue
+def probe(page, text):
+    """Skor keyakinan (0..1) dari halaman pertama bahwa PDF adalah mutasi BNI."""
+    score = 0.5 * match_ratio(text, [("BANK NEGARA INDONESIA", "BNIDIRECT", "BNI")])
+    score += 0.35 * match_ratio(text, ["NO.", ("POST DATE", "POSTING DATE"), "BRANCH", "JOURNAL", "DB/CR", "BALANCE"])
+    if has_ruling_lines(page): score += 0.15
+    return score
 
-                # --- DYNAMIC HEADER MAPPING ---
-                header_idx = -1
-                col_map = {}
-                
-                for i, row in enumerate(table):
-                    row_str = [str(cell).lower().strip() if cell else '' for cell in row]
-                    
-                    if "no." in row_str and ("post date" in row_str or "posting date" in row_str):
-                        header_idx = i
-                        for col_i, text in enumerate(row_str):
-                            if "journal" in text: col_map['journal'] = col_i
-                            elif text == "no." or text == "no": col_map['no'] = col_i
-                            elif "date" in text: col_map['date'] = col_i
-                            elif "branch" in text: col_map['branch'] = col_i
-                            elif "description" in text: col_map['desc'] = col_i
-                            elif "balance" in text: col_map['balance'] = col_i
-                            
-                            if "amount" in text: col_map['amount'] = col_i
-                            if "db/cr" in text: col_map['db_cr'] = col_i
-                        
-                        # Fallback mappings
-                        if 'amount' in col_map and 'db_cr' not in col_map:
-                            col_map['db_cr'] = col_map['amount']
-                        if 'db_cr' in col_map and 'amount' not in col_map:
-                            col_map['amount'] = col_map['db_cr']
-                            
-                        break
-                
-                if header_idx == -1: continue
-                
-                # --- PROSES DATA ---
-                current_record = None
+COLUMNS = ["No", "Posting Date", "Remark", "Reference No", "Debit", "Credit", "Balance"]
+
+TABLE_SETTINGS = {
+    "vertical_strategy": "lines", 
+    "horizontal_strategy": "lines",
+    "snap_tolerance": 3,
+}
+
+def _map_header(table):
+    """Cari baris header BNI di tabel. Return (index header, peta kolom), atau (-1, {})."""
+    # --- DYNAMIC HEADER MAPPING ---
+    header_idx = -1
+    col_map = {}
+
+    for i, row in enumerate(table):
+        row_str = [str(cell).lower().strip() if cell else '' for cell in row]
+
+        if "no." in row_str and ("post date" in row_str or "posting date" in row_str):
+            header_idx = i
+            for col_i, text in enumerate(row_str):
+                if "journal" in text: col_map['journal'] = col_i
+                elif text == "no." or text == "no": col_map['no'] = col_i
+                elif "date" in text: col_map['date'] = col_i
+                elif "branch" in text: col_map['branch'] = col_i
+                elif "description" in text: col_map['desc'] = col_i
+                elif "balance" in text: col_map['balance'] = col_i
+
+                if "amount" in text: col_map['amount'] = col_i
+                if "db/cr" in text: col_map['db_cr'] = col_i
+
+            # Fallback mappings
+            if 'amount' in col_map and 'db_cr' not in col_map:
+                col_map['db_cr'] = col_map['amount']
+            if 'db_cr' in col_map and 'amount' not in col_map:
+                col_map['amount'] = col_map['db_cr']
+
+            break
+    return header_idx, col_map
+
+def _iter_bni_records(pages, head):
+    """
+    Generator record BNI dari urutan halaman; record di-yield begitu selesai.
+    Record terakhir tetap terbuka melewati batas halaman. Sisa Remark di awal
+    rentang (milik record dari halaman sebelum rentang ini) masuk ke `head`.
+    """
+    merger = RecordMerger(head=head)
+    template = TableTemplate(TABLE_SETTINGS)
+
+    for page in pages:
+        table = template.extract(page)
+        if not table: continue
+
+        # Header & peta kolom dari halaman sebelumnya dipakai lagi selama baris
+        # header masih di posisi yang sama; jika tidak, cari ulang
+        layout = template.meta
+        header = layout.get('header')
+        if header and header[0] < len(table) and table[header[0]] == header[1]:
+            header_idx, col_map = header[0], layout['col_map']
+        else:
+            header_idx, col_map = _map_header(table)
+            if header_idx == -1: continue
+            layout['header'] = (header_idx, table[header_idx])
+            layout['col_map'] = col_map
+        
+        # --- PROSES DATA ---
+        for row in table[header_idx+1:]:
+            safe_row = [cell if cell is not None else "" for cell in row]
+            
+            # Cek Kolom No
+            val_no_idx = col_map.get('no', 0)
+            val_no = safe_row[val_no_idx].strip() if val_no_idx < len(safe_row) else ""
+            
+            if val_no:
+                # --- AMBIL DATA ---
+                val_date = safe_row[col_map.get('date', 1)].split('\n')[0]
+                val_branch = safe_row[col_map.get('branch', 2)].replace('\n', ' ').strip()
+                val_journal = safe_row[col_map.get('journal', 3)].replace('\n', '').strip()
                 
-                for row in table[header_idx+1:]:
-                    safe_row = [cell if cell is not None else "" for cell in row]
-                    
-                    # Cek Kolom No
-                    val_no_idx = col_map.get('no', 0)
-                    val_no = safe_row[val_no_idx].strip() if val_no_idx < len(safe_row) else ""
-                    
-                    if val_no:
-                        # Simpan record sebelumnya
-                        if current_record: data_rows.append(current_record)
-                        
-                        # --- AMBIL DATA ---
-                        val_date = safe_row[col_map.get('date', 1)].split('\n')[0]
-                        val_branch = safe_row[col_map.get('branch', 2)].replace('\n', ' ').strip()
-                        val_journal = safe_row[col_map.get('journal', 3)].replace('\n', '').strip()
-                        
-                        # --- LOGIKA AMOUNT & D/C ---
-                        idx_amt = col_map.get('amount', 5)
-                        idx_dbcr = col_map.get('db_cr', 5)
-                        
-                        raw_amt_str = safe_row[idx_amt] if idx_amt < len(safe_row) else ""
-                        raw_dbcr_str = safe_row[idx_dbcr] if idx_dbcr < len(safe_row) else ""
-                        
-                        amount_val = clean_number(raw_amt_str)
-                        
-                        db_cr_flag = clean_db_cr_flag(raw_dbcr_str)
-                        if not db_cr_flag and idx_amt != idx_dbcr:
-                            db_cr_flag = clean_db_cr_flag(raw_amt_str)
-
-                        # D PDF -> Credit 
-                        # C PDF -> Debit 
-                        debit = 0.0
-                        credit = 0.0
-                        
-                        if db_cr_flag == 'D':
-                            credit = amount_val
-                        elif db_cr_flag == 'C':
-                            debit = amount_val
-                        
-                        # Balance
-                        raw_balance = safe_row[col_map.get('balance', 6)]
-                        balance_val = clean_number(raw_balance)
-
-                        current_record = {
-                            "No": val_no,
-                            "Posting Date": val_date,
-                            "Remark": val_branch,
-                            "Reference No": val_journal,
-                            "Debit": debit,
-                            "Credit": credit,
-                            "Balance": balance_val
-                        }
-                    else:
-                        if current_record:
-                            idx_branch = col_map.get('branch', 2)
-                            if idx_branch < len(safe_row):
-                                extra_txt = safe_row[idx_branch].replace('\n', ' ').strip()
-                                if extra_txt:
-                                    current_record['Remark'] += " " + extra_txt
+                # --- AMOUNT & D/C ---
+                # Teks mentah disimpan; konversi angka & flag D/C dilakukan per kolom
+                # sekaligus di _normalize_frame (atau _normalize_record saat streaming).
+                idx_amt = col_map.get('amount', 5)
+                idx_dbcr = col_map.get('db_cr', 5)
                 
-                if current_record:
-                    data_rows.append(current_record)
+                raw_amt_str = safe_row[idx_amt] if idx_amt < len(safe_row) else ""
+                raw_dbcr_str = safe_row[idx_dbcr] if idx_dbcr < len(safe_row) else ""
+
+                # Record sebelumnya (Remark sudah digabung) ditutup di sini
+                done = merger.start({
+                    "No": val_no,
+                    "Posting Date": val_date,
+                    "Remark": val_branch,
+                    "Reference No": val_journal,
+                    "Amount": raw_amt_str,
+                    "DbCr": raw_dbcr_str,
+                    "Balance": safe_row[col_map.get('balance', 6)]
+                })
+                if done: yield done
+            else:
+                idx_branch = col_map.get('branch', 2)
+                if idx_branch < len(safe_row):
+                    # Lanjutan Remark; sebelum record pertama masuk ke `head`
+                    # (milik record dari rentang halaman sebelumnya)
+                    merger.append('Remark', safe_row[idx_branch].replace('\n', ' ').strip())
+
+    done = merger.flush()
+    if done: yield done
+
+def _attach_remark(record, fragments):
+    record['Remark'] += " " + " ".join(fragments)
+
+def _finish_record(record):
+    """Rapikan spasi Remark setelah semua baris lanjutan tergabung."""
+    record['Remark'] = " ".join(record['Remark'].split())
+    return record
+
+def _normalize_frame(df):
+    """
+    Konversi per kolom: Amount + flag D/C -> Debit/Credit, Balance -> int64 sen,
+    Posting Date -> datetime. Flag diambil dari kolom Db/Cr, atau dari
+    teks Amount jika kosong.
+    """
+    amount, amount_flag = money_column(df.pop("Amount"))
+    flag = money_column(df.pop("DbCr"))[1]
+    flag = flag.where(flag != "", amount_flag)
 
+    # D PDF -> Credit 
+    # C PDF -> Debit 
+    df["Debit"] = amount.where(flag == "C", 0)
+    df["Credit"] = amount.where(flag == "D", 0)
+    df["Balance"] = money_column(df["Balance"])[0]
+    df["Posting Date"] = date_column(df["Posting Date"])
+    return set_money_columns(df[COLUMNS], ["Debit", "Credit", "Balance"])
+
+def _normalize_record(record):
+    """Versi per record dari _normalize_frame (mode streaming)."""
+    amount, amount_flag = money_value(record.pop("Amount"))
+    flag = money_value(record.pop("DbCr"))[1] or amount_flag
+    record["Debit"] = amount if flag == "C" else Cents(0)
+    record["Credit"] = amount if flag == "D" else Cents(0)
+    record["Balance"] = money_value(record["Balance"])[0]
+    record["Posting Date"] = date_value(record["Posting Date"])
+    return record
+
+def extract_bni_data(pdf_path, output_excel, password=None, page_workers=None, stream=False):
+    print(f"\nMemproses file: {pdf_path}...")
+    records = iter_page_records(pdf_path, _iter_bni_records, _attach_remark,
+                                password=password, page_workers=page_workers)
+    records = (_finish_record(r) for r in records)
+
+    if stream:
+        # Mode streaming: record langsung ditulis ke file output (memori konstan)
+        try:
+            count = stream_to_file((_normalize_record(r) for r in records), output_excel, COLUMNS)
+        except Exception as e:
+            print(f"Terjadi kesalahan saat memproses PDF: {e}")
+            return 0
+        if not count:
+            print("Tidak ada data yang ditemukan atau format tabel tidak sesuai.")
+            return 0
+        print(f"\n[SUKSES] Data berhasil diekstrak dan disimpan di: {output_excel}")
+        return count
+
+    import pandas as pd
+    try:
+        data_rows = list(records)
     except Exception as e:
         print(f"Terjadi kesalahan saat membaca PDF: {e}")
         return 0
@@ -149,13 +191,16 @@ def extract_bni_data(pdf_path, output_excel):
 
     # Export ke Excel
     try:
-        df = pd.DataFrame(data_rows)
-        df['Remark'] = df['Remark'].str.replace(r'\s+', ' ', regex=True).str.strip()
+        with stage("dataframe"):
+            df = pd.DataFrame(data_rows)
+        with stage("normalize"):
+            df = _normalize_frame(df)
         
         print("\nPreview 5 Data Teratas:")
         print(df.head())
         
-        df.to_excel(output_excel, index=False)
+        with stage("write"):
+            dataframe_to_file(df, output_excel)
         print(f"\n[SUKSES] Data berhasil diekstrak dan disimpan di: {output_excel}")
         return len(data_rows)
         
@@ -1,88 +1,133 @@
 import re
 import os
+from parser.common import iter_page_records, match_ratio, stage
+from parser.merge import RecordMerger
+from parser.lines import LineRule, LineClassifier
+from parser.normalize import normalize_frame, normalize_row
+from parser.writers import stream_to_file, dataframe_to_file
 
-def extract_bri_text(pdf_path, excel_path):
-    import pdfplumber
-    import pandas as pd
-    columns = ["transaction_date", "description", "user_id", "debit", "credit", "balance"]
-    data = []
-
-    # Pattern regex
-    pattern = re.compile(
-        r"^(\d{2}/\d{2}/\d{2})\s+\d{2}:\d{2}:\d{2}\s+(.+?)\s+(\d{7,})?\s*([\d,]+\.\d{2})\s+([\d,]+\.\d{2})\s+([\d,]+\.\d{2})$"
-    )
-    desc_cont_pattern = re.compile(r"^(?!\d{2}/\d{2}/\d{2}\s+\d{2}:\d{2}:\d{2}).+")
-
-    # Daftar pattern footer
-    footer_patterns = [
-        re.compile(r"halaman\s+\d+", re.IGNORECASE),
-        re.compile(r"saldo akhir", re.IGNORECASE),
-        re.compile(r"jumlah\s+mutasi", re.IGNORECASE),
-        re.compile(r"rekening\s+koran", re.IGNORECASE),
-        re.compile(r"^$"),
-        re.compile(r"Created By IBBIZ"),
-        re.compile(r"\d{2}/\d{2}/\d{4}\s+\d{2}:\d{2}:\d{2}"),
-        re.compile(r"saldo awal", re.IGNORECASE),
-        re.compile(r"opening balance", re.IGNORECASE),
-        re.compile(r"closing balance", re.IGNORECASE),
-        re.compile(r"total transaksi debet", re.IGNORECASE),
-        re.compile(r"total debit transaction", re.IGNORECASE),
-        re.compile(r"total transaksi kredit", re.IGNORECASE),
-        re.compile(r"total credit transaction", re.IGNORECASE),
-        re.compile(r"terbilang", re.IGNORECASE),
-        re.compile(r"in words", re.IGNORECASE),
-        re.compile(r"biaya materai", re.IGNORECASE),
-        re.compile(r"revenue stamp paid", re.IGNORECASE),
+# Naikkan jika output parser berubah (dipakai sebagai kunci cache hasil ekstraksi)
+PARSER_VERSION = 3
+
+# Pattern regex baris transaksi
+TRANSACTION_PATTERN = re.compile(
+    r"^(\d{2}/\d{2}/\d{2})\s+\d{2}:\d{2}:\d{2}\s+(.+?)\s+(\d{7,})?\s*([\d,]+\.\d{2})\s+([\d,]+\.\d{2})\s+([\d,]+\.\d{2})$"
+)
+
+def probe(page, text):
+    """Skor keyakinan (0..1) dari halaman pertama bahwa PDF adalah mutasi BRI."""
+    score = 0.4 * match_ratio(text, [("BANK RAKYAT INDONESIA", "BRIDIRECT", "IBBIZ", "IBIZ", "BRI")])
+    # Layout BRI berbasis teks: cukup satu baris transaksi yang cocok
+    if any(TRANSACTION_PATTERN.match(line.strip()) for line in text.split("\n")):
+        score += 0.45
+    score += 0.15 * match_ratio(text, ["DEBET", "KREDIT", "SALDO"])
+    return score
+
+# Pattern baris footer/header halaman: (regex, ignore_case, literal prefilter)
+FOOTER_RULES = [
+    (r"halaman\s+\d+", True, ("halaman",)),
+    (r"saldo akhir", True, ("saldo akhir",)),
+    (r"jumlah\s+mutasi", True, ("jumlah",)),
+    (r"rekening\s+koran", True, ("rekening",)),
+    (r"^$", False, None),
+    (r"Created By IBBIZ", False, ("Created By IBBIZ",)),
+    (r"\d{2}/\d{2}/\d{4}\s+\d{2}:\d{2}:\d{2}", False, None),
+    (r"saldo awal", True, ("saldo awal",)),
+    (r"opening balance", True, ("opening balance",)),
+    (r"closing balance", True, ("closing balance",)),
+    (r"total transaksi debet", True, ("total transaksi debet",)),
+    (r"total debit transaction", True, ("total debit transaction",)),
+    (r"total transaksi kredit", True, ("total transaksi kredit",)),
+    (r"total credit transaction", True, ("total credit transaction",)),
+    (r"terbilang", True, ("terbilang",)),
+    (r"in words", True, ("in words",)),
+    (r"biaya materai", True, ("biaya materai",)),
+    (r"revenue stamp paid", True, ("revenue stamp paid",)),
+]
+
+# Satu classifier untuk footer, transaksi, dan lanjutan deskripsi (urutan = prioritas)
+BRI_LINES = LineClassifier(
+    [LineRule("footer", p, anywhere=True, ignore_case=ic, literals=lits) for p, ic, lits in FOOTER_RULES]
+    + [
+        LineRule("transaction", TRANSACTION_PATTERN.pattern),
+        LineRule("continuation", r"(?!\d{2}/\d{2}/\d{2}\s+\d{2}:\d{2}:\d{2}).+"),
     ]
+)
+
+def is_footer(line):
+    return BRI_LINES.classify(line)[0] == "footer"
 
-    def is_footer(line):
-        return any(p.search(line) for p in footer_patterns)
+COLUMNS = ["transaction_date", "description", "user_id", "debit", "credit", "balance"]
+MONEY_COLUMNS = ["debit", "credit", "balance"]
+DATE_COLUMNS = ["transaction_date"]
 
-    temp_row = None
-    with pdfplumber.open(pdf_path) as pdf:
-        for page in pdf.pages:
-            text = page.extract_text()
-            if not text:
+def _iter_bri_records(pages, head):
+    """
+    Generator baris transaksi BRI dari urutan halaman. Record ditutup di akhir
+    tiap halaman (baris di atas transaksi pertama suatu halaman adalah header
+    halaman), jadi `head` tidak pernah diisi dan rentang halaman bisa diproses
+    terpisah tanpa record yang terpotong.
+    """
+    # Tanpa `head`: lanjutan sebelum transaksi pertama halaman diabaikan
+    merger = RecordMerger()
+    classify = BRI_LINES.classify
+    for page in pages:
+        text = page.extract_text()
+        if not text:
+            continue
+
+        for line in text.split("\n"):
+            line = line.strip()
+            kind, groups = classify(line)
+            if kind == "footer":
                 continue
 
-            for line in text.split("\n"):
-                line = line.strip()
-                if is_footer(line):
-                    continue
-
-                match = pattern.match(line)
-                if match:
-                    if temp_row:
-                        data.append(temp_row)
-                    
-                    groups = match.groups()
-                    
-                    tgl = groups[0]
-                    desc = groups[1]
-                    user_id = groups[2]
-                    
-                    # Mengambil angka mentah dari PDF
-                    angka_posisi_kiri = groups[3]
-                    angka_posisi_kanan = groups[4]
-                    balance = groups[5]
-                    
-                    debit = angka_posisi_kanan 
-                    credit = angka_posisi_kiri 
-                                        
-                    temp_row = [tgl, desc.strip(), user_id or "", debit, credit, balance]
-
-                elif temp_row and desc_cont_pattern.match(line):
-                    temp_row[1] += " " + line.strip()
-                    
-            if temp_row:
-                data.append(temp_row)
-                temp_row = None
-
-    df = pd.DataFrame(data, columns=columns)
-    
+            if kind == "transaction":
+                tgl = groups[0]
+                desc = groups[1]
+                user_id = groups[2]
+                
+                # Mengambil angka mentah dari PDF
+                angka_posisi_kiri = groups[3]
+                angka_posisi_kanan = groups[4]
+                balance = groups[5]
+                
+                debit = angka_posisi_kanan 
+                credit = angka_posisi_kiri 
+                                    
+                done = merger.start([tgl, desc.strip(), user_id or "", debit, credit, balance])
+                if done:
+                    yield done
+
+            elif kind == "continuation":
+                merger.append(1, line)
+                
+        done = merger.flush()
+        if done:
+            yield done
+
+def extract_bri_text(pdf_path, excel_path, password=None, page_workers=None, stream=False):
+    records = iter_page_records(pdf_path, _iter_bri_records,
+                                password=password, page_workers=page_workers)
+    if not stream:
+        import pandas as pd
+        data = list(records)
+
     # Error handling permission
     try:
-        df.to_excel(excel_path, index=False)
+        if stream:
+            # Mode streaming: baris langsung ditulis ke file output (memori konstan)
+            rows = (normalize_row(r, money=(3, 4, 5), dates=(0,)) for r in records)
+            count = stream_to_file(rows, excel_path, COLUMNS)
+            print(f"Data berhasil diekspor ke {excel_path} dengan {count} baris.")
+            return count
+
+        with stage("dataframe"):
+            df = pd.DataFrame(data, columns=COLUMNS)
+        with stage("normalize"):
+            normalize_frame(df, money=MONEY_COLUMNS, dates=DATE_COLUMNS)
+        with stage("write"):
+            dataframe_to_file(df, excel_path)
         print(f"Data berhasil diekspor ke {excel_path} dengan {len(df)} baris.")
         return len(data)
     except PermissionError:
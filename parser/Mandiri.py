@@ -1,44 +1,125 @@
 import re
+from parser.common import open_pdf, iter_pages, has_word, match_ratio, has_ruling_lines, stage
+from parser.merge import NEW, SKIP, merge_rows
+from parser.template import TableTemplate
+from parser.normalize import find_columns, normalize_frame, normalize_row
+from parser.writers import stream_to_file, dataframe_to_file
 
-def process_bank_statement(pdf_path, output_excel_path):
-    import pdfplumber
-    import pandas as pd
+# Naikkan jika output parser berubah (dipakai sebagai kunci cache hasil ekstraksi)
+PARSER_VERSION = 3
+
+def probe(page, text):
+    """Skor keyakinan (0..1) dari halaman pertama bahwa PDF adalah rekening koran Mandiri."""
+    score = 0.4 * match_ratio(text, [("BANK MANDIRI", "MANDIRI", "ACCOUNT STATEMENT")])
+    # Signature header sama dengan validasi di process_bank_statement
+    score += 0.45 * max(match_ratio(text, [("KETERANGAN", "DESCRIPTION"), ("CABANG", "BRANCH")]),
+                        match_ratio(text, ["POSTING DATE", "REMARK"]))
+    if has_ruling_lines(page): score += 0.15
+    # Export Livin' juga menyebut Mandiri; serahkan ke parser Livin
+    if has_word(text, "LIVIN"): score *= 0.5
+    return score
+
+def _iter_table_rows(pages, state):
+    """
+    Baris tabel mentah per halaman. Header tabel pertama yang lolos validasi
+    signature disimpan di state['headers'].
+    """
+    template = TableTemplate()
+    for page in pages:
+        table = template.extract(page)
+        
+        if table:
+            if 'headers' not in state:
+                temp_headers = [str(h).replace('\n', ' ').strip() for h in table[0]]
+                header_str = " ".join(temp_headers).upper()
+                
+                # Validasi Signature: 
+                # 1. Format Rekening Koran: Ada (KETERANGAN/DESCRIPTION) DAN (CABANG/BRANCH)
+                # 2. Format Account Statement: Ada (POSTING DATE) DAN (REMARK)
+                if (("KETERANGAN" in header_str or "DESCRIPTION" in header_str) and ("CABANG" in header_str or "BRANCH" in header_str)) or \
+                   ("POSTING DATE" in header_str and "REMARK" in header_str):
+                    state['headers'] = temp_headers
+                    data = table[1:]
+                else:
+                    continue
+            else:
+                data = table
+            
+            yield from data
+
+def _iter_mandiri_rows(pages, state):
+    """
+    Generator baris data Mandiri. Remark multi-baris sudah tergabung di dalam sel
+    tabel, jadi setiap baris tidak kosong adalah satu record (tanpa baris lanjutan).
+    """
+    def classify(row):
+        return NEW if row and any(row) else SKIP
+
+    yield from merge_rows(_iter_table_rows(pages, state), classify, lambda row: row, lambda row: ())
+
+def _swap_debit_credit(rows, state):
+    """Versi streaming dari penukaran kolom Debit/Credit, per baris."""
+    cols = None
+    for row in rows:
+        if cols is None:
+            headers = state['headers']
+            cols = (next((i for i, c in enumerate(headers) if 'Debit' in c), None),
+                    next((i for i, c in enumerate(headers) if 'Credit' in c), None))
+            if None in cols:
+                print("Peringatan: Kolom Debit atau Credit tidak ditemukan secara otomatis.")
+        col_debit, col_credit = cols
+        if col_debit is not None and col_credit is not None and max(col_debit, col_credit) < len(row):
+            row = list(row)
+            row[col_debit], row[col_credit] = row[col_credit], row[col_debit]
+        yield row
 
+# Keyword header kolom uang & tanggal untuk normalisasi
+MONEY_KEYWORDS = ("DEBIT", "DEBET", "CREDIT", "KREDIT", "BALANCE", "SALDO")
+DATE_KEYWORDS = ("DATE", "TANGGAL")
+
+def _normalize_rows(rows, state):
+    """Versi streaming dari normalisasi kolom uang/tanggal, per baris."""
+    cols = None
+    for row in rows:
+        if cols is None:
+            headers = state['headers']
+            cols = (find_columns(headers, MONEY_KEYWORDS), find_columns(headers, DATE_KEYWORDS))
+        money, dates = cols
+        row = list(row)
+        yield normalize_row(row, money=[i for i in money if i < len(row)], dates=[i for i in dates if i < len(row)])
+
+def process_bank_statement(pdf_path, output_excel_path, stream=False):
     print(f"Membaca file: {pdf_path}...")
     
-    all_data = []
-    headers = None
+    state = {}
     
-    with pdfplumber.open(pdf_path) as pdf:
-        for page in pdf.pages:
-            table = page.extract_table()
-            
-            if table:
-                if headers is None:
-                    temp_headers = [str(h).replace('\n', ' ').strip() for h in table[0]]
-                    header_str = " ".join(temp_headers).upper()
-                    
-                    # Validasi Signature: 
-                    # 1. Format Rekening Koran: Ada (KETERANGAN/DESCRIPTION) DAN (CABANG/BRANCH)
-                    # 2. Format Account Statement: Ada (POSTING DATE) DAN (REMARK)
-                    if (("KETERANGAN" in header_str or "DESCRIPTION" in header_str) and ("CABANG" in header_str or "BRANCH" in header_str)) or \
-                       ("POSTING DATE" in header_str and "REMARK" in header_str):
-                        headers = temp_headers
-                        data = table[1:]
-                    else:
-                        continue
-                else:
-                    data = table
-                
-                for row in data:
-                    if row and any(row): 
-                        all_data.append(row)
+    with open_pdf(pdf_path) as pdf:
+        rows = _iter_mandiri_rows(iter_pages(pdf.pages), state)
 
+        if stream:
+            # Mode streaming: baris langsung ditulis ke file output (memori konstan)
+            try:
+                count = stream_to_file(_normalize_rows(_swap_debit_credit(rows, state), state), output_excel_path,
+                                       lambda: state['headers'])
+            except Exception as e:
+                print(f"Gagal menyimpan file Excel: {e}")
+                return 0
+            if not count:
+                print("Gagal menemukan tabel atau data Mandiri yang valid.")
+                return 0
+            print(f"Selesai! Data tersimpan di: {output_excel_path}")
+            return count
+
+        all_data = list(rows)
+
+    import pandas as pd
+    headers = state.get('headers')
     if headers is None or not all_data:
         print("Gagal menemukan tabel atau data Mandiri yang valid.")
         return 0
 
-    df = pd.DataFrame(all_data, columns=headers)
+    with stage("dataframe"):
+        df = pd.DataFrame(all_data, columns=headers)
     
     col_debit = next((c for c in df.columns if 'Debit' in c), None)
     col_credit = next((c for c in df.columns if 'Credit' in c), None)
@@ -53,8 +134,13 @@ def process_bank_statement(pdf_path, output_excel_path):
     else:
         print("Peringatan: Kolom Debit atau Credit tidak ditemukan secara otomatis.")
 
+    with stage("normalize"):
+        normalize_frame(df, money=[headers[i] for i in find_columns(headers, MONEY_KEYWORDS)],
+                        dates=[headers[i] for i in find_columns(headers, DATE_KEYWORDS)])
+
     try:
-        df.to_excel(output_excel_path, index=False)
+        with stage("write"):
+            dataframe_to_file(df, output_excel_path)
         print(f"Selesai! Data tersimpan di: {output_excel_path}")
         return len(all_data)
     except Exception as e:
@@ -1,10 +1,21 @@
 import os
 import re
+from parser.common import open_pdf, iter_pages, match_ratio, has_ruling_lines, stage
+from parser.merge import NEW, CONTINUATION, SKIP, merge_rows
+from parser.template import TableTemplate
+from parser.normalize import find_columns, normalize_frame, normalize_row
+from parser.writers import stream_to_file, dataframe_to_file
+
+# Naikkan jika output parser berubah (dipakai sebagai kunci cache hasil ekstraksi)
+PARSER_VERSION = 3
+
+DATE_PATTERN = re.compile(r'\d{1,2}/\d{1,2}')
+NEW_TRANSACTION_KEYWORDS = ["BEGINNING BALANCE", "SALDO AWAL", "SALDO SEBELUMNYA", "BROUGHT FORWARD"]
 
 def is_date(string):
     """Cek apakah string berisi pola tanggal (angka/angka)"""
     if not string: return False
-    return bool(re.search(r'\d{1,2}/\d{1,2}', str(string)))
+    return bool(DATE_PATTERN.search(str(string)))
 
 def is_new_transaction(row):
     """
@@ -18,73 +29,122 @@ def is_new_transaction(row):
         return True
 
     row_text = " ".join([str(cell).upper() for cell in row])
-    keywords = ["BEGINNING BALANCE", "SALDO AWAL", "SALDO SEBELUMNYA", "BROUGHT FORWARD"]
     
-    if any(keyword in row_text for keyword in keywords):
+    if any(keyword in row_text for keyword in NEW_TRANSACTION_KEYWORDS):
         return True
         
     return False
 
-def process_ocbc_final(pdf_path, output_excel_path, password=None):
-    import pdfplumber
-    import pandas as pd
+def probe(page, text):
+    """Skor keyakinan (0..1) dari halaman pertama bahwa PDF adalah mutasi OCBC."""
+    score = 0.5 * match_ratio(text, [("OCBC NISP", "BANK OCBC", "OCBC")])
+    # Header ketat OCBC: TRANS, URAIAN/DESCRIPTION, dan VALUTA
+    score += 0.35 * match_ratio(text, ["TRANS", ("URAIAN", "DESCRIPTION"), "VALUTA"])
+    if has_ruling_lines(page): score += 0.15
+    return score
+
+def _iter_table_rows(pages):
+    """Baris tabel semua halaman, sudah dibersihkan dari spasi dan newline."""
+    template = TableTemplate()
+    for page in pages:
+        table = template.extract(page)
+        if not table: continue
+
+        for row in table:
+            yield [str(cell).replace('\n', ' ').strip() if cell else "" for cell in row]
+
+def _iter_ocbc_transactions(pages, state):
+    """
+    Generator transaksi OCBC (baris lanjutan sudah digabung), diproses per halaman.
+    Header tabel OCBC pertama yang valid disimpan di state['headers'].
+    """
+    def classify(row):
+        state['raw_rows'] = True
+        if not any(row): return SKIP
+        # Header berulang di tiap halaman biasanya identik dengan header pertama
+        if row == state.get('headers'): return SKIP
+
+        row_str = " ".join(row).upper()
+        # Validasi Ketat: OCBC harus punya TRANS, URAIAN, dan VALUTA
+        if 'TRANS' in row_str and ('URAIAN' in row_str or 'DESCRIPTION' in row_str) and 'VALUTA' in row_str:
+            if 'headers' not in state:
+                state['headers'] = row
+            return SKIP
+
+        # Guard: Jangan proses baris apa pun jika header OCBC belum ditemukan
+        if 'headers' not in state:
+            return SKIP
+
+        return NEW if is_new_transaction(row) else CONTINUATION
+
+    def continuation(row):
+        # Lanjutan uraian ada di kolom ke-3
+        return [(2, row[2] if len(row) > 2 else "")]
+
+    yield from merge_rows(_iter_table_rows(pages), classify, list, continuation)
+
+def _swap_debit_credit(rows, state):
+    """Versi streaming dari penukaran kolom Debit/Kredit, per baris."""
+    cols = None
+    for row in rows:
+        if cols is None:
+            headers = state['headers']
+            cols = (next((i for i, c in enumerate(headers) if 'DEB' in c.upper()), None),
+                    next((i for i, c in enumerate(headers) if 'KRE' in c.upper() or 'CRE' in c.upper()), None))
+            if None in cols:
+                print("[Warning] Kolom Debit/Kredit tidak ditemukan otomatis. Penukaran dilewati.")
+        col_debit, col_credit = cols
+        if col_debit is not None and col_credit is not None and max(col_debit, col_credit) < len(row):
+            row[col_debit], row[col_credit] = row[col_credit], row[col_debit]
+        yield row
+
+# Keyword header kolom uang & tanggal untuk normalisasi
+MONEY_KEYWORDS = ("DEB", "KRE", "CRE", "SALDO", "BALANCE")
+DATE_KEYWORDS = ("TGL", "DATE", "TANGGAL")
+
+def _normalize_rows(rows, state):
+    """Versi streaming dari normalisasi kolom uang/tanggal, per baris."""
+    cols = None
+    for row in rows:
+        if cols is None:
+            headers = state['headers']
+            cols = (find_columns(headers, MONEY_KEYWORDS), find_columns(headers, DATE_KEYWORDS))
+        money, dates = cols
+        yield normalize_row(row, money=[i for i in money if i < len(row)], dates=[i for i in dates if i < len(row)])
+
+def process_ocbc_final(pdf_path, output_excel_path, password=None, stream=False):
     print(f"Membaca file: {pdf_path}...")
     
-    all_raw_rows = []
+    state = {}
     
     # 1. EKSTRAKSI DATA
-    with pdfplumber.open(pdf_path, password=password) as pdf:
-        for page in pdf.pages:
-            table = page.extract_table()
-            if table:
-                cleaned_table = []
-                for row in table:
-                    # Bersihkan spasi dan newline
-                    cleaned_row = [str(cell).replace('\n', ' ').strip() if cell else "" for cell in row]
-                    cleaned_table.append(cleaned_row)
-                all_raw_rows.extend(cleaned_table)
-
-    if not all_raw_rows:
+    with open_pdf(pdf_path, password=password) as pdf:
+        transactions = _iter_ocbc_transactions(iter_pages(pdf.pages), state)
+
+        if stream:
+            # Mode streaming: transaksi langsung ditulis ke file output (memori konstan)
+            try:
+                rows = _normalize_rows(_swap_debit_credit(transactions, state), state)
+                count = stream_to_file(rows, output_excel_path,
+                                       lambda: state['headers'])
+            except Exception as e:
+                print(f"Gagal menyimpan file Excel: {e}")
+                return 0
+            if not count:
+                print("Data kosong atau tidak terbaca.")
+                return 0
+            print(f"Selesai! File tersimpan: {output_excel_path}")
+            return count
+
+        merged_data = list(transactions)
+
+    import pandas as pd
+    if not state.get('raw_rows'):
         print("Data kosong atau tidak terbaca.")
         return 0
 
-    merged_data = []
-    current_transaction = None
-    header_found = False
-    headers = []
-
-    for row in all_raw_rows:
-        if not any(row): continue
-
-        row_str = " ".join(row).upper()
-        # Validasi Ketat: OCBC harus punya TRANS, URAIAN, dan VALUTA
-        if 'TRANS' in row_str and ('URAIAN' in row_str or 'DESCRIPTION' in row_str) and 'VALUTA' in row_str:
-            if not header_found:
-                headers = row
-                header_found = True
-            continue 
-        
-        # Guard: Jangan proses baris apa pun jika header OCBC belum ditemukan
-        if not header_found:
-            continue
-
-        if is_new_transaction(row):
-            if current_transaction:
-                merged_data.append(current_transaction)
-            
-            current_transaction = row[:]
-            
-        else:
-            if current_transaction:
-                desc_part = row[2] if len(row) > 2 else ""
-
-                if desc_part:
-                    current_transaction[2] += " " + desc_part
-            else:
-                pass
-
-    if current_transaction:
-        merged_data.append(current_transaction)
+    header_found = 'headers' in state
+    headers = state.get('headers', [])
 
     if not header_found or not merged_data:
         headers = ["TGL TRANS", "TGL VALUTA", "URAIAN", "DEBET", "KREDIT", "SALDO"]
@@ -96,7 +156,8 @@ def process_ocbc_final(pdf_path, output_excel_path, password=None):
             headers.append(f"EXTRA_{len(headers)}")
         headers = headers[:max_cols]
 
-    df = pd.DataFrame(merged_data, columns=headers)
+    with stage("dataframe"):
+        df = pd.DataFrame(merged_data, columns=headers)
     
     print("Menukar posisi Debit dan Kredit...")
     
@@ -110,8 +171,13 @@ def process_ocbc_final(pdf_path, output_excel_path, password=None):
     else:
         print("[Warning] Kolom Debit/Kredit tidak ditemukan otomatis. Penukaran dilewati.")
 
+    with stage("normalize"):
+        normalize_frame(df, money=[headers[i] for i in find_columns(headers, MONEY_KEYWORDS)],
+                        dates=[headers[i] for i in find_columns(headers, DATE_KEYWORDS)])
+
     try:
-        df.to_excel(output_excel_path, index=False)
+        with stage("write"):
+            dataframe_to_file(df, output_excel_path)
         print(f"Selesai! File tersimpan: {output_excel_path}")
         return len(merged_data)
     except Exception as e:
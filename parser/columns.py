@@ -0,0 +1,165 @@
+import re
+from bisect import bisect_right
+
+# Toleransi (pt) pengelompokan kata ke satu baris dan jarak batas kolom dari header
+Y_TOLERANCE = 3
+X_PADDING = 2
+
+
+class ColumnSpec:
+    """
+    Satu kolom tabel tanpa garis.
+
+    name   : nama kolom output.
+    labels : teks header kolom (dibandingkan per kata, lowercase tanpa tanda baca,
+             jadi "No." cocok dengan "no"), boleh beberapa alternatif, misal
+             ("posting date", "tanggal").
+    align  : "left" untuk teks rata kiri (boleh melebar ke kanan, misal Remark),
+             "right" untuk angka rata kanan.
+    """
+
+    def __init__(self, name, labels, align="left"):
+        self.name = name
+        labels = (labels,) if isinstance(labels, str) else labels
+        self.labels = [[t for t in map(_token, label.split()) if t] for label in labels]
+        self.align = align
+
+
+class HeaderNotFound(ValueError):
+    """Tidak ada halaman yang memuat header tabel; tanpa batas kolom tidak ada baris yang bisa dibaca."""
+
+
+class ColumnLayout:
+    """
+    Batas x kolom yang dipelajari dari posisi header. Kata dimasukkan ke kolom
+    lewat bisect titik tengahnya terhadap daftar batas (urut).
+    """
+
+    def __init__(self, specs, spans):
+        self.specs = specs
+        bounds = []
+        for (_, x1), (nx0, _), nxt in zip(spans, spans[1:], specs[1:]):
+            # Teks rata kiri mulai tepat di x0 header-nya; angka rata kanan bisa mulai
+            # sebelum header, jadi batasnya di tengah celah antar header
+            bounds.append(nx0 - X_PADDING if nxt.align == "left" else (x1 + nx0) / 2)
+        self.bounds = bounds
+
+    def cells(self, line):
+        """Kata-kata satu baris (urut x) -> list teks per kolom."""
+        cells = [[] for _ in self.specs]
+        for w in line:
+            cells[bisect_right(self.bounds, (w["x0"] + w["x1"]) / 2)].append(w["text"])
+        return [" ".join(c) for c in cells]
+
+
+def group_lines(words, y_tolerance=Y_TOLERANCE):
+    """Kelompokkan kata per baris teks (urut atas-bawah, tiap baris urut kiri-kanan)."""
+    lines = []
+    line = []
+    line_top = None
+    for w in sorted(words, key=lambda w: w["top"]):
+        if line_top is None or w["top"] - line_top > y_tolerance:
+            if line:
+                lines.append(sorted(line, key=lambda w: w["x0"]))
+            line = []
+            line_top = w["top"]
+        line.append(w)
+    if line:
+        lines.append(sorted(line, key=lambda w: w["x0"]))
+    return lines
+
+
+_PUNCT = re.compile(r"[^\w]+")
+
+def _token(text):
+    """Teks kata untuk pencocokan header: lowercase tanpa tanda baca ("No." -> "no")."""
+    return _PUNCT.sub("", text.lower())
+
+def _find_label(texts, label):
+    """Index kata pertama tempat `label` (list kata) muncul berurutan di texts, atau -1."""
+    n = len(label)
+    for i in range(len(texts) - n + 1):
+        if texts[i:i + n] == label:
+            return i
+    return -1
+
+def _stack_lines(line, below):
+    """
+    Gabungkan header dua baris ("Reference" di atas "No."): kata yang bertumpuk
+    secara horizontal jadi satu blok (atas lalu bawah), blok diurutkan kiri-kanan.
+    """
+    blocks = []
+    for w in sorted(line + below, key=lambda w: w["x0"]):
+        if blocks and w["x0"] < blocks[-1][1] and blocks[-1][2][-1]["top"] != w["top"]:
+            block = blocks[-1]
+            block[1] = max(block[1], w["x1"])
+            block[2].append(w)
+        else:
+            blocks.append([w["x0"], w["x1"], [w]])
+    return [w for _, _, words in blocks for w in sorted(words, key=lambda w: (w["top"], w["x0"]))]
+
+def match_header(line, specs, below=None):
+    """
+    Return ColumnLayout jika baris ini memuat header semua kolom (urut kiri-kanan),
+    else None. Jika `below` (baris berikutnya) diberikan, header boleh terbagi dua baris.
+    """
+    words = _stack_lines(line, below) if below else line
+    words = [w for w in words if _token(w["text"])]
+    texts = [_token(w["text"]) for w in words]
+    spans = []
+    for spec in specs:
+        for label in spec.labels:
+            i = _find_label(texts, label)
+            if i >= 0:
+                matched = words[i:i + len(label)]
+                spans.append((min(w["x0"] for w in matched), max(w["x1"] for w in matched)))
+                break
+        else:
+            return None
+    if any(b[0] <= a[0] for a, b in zip(spans, spans[1:])):
+        return None
+    return ColumnLayout(specs, spans)
+
+def find_header(lines, specs):
+    """Return (index baris, layout, jumlah baris header) untuk header pertama di lines, atau (None, None, 0)."""
+    for i, line in enumerate(lines):
+        found = match_header(line, specs)
+        if found:
+            return i, found, 1
+        if i + 1 < len(lines):
+            found = match_header(line, specs, lines[i + 1])
+            if found:
+                return i, found, 2
+    return None, None, 0
+
+
+def iter_word_rows(pages, specs, layout=None, **word_settings):
+    """
+    Generator baris tabel (list teks per kolom) dari posisi kata, tanpa
+    extract_table. Tiap halaman cukup satu kali extract_words; baris sebelum dan
+    termasuk header dilewati. Halaman tanpa header memakai layout halaman sebelumnya.
+
+    Posisi dan teks baris header terakhir diingat: halaman berikutnya cukup dicek
+    di baris yang sama, pencarian header penuh hanya jika tidak cocok.
+
+    Raise HeaderNotFound jika tidak ada satu halaman pun yang memuat header.
+    """
+    header = None
+    for page in pages:
+        lines = group_lines(page.extract_words(**word_settings))
+        start = 0
+        if header and header[0] + header[2] <= len(lines) and \
+                [[w["text"] for w in line] for line in lines[header[0]:header[0] + header[2]]] == header[1]:
+            start = header[0] + header[2]
+        else:
+            i, found, n = find_header(lines, specs)
+            if found:
+                layout, start = found, i + n
+                header = (i, [[w["text"] for w in line] for line in lines[i:i + n]], n)
+        if layout is None:
+            continue
+        for line in lines[start:]:
+            yield layout.cells(line)
+    if layout is None:
+        labels = ", ".join(" / ".join(" ".join(label) for label in spec.labels) for spec in specs)
+        raise HeaderNotFound(f"Header tabel tidak ditemukan di PDF (dicari: {labels}).")
@@ -0,0 +1,219 @@
+import os
+import re
+import time
+import threading
+from contextlib import contextmanager
+from functools import lru_cache
+
+
+@contextmanager
+def open_pdf(source, password=None):
+    """
+    Buka PDF dengan pdfplumber. `source` boleh berupa path, atau objek PDF
+    pdfplumber yang sudah terbuka (dari DocumentContext) yang dipakai apa
+    adanya dan tidak ditutup di sini.
+    """
+    if hasattr(source, "pages"):
+        yield source
+        return
+
+    import pdfplumber
+    with pdfplumber.open(source, password=password) as pdf:
+        yield pdf
+
+# Hook recorder/progress/cancel disimpan per thread: tiap batch GUI berjalan di
+# thread-nya sendiri, jadi hook satu batch tidak pernah terlihat oleh batch lain
+_hooks = threading.local()
+
+def _hook(name):
+    return getattr(_hooks, name, None)
+
+# --- Instrumentasi waktu (diisi CoreLogic per file, lihat metrics.FileMetrics) ---
+def set_recorder(recorder):
+    """Pasang recorder (punya add_stage & add_page) untuk file yang sedang diproses. None = nonaktif."""
+    _hooks.recorder = recorder
+
+@contextmanager
+def stage(name):
+    """Catat durasi satu tahap parser (misal 'dataframe', 'write') ke recorder aktif."""
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        recorder = _hook("recorder")
+        if recorder is not None:
+            recorder.add_stage(name, time.perf_counter() - start)
+
+# --- Progress & pembatalan (diisi CoreLogic per batch/file) ---
+
+class Cancelled(BaseException):
+    """
+    Ekstraksi dihentikan lewat cancel token. Turunan BaseException (seperti
+    KeyboardInterrupt) agar tidak tertelan `except Exception` di parser.
+    """
+
+def set_progress(callback):
+    """Pasang callback progress(halaman_selesai, total_halaman) untuk file yang sedang diproses. None = nonaktif."""
+    _hooks.progress = callback
+
+def set_cancel(token):
+    """
+    Pasang cancel token (multiprocessing Event dari context spawn, karena juga
+    diteruskan ke worker ekstraksi paralel). None = tidak bisa dibatalkan.
+    """
+    _hooks.cancel = token
+
+def check_cancel():
+    """Raise Cancelled jika token sudah di-set."""
+    token = _hook("cancel")
+    if token is not None and token.is_set():
+        raise Cancelled()
+
+def source_path(source):
+    """Path file dari source (path atau objek PDF pdfplumber). None jika PDF berasal dari buffer memori."""
+    if isinstance(source, (str, os.PathLike)):
+        return os.fspath(source)
+    path = getattr(source, "path", None)
+    return os.fspath(path) if path else None
+
+
+# --- Ekstraksi paralel per rentang halaman ---
+PAGE_PARALLEL_MIN_PAGES = 200   # di bawah ini, overhead proses worker tidak sepadan
+PAGE_CHUNK_SIZE = 50            # ukuran minimum satu rentang halaman
+
+def page_ranges(n_pages, chunk_size):
+    """Bagi 0..n_pages menjadi rentang (start, stop) berurutan."""
+    return [(start, min(start + chunk_size, n_pages)) for start in range(0, n_pages, chunk_size)]
+
+def iter_pages(pages):
+    """
+    Iterasi halaman dan bebaskan cache objek tiap halaman setelah selesai dipakai.
+    Waktu pemrosesan tiap halaman (ekstraksi + penggabungan baris) dicatat ke recorder.
+    Cancel token dicek sebelum tiap halaman, progress dilaporkan setelahnya.
+    """
+    total = len(pages) if hasattr(pages, "__len__") else None
+    recorder, progress = _hook("recorder"), _hook("progress")
+    for i, page in enumerate(pages):
+        check_cancel()
+        start = time.perf_counter()
+        yield page
+        if recorder is not None:
+            recorder.add_page(getattr(page, "page_number", i + 1), time.perf_counter() - start)
+        close = getattr(page, "close", None)
+        if close:
+            close()
+        if progress is not None:
+            progress(i + 1, total)
+
+def _init_chunk_worker(cancel):
+    set_cancel(cancel)
+
+def _run_chunk(records_fn, pdf_path, start, stop, password=None):
+    """Worker ekstraksi paralel: proses halaman [start, stop), return (head, records)."""
+    head = []
+    with open_pdf(pdf_path, password=password) as pdf:
+        records = list(records_fn(iter_pages(pdf.pages[start:stop]), head))
+    return head, records
+
+def stitch_chunks(chunks, attach=None):
+    """
+    Sambung hasil chunk (head, records) sesuai urutan halaman. `head` adalah
+    fragmen lanjutan di awal chunk yang milik record terakhir sebelumnya, dan
+    disambungkan lewat attach(record, head). Record terakhir ditahan sampai head
+    chunk berikutnya diketahui, jadi hasil bisa dialirkan tanpa menunggu semua chunk.
+    """
+    pending = None
+    for head, records in chunks:
+        if head and pending is not None and attach:
+            attach(pending, head)
+        if records:
+            if pending is not None:
+                yield pending
+            yield from records[:-1]
+            pending = records[-1]
+    if pending is not None:
+        yield pending
+
+def iter_page_records(source, records_fn, attach=None, password=None, page_workers=None):
+    """
+    Generator record berurutan dari records_fn(pages, head). records_fn harus
+    generator level modul (agar bisa di-pickle) yang menaruh fragmen lanjutan
+    sebelum record pertamanya ke list `head`.
+
+    Jika page_workers > 1 dan dokumen cukup besar, halaman dibagi per rentang ke
+    worker proses lalu hasilnya disambung dengan stitch_chunks. Jumlah rentang yang
+    berjalan dibatasi agar hasil yang menunggu giliran tidak menumpuk di memori.
+    """
+    with open_pdf(source, password=password) as pdf:
+        n_pages = len(pdf.pages)
+        path = source_path(source)
+        if not page_workers or page_workers < 2 or not path or n_pages < PAGE_PARALLEL_MIN_PAGES:
+            yield from records_fn(iter_pages(pdf.pages), [])
+            return
+
+    import multiprocessing
+    from collections import deque
+    from concurrent.futures import ProcessPoolExecutor
+    from functools import partial
+
+    chunk_size = max(PAGE_CHUNK_SIZE, -(-n_pages // (page_workers * 4)))
+    ranges = page_ranges(n_pages, chunk_size)
+    print(f"Ekstraksi paralel: {n_pages} halaman, {len(ranges)} rentang, {page_workers} worker.")
+    chunk_fn = partial(_run_chunk, records_fn)
+    ctx = multiprocessing.get_context("spawn")
+    # Worker ikut memegang cancel token, jadi rentang yang sedang berjalan berhenti dalam satu halaman
+    with ProcessPoolExecutor(max_workers=min(page_workers, len(ranges)), mp_context=ctx,
+                             initializer=_init_chunk_worker, initargs=(_hook("cancel"),)) as pool:
+        def ordered_results():
+            window = deque()
+            todo = iter(ranges)
+            for start, stop in todo:
+                window.append((pool.submit(chunk_fn, path, start, stop, password), stop))
+                if len(window) >= page_workers * 2:
+                    break
+            while window:
+                future, stop = window.popleft()
+                result = future.result()
+                check_cancel()
+                progress = _hook("progress")
+                if progress is not None:
+                    progress(stop, n_pages)
+                for start, stop in todo:
+                    window.append((pool.submit(chunk_fn, path, start, stop, password), stop))
+                    break
+                yield result
+        yield from stitch_chunks(ordered_results(), attach)
+
+def extract_page_records(source, records_fn, attach=None, password=None, page_workers=None):
+    """Seperti iter_page_records, tapi mengembalikan list."""
+    return list(iter_page_records(source, records_fn, attach, password, page_workers))
+
+
+# --- Probe AUTO detection ---
+@lru_cache(maxsize=None)
+def _word_pattern(word):
+    return re.compile(r"(?<![A-Z0-9])" + re.escape(word.upper()) + r"(?![A-Z0-9])")
+
+def has_word(text, word):
+    """Cek keyword sebagai kata utuh, misal 'BRI' tidak cocok dengan 'FABRIKASI'."""
+    return bool(_word_pattern(word).search(text))
+
+def match_ratio(text, words):
+    """
+    Fraksi (0..1) dari `words` yang muncul sebagai kata utuh di text (uppercase).
+    Item berupa tuple dianggap cocok jika salah satu alternatifnya muncul.
+    """
+    if not words: return 0.0
+    hits = 0
+    for w in words:
+        alternatives = w if isinstance(w, tuple) else (w,)
+        if any(has_word(text, alt) for alt in alternatives):
+            hits += 1
+    return hits / len(words)
+
+def has_ruling_lines(page, min_lines=4):
+    """Cek apakah halaman punya garis tabel (layout tabel bergaris)."""
+    try:
+        return len(page.lines) + len(page.rects) >= min_lines
+    except Exception:
+        return False
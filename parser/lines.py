@@ -0,0 +1,90 @@
+import re
+
+_NONE = frozenset()
+
+
+class LineRule:
+    """
+    Satu aturan klasifikasi baris teks.
+
+    kind        : jenis baris yang dikembalikan jika aturan cocok (boleh sama untuk
+                  beberapa aturan, misal banyak pola "footer").
+    pattern     : regex (string). Dicocokkan dari awal baris, kecuali anywhere=True
+                  (setara re.search).
+    ignore_case : regex & literal tidak peka huruf besar/kecil.
+    literals    : prefilter murah; aturan hanya diuji jika salah satu literal ada
+                  di baris. None = selalu diuji.
+    """
+
+    def __init__(self, kind, pattern, anywhere=False, ignore_case=False, literals=None):
+        self.kind = kind
+        self.pattern = pattern
+        self.anywhere = anywhere
+        self.ignore_case = ignore_case
+        if literals is not None:
+            literals = tuple(lit.lower() if ignore_case else lit for lit in literals)
+        self.literals = literals
+        self.n_groups = re.compile(pattern).groups
+
+    def source(self):
+        body = f"(?i:{self.pattern})" if self.ignore_case else f"(?:{self.pattern})"
+        return (".*?" + body) if self.anywhere else body
+
+
+class LineClassifier:
+    """
+    Classifier baris untuk parser berbasis teks. Semua aturan digabung menjadi satu
+    regex (alternasi berurutan), jadi satu baris cukup dicocokkan sekali dan
+    hasilnya langsung berupa jenis baris + field yang ditangkap. Urutan aturan =
+    prioritas. Aturan dengan `literals` hanya ikut di regex gabungan jika
+    literalnya ada di baris; varian regex per kombinasi aturan aktif di-cache.
+
+    Parser bank lain cukup mendefinisikan daftar LineRule-nya sendiri, lalu
+    memakai classify() di loop barisnya (lihat parser.BRI).
+    """
+
+    def __init__(self, rules, default="other"):
+        self.rules = list(rules)
+        self.default = default
+        self._guarded = [(i, r.literals, r.ignore_case) for i, r in enumerate(self.rules) if r.literals is not None]
+        # Semua literal digabung jadi satu pencarian (lowercase, jadi boleh terlalu inklusif;
+        # regex aturannya tetap yang menentukan cocok atau tidak)
+        literals = sorted({lit.lower() for _, lits, _ in self._guarded for lit in lits}, key=len, reverse=True)
+        self._literal_re = re.compile("|".join(map(re.escape, literals))) if literals else None
+        self._compiled = {}
+
+    def _compile(self, active):
+        parts = []
+        slots = {}
+        group = 1
+        for i, rule in enumerate(self.rules):
+            if rule.literals is not None and i not in active:
+                continue
+            parts.append(f"({rule.source()})")
+            slots[group] = (rule.kind, group, rule.n_groups)
+            group += 1 + rule.n_groups
+        regex = re.compile("|".join(parts)) if parts else None
+        self._compiled[active] = (regex, slots)
+        return regex, slots
+
+    def _active(self, line):
+        """Index aturan ber-literal yang perlu diuji untuk baris ini."""
+        if self._literal_re is None:
+            return _NONE
+        low = line.lower()
+        if not self._literal_re.search(low):
+            return _NONE
+        # Jarang terjadi: cek tiap literal satu per satu
+        return frozenset(i for i, literals, ignore_case in self._guarded
+                         if any(lit in (low if ignore_case else line) for lit in literals))
+
+    def classify(self, line):
+        """Return (kind, groups) untuk satu baris. (default, ()) jika tidak ada aturan yang cocok."""
+        active = self._active(line)
+        regex, slots = self._compiled.get(active) or self._compile(active)
+        m = regex.match(line) if regex else None
+        if not m:
+            return self.default, ()
+        # Grup pembungkus aturan adalah grup terakhir yang ditutup -> lastindex
+        kind, start, n_groups = slots[m.lastindex]
+        return kind, m.groups()[start:start + n_groups]
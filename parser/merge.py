@@ -0,0 +1,79 @@
+# Hasil classifier baris untuk merge_rows
+NEW = "new"
+CONTINUATION = "continuation"
+SKIP = "skip"
+
+
+class RecordMerger:
+    """
+    Penggabung record multi-baris. Fragmen lanjutan dikumpulkan per field dalam
+    list dan baru digabung sekali saat record ditutup (bukan `s += " " + teks`
+    per baris yang kuadratik untuk remark panjang).
+
+    Satu objek dipakai untuk seluruh dokumen, jadi record yang terbuka ikut
+    terbawa melewati batas halaman. Fragmen sebelum record pertama masuk ke list
+    `head` (jika diberikan), untuk disambung ke record dari rentang halaman sebelumnya.
+    """
+
+    def __init__(self, sep=" ", head=None):
+        self.sep = sep
+        self.head = head
+        self.current = None
+        self.parts = {}
+
+    def start(self, record):
+        """Buka record baru. Return record sebelumnya yang sudah digabung, atau None."""
+        done = self.flush()
+        self.current = record
+        return done
+
+    def append(self, key, text):
+        """
+        Tambahkan fragmen ke field `key` record yang sedang terbuka. Field yang
+        tidak ada di record (misal kolom ekstra di tabel halaman lain) diabaikan.
+        """
+        if not text:
+            return
+        if self.current is None:
+            if self.head is not None:
+                self.head.append(text)
+            return
+        try:
+            self.current[key]
+        except (KeyError, IndexError):
+            return
+        self.parts.setdefault(key, []).append(text)
+
+    def flush(self):
+        """Tutup record yang terbuka. Return record itu (sudah digabung), atau None."""
+        record = self.current
+        if record is None:
+            return None
+        for key, parts in self.parts.items():
+            record[key] = self.sep.join([record[key], *parts])
+        self.current = None
+        self.parts = {}
+        return record
+
+
+def merge_rows(rows, classify, make_record, continuation, sep=" ", head=None):
+    """
+    Generator record dari baris mentah (semua halaman, berurutan).
+
+    classify(row)     -> NEW, CONTINUATION, atau SKIP
+    make_record(row)  -> record baru (list atau dict)
+    continuation(row) -> iterable (key, teks) yang disambung ke record terbuka
+    """
+    merger = RecordMerger(sep, head)
+    for row in rows:
+        kind = classify(row)
+        if kind == NEW:
+            done = merger.start(make_record(row))
+            if done is not None:
+                yield done
+        elif kind == CONTINUATION:
+            for key, text in continuation(row):
+                merger.append(key, text)
+    done = merger.flush()
+    if done is not None:
+        yield done
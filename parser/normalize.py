@@ -0,0 +1,131 @@
+import re
+from datetime import datetime
+
+# Nilai uang disimpan sebagai integer satuan terkecil (sen): 1,234.56 -> 123456.
+# Integer ini yang dibawa sampai ke file output; hanya Excel yang menampilkan rupiah
+# (dibagi MINOR_UNITS saat ditulis), CSV/Parquet/SQLite/ledger menyimpan sen.
+MINOR_UNITS = 100
+
+# Kolom DataFrame berisi sen disimpan di df.attrs[MONEY_ATTR] (lihat set_money_columns)
+MONEY_ATTR = "money_columns"
+
+# Satu pola untuk semua konvensi: pemisah ribuan '.' atau ',', desimal 1-2 digit
+# opsional (pemisah terakhir), tanda minus di depan/belakang atau kurung, dan flag D/C.
+# "1,234.56", "1.234,56", "1.234" (ribuan), "12,5" (desimal), "1,000.00 D",
+# "-1,000.00", "1,000.00-", "(1,000.00)"
+MONEY_PATTERN = (r"^\D*?(?P<neg>-|\()?\s*(?:(?P<int>\d[\d.,]*?)(?:[.,](?P<frac>\d{1,2}))?)?"
+                 r"\s*(?P<tneg>-)?\s*\)?\s*(?:(?<![A-Z])(?P<flag>DB|CR|D|C))?\s*$")
+_MONEY_RE = re.compile(MONEY_PATTERN)
+_FLAGS = {"DB": "D", "CR": "C"}
+
+
+class Cents(int):
+    """
+    Nilai uang satu sel (mode streaming) dalam sen. Turunan int, jadi CSV/Parquet/
+    SQLite menulisnya apa adanya; writer xlsx membaginya dengan MINOR_UNITS.
+    """
+    __slots__ = ()
+
+def set_money_columns(df, columns):
+    """Tandai kolom DataFrame yang berisi sen (dibaca parser.writers saat menulis output)."""
+    df.attrs[MONEY_ATTR] = [c for c in columns if c in df.columns]
+    return df
+
+def money_columns(df):
+    return [c for c in df.attrs.get(MONEY_ATTR, ()) if c in df.columns]
+
+# Bagian tanggal dari sel (jam/teks lain dibuang), lalu dicoba format satu per satu
+DATE_PATTERN = r"(\d{1,2}[/-]\d{1,2}[/-]\d{2,4}|\d{1,2}\s+[A-Za-z]{3}\s+\d{4}|\d{4}-\d{2}-\d{2})"
+DATE_FORMATS = ("%d/%m/%Y", "%d/%m/%y", "%d-%m-%Y", "%d-%m-%y", "%d %b %Y", "%Y-%m-%d")
+_DATE_RE = re.compile(DATE_PATTERN)
+
+
+# --- Versi kolom (vektor, pandas) ---
+
+def money_column(values):
+    """
+    Konversi satu kolom teks uang sekaligus. Return (minor, flag): Series int64
+    satuan sen (tidak terbaca = 0) dan Series flag 'D'/'C'/'' (flag boleh berdiri
+    sendiri tanpa angka, misal kolom Db/Cr).
+    """
+    import pandas as pd
+    s = pd.Series(values, dtype=object).fillna("").astype(str).str.replace("\n", " ", regex=False).str.upper()
+    parts = s.str.extract(MONEY_PATTERN)
+    whole = pd.to_numeric(parts["int"].str.replace(r"[.,]", "", regex=True), errors="coerce").fillna(0).astype("int64")
+    frac = pd.to_numeric(parts["frac"].fillna("").str.ljust(2, "0"), errors="coerce").fillna(0).astype("int64")
+    minor = whole * MINOR_UNITS + frac
+    minor = minor.where(parts["neg"].isna() & parts["tneg"].isna(), -minor)
+    flags = parts["flag"].fillna("").replace(_FLAGS)
+    return minor, flags
+
+def to_amount(minor):
+    """Satuan sen -> nilai rupiah (hanya untuk tampilan Excel)."""
+    return minor / MINOR_UNITS
+
+def date_column(values, formats=DATE_FORMATS):
+    """
+    Konversi satu kolom teks tanggal ke datetime. Nilai yang bukan tanggal lengkap
+    (misal '01/10' tanpa tahun) dibiarkan apa adanya.
+    """
+    import pandas as pd
+    s = pd.Series(values, dtype=object).fillna("").astype(str)
+    core = s.str.extract(DATE_PATTERN, expand=False)
+    out = pd.Series(pd.NaT, index=s.index, dtype="datetime64[ns]")
+    for fmt in formats:
+        missing = out.isna() & core.notna()
+        if not missing.any():
+            break
+        parsed = pd.to_datetime(core[missing], format=fmt, errors="coerce")
+        out[missing] = parsed.where(parsed.dt.year >= 1900)
+    if (out.notna() | (s.str.strip() == "")).all():
+        return out
+    return out.astype(object).where(out.notna(), s)
+
+def find_columns(headers, keywords):
+    """Index kolom yang header-nya mengandung salah satu keyword (uppercase)."""
+    return [i for i, h in enumerate(headers) if any(k in str(h).upper() for k in keywords)]
+
+def normalize_frame(df, money=(), dates=()):
+    """Normalisasi kolom uang (-> int64 sen, ditandai set_money_columns) dan tanggal (-> datetime) di DataFrame."""
+    for col in money:
+        if col in df.columns:
+            df[col] = money_column(df[col])[0]
+    for col in dates:
+        if col in df.columns:
+            df[col] = date_column(df[col])
+    return set_money_columns(df, money)
+
+
+# --- Versi per nilai (mode streaming), aturan sama dengan versi kolom ---
+
+def money_value(value):
+    """Return (minor, flag) untuk satu nilai teks; minor berupa Cents."""
+    m = _MONEY_RE.match(str(value or "").replace("\n", " ").upper())
+    if not m:
+        return Cents(0), ""
+    flag = m.group("flag") or ""
+    if not m.group("int"):
+        return Cents(0), _FLAGS.get(flag, flag)
+    minor = int(re.sub(r"[.,]", "", m.group("int"))) * MINOR_UNITS + int((m.group("frac") or "").ljust(2, "0"))
+    return Cents(-minor if m.group("neg") or m.group("tneg") else minor), _FLAGS.get(flag, flag)
+
+def date_value(value, formats=DATE_FORMATS):
+    """datetime untuk satu nilai teks, atau nilai asli jika bukan tanggal lengkap."""
+    m = _DATE_RE.search(str(value or ""))
+    if m:
+        for fmt in formats:
+            try:
+                dt = datetime.strptime(m.group(1), fmt)
+            except ValueError:
+                continue
+            if dt.year >= 1900:
+                return dt
+    return value
+
+def normalize_row(row, money=(), dates=()):
+    """Versi per baris dari normalize_frame; `money`/`dates` berisi index atau key kolom."""
+    for key in money:
+        row[key] = money_value(row[key])[0]
+    for key in dates:
+        row[key] = date_value(row[key])
+    return row
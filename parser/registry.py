@@ -0,0 +1,83 @@
+import importlib
+
+
+class ParserSpec:
+    """
+    Deklarasi satu parser bank beserta kemampuannya. Modul parser baru di-import
+    saat pertama dipakai, jadi daftar ini aman di-import dari config/GUI.
+
+    Semua fungsi parser dipanggil dengan bentuk yang sama lewat run():
+    func(source, excel_path, [password=], [page_workers=], [stream=]); argumen
+    opsional hanya dikirim jika kemampuannya dideklarasikan di sini.
+
+    password      : fungsi menerima argumen `password` (PDF terenkripsi dari path).
+    open_source   : `source` boleh berupa objek PDF pdfplumber yang sudah terbuka
+                    (dari DocumentContext), bukan hanya path.
+    page_parallel : ekstraksi bisa dibagi per rentang halaman (`page_workers`).
+    stream        : mendukung output streaming memori konstan (`stream`).
+    probe         : modul punya fungsi `probe(page, text)` untuk deteksi AUTO;
+                    jika tidak, AUTO memakai `keywords`.
+    auto          : ikut dicoba di deteksi AUTO.
+    """
+
+    def __init__(self, key, label, module, function, keywords=(), password=False, open_source=True,
+                 page_parallel=False, stream=False, probe=True, auto=True):
+        self.key = key
+        self.label = label
+        self.module = module
+        self.function = function
+        self.keywords = list(keywords)
+        self.password = password
+        self.open_source = open_source
+        self.page_parallel = page_parallel
+        self.stream = stream
+        self.probe = probe
+        self.auto = auto
+
+    def load(self):
+        return importlib.import_module(self.module)
+
+    @property
+    def version(self):
+        """PARSER_VERSION modul (kunci cache hasil ekstraksi)."""
+        return getattr(self.load(), "PARSER_VERSION", 0)
+
+    def run(self, source, excel_path, password=None, page_workers=None, stream=False):
+        """Entry point seragam. Return jumlah baris (int > 0) jika berhasil."""
+        kwargs = {}
+        if password and self.password: kwargs["password"] = password
+        if page_workers and self.page_parallel: kwargs["page_workers"] = page_workers
+        if stream and self.stream: kwargs["stream"] = True
+        return getattr(self.load(), self.function)(source, excel_path, **kwargs)
+
+    def score(self, page, text):
+        """Skor keyakinan (0..1) dari halaman pertama bahwa PDF cocok dengan parser ini."""
+        if self.probe:
+            return self.load().probe(page, text)
+        from parser.common import match_ratio
+        return match_ratio(text, [tuple(kw.upper() for kw in self.keywords)])
+
+
+# Urutan = urutan tombol & urutan dicoba di AUTO
+PARSERS = [
+    ParserSpec("BNI", "BNI", "parser.BNI", "extract_bni_data",
+               ["BANK NEGARA INDONESIA", "BNIDIRECT"], password=True, page_parallel=True, stream=True),
+    ParserSpec("Mandiri", "Mandiri", "parser.Mandiri", "process_bank_statement",
+               ["BANK MANDIRI", "MANDIRI", "ACCOUNT STATEMENT"], stream=True),
+    ParserSpec("Livin", "Livin' by Mandiri", "parser.Livin", "process_livin_statement",
+               ["LIVIN BY MANDIRI"], stream=True),
+    ParserSpec("OCBC", "OCBC", "parser.OCBC", "process_ocbc_final",
+               ["OCBC NISP", "BANK OCBC", "OCBC"], password=True, stream=True),
+    ParserSpec("BRI", "BRI", "parser.BRI", "extract_bri_text",
+               ["BANK RAKYAT INDONESIA", "BRIDIRECT", "IBBIZ", "IBIZ", "BRI"], password=True, page_parallel=True,
+               stream=True),
+]
+
+_BY_MODULE = {p.module: p for p in PARSERS}
+
+def get_parser(module_name):
+    """ParserSpec untuk nama modul (misal 'parser.BNI'), atau None."""
+    return _BY_MODULE.get(module_name)
+
+def auto_parsers():
+    return [p for p in PARSERS if p.auto]
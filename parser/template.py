@@ -0,0 +1,84 @@
+from bisect import bisect_left
+
+# Selisih maksimum (pt) posisi garis kolom agar halaman dianggap cocok dengan template
+GRID_TOLERANCE = 2
+
+
+def _grid(table):
+    """Posisi x garis kolom (kiri/kanan semua sel) sebuah tabel pdfplumber."""
+    return sorted({x for cell in table.cells for x in (cell[0], cell[2])})
+
+def extract_cells(table, **text_settings):
+    """
+    Isi sel tabel pdfplumber, hasil sama dengan table.extract(). Karakter halaman
+    diurutkan sekali lalu dibagi ke baris dan sel lewat bisect, bukan dicek satu
+    per satu terhadap setiap baris dan sel (kuadratik untuk tabel panjang).
+    """
+    from pdfplumber import utils
+
+    chars = table.page.chars
+    v_mid = [(c["top"] + c["bottom"]) / 2 for c in chars]
+    h_mid = [(c["x0"] + c["x1"]) / 2 for c in chars]
+    by_v = sorted(range(len(chars)), key=v_mid.__getitem__)
+    v_sorted = [v_mid[i] for i in by_v]
+
+    table_arr = []
+    for row in table.rows:
+        _, top, _, bottom = row.bbox
+        in_row = by_v[bisect_left(v_sorted, top):bisect_left(v_sorted, bottom)]
+        in_row.sort(key=h_mid.__getitem__)
+        h_sorted = [h_mid[i] for i in in_row]
+
+        arr = []
+        for cell in row.cells:
+            if cell is None:
+                arr.append(None)
+                continue
+            x0, top, x1, bottom = cell
+            # Urutan karakter asli dipertahankan seperti di pdfplumber
+            idx = sorted(i for i in in_row[bisect_left(h_sorted, x0):bisect_left(h_sorted, x1)]
+                         if top <= v_mid[i] < bottom)
+            if not idx:
+                arr.append("")
+                continue
+            kwargs = text_settings
+            if "layout" in text_settings:
+                kwargs = {**text_settings, "layout_width": x1 - x0, "layout_height": bottom - top, "layout_bbox": cell}
+            arr.append(utils.extract_text([chars[i] for i in idx], **kwargs))
+        table_arr.append(arr)
+    return table_arr
+
+
+class TableTemplate:
+    """
+    Layout tabel bergaris yang dipelajari dari halaman pertama lalu dipakai ulang
+    di halaman berikutnya dalam satu dokumen: grid garis kolom dan hasil belajar
+    milik parser di `meta` (misal peta kolom dan posisi baris header).
+
+    Halaman berikutnya dianggap cocok jika grid kolom tabelnya sama (dalam
+    GRID_TOLERANCE); `meta` dari halaman pertama langsung dipakai. Jika tidak
+    cocok, template dipelajari ulang dari halaman itu dan `meta` dikosongkan.
+    """
+
+    def __init__(self, settings=None):
+        from pdfplumber.table import TableSettings
+
+        self.settings = TableSettings.resolve(settings)
+        self.text_settings = self.settings.text_settings or {}
+        self.grid = None
+        self.meta = {}
+
+    def matches(self, grid):
+        return (self.grid is not None and len(grid) == len(self.grid)
+                and all(abs(a - b) <= GRID_TOLERANCE for a, b in zip(grid, self.grid)))
+
+    def extract(self, page):
+        """Tabel terbesar di halaman (list baris, sama dengan page.extract_table), atau None."""
+        table = page.find_table(self.settings)
+        if table is None:
+            return None
+        grid = _grid(table)
+        if not self.matches(grid):
+            self.grid = grid
+            self.meta = {}
+        return extract_cells(table, **self.text_settings)
@@ -0,0 +1,343 @@
+import os
+import importlib.util
+import threading
+from datetime import date, datetime
+
+from parser.normalize import MINOR_UNITS, Cents, money_columns
+
+# Format tampilan kolom tanggal di Excel
+DATE_FORMAT = "dd/mm/yyyy"
+
+# Batas baris data satu sheet Excel (1.048.576 baris dikurangi header). Baris
+# berikutnya ditulis ke sheet lanjutan (Sheet2, Sheet3, ...) dengan header yang sama.
+XLSX_MAX_ROWS = 1048576 - 1
+
+# Format output, dipilih dari ekstensi file output
+OUTPUT_FORMATS = {"xlsx": ".xlsx", "csv": ".csv", "parquet": ".parquet", "sqlite": ".sqlite"}
+
+# Kolom seragam semua bank untuk format data (CSV/Parquet/SQLite). Kolom parser
+# dipetakan lewat keyword header (uppercase, dicek berurutan: "TGL VALUTA" harus
+# masuk value_date sebelum "TGL" dicocokkan ke posting_date). Kolom tanpa padanan
+# (misal "No") dibuang; padanan yang tidak ada di bank itu diisi kosong.
+CANONICAL_COLUMNS = ["posting_date", "value_date", "description", "reference", "debit", "credit", "balance"]
+CANONICAL_KEYWORDS = [
+    ("value_date", ("VALUTA", "VALUE DATE")),
+    ("posting_date", ("POSTING DATE", "TRANSACTION_DATE", "TGL", "TANGGAL", "DATE")),
+    ("description", ("REMARK", "DESCRIPTION", "URAIAN", "KETERANGAN")),
+    ("reference", ("REFERENCE", "REF")),
+    ("debit", ("DEBIT", "DEBET")),
+    ("credit", ("CREDIT", "KREDIT")),
+    ("balance", ("BALANCE", "SALDO")),
+]
+DATE_COLUMNS = ("posting_date", "value_date")
+# Kolom uang kanonik berisi integer sen (parser.normalize.MINOR_UNITS): 1,234.56 -> 123456
+AMOUNT_COLUMNS = ("debit", "credit", "balance")
+
+# Nama tabel di file SQLite dan jumlah baris per batch tulis (Parquet/SQLite streaming)
+SQLITE_TABLE = "transactions"
+BATCH_ROWS = 10000
+
+# Penerima salinan baris kanonik yang ditulis parser (diisi CoreLogic untuk ledger), per thread
+_hooks = threading.local()
+
+def set_row_sink(sink):
+    """
+    Pasang list yang ikut menerima setiap baris output parser dalam bentuk kanonik
+    (list nilai urut CANONICAL_COLUMNS), apa pun format file-nya. None = nonaktif.
+    """
+    _hooks.row_sink = sink
+
+
+def output_format(output_path):
+    """Format output ("xlsx", "csv", ...) dari ekstensi path. Ekstensi lain dianggap xlsx."""
+    ext = os.path.splitext(output_path)[1].lower()
+    return next((fmt for fmt, e in OUTPUT_FORMATS.items() if e == ext), "xlsx")
+
+def check_format(fmt):
+    """Pesan error jika format tidak dikenal atau dependensinya tidak terpasang, else None."""
+    if fmt not in OUTPUT_FORMATS:
+        return f"Format output tidak dikenal: {fmt} (pilihan: {', '.join(OUTPUT_FORMATS)})."
+    if fmt == "parquet" and importlib.util.find_spec("pyarrow") is None:
+        return "Format parquet membutuhkan paket pyarrow (pip install pyarrow)."
+    return None
+
+
+class XlsxStreamWriter:
+    """
+    Writer xlsx dengan memori konstan (xlsxwriter `constant_memory`): tiap baris
+    langsung di-flush ke disk, jadi tidak ada list/DataFrame/workbook utuh di memori.
+    Baris harus ditulis berurutan dari atas ke bawah. Lebih dari XLSX_MAX_ROWS baris
+    dilanjutkan di sheet berikutnya, tidak pernah terpotong diam-diam.
+    """
+
+    def __init__(self, output_path, columns, max_rows=XLSX_MAX_ROWS):
+        import xlsxwriter
+        self.columns = list(columns)
+        self.max_rows = max_rows
+        self.workbook = xlsxwriter.Workbook(output_path, {"constant_memory": True})
+        # Meniru gaya header default pandas.to_excel
+        self.header_fmt = self.workbook.add_format({"bold": True, "border": 1, "align": "center", "valign": "top"})
+        self.date_fmt = self.workbook.add_format({"num_format": DATE_FORMAT})
+        self.sheets = 0
+        self._add_sheet()
+        self.rows = 0
+
+    def _add_sheet(self):
+        self.sheets += 1
+        self.worksheet = self.workbook.add_worksheet(f"Sheet{self.sheets}")
+        self.worksheet.write_row(0, 0, self.columns, self.header_fmt)
+        self.sheet_rows = 0
+
+    def write(self, record):
+        """Tulis satu record (list atau dict dengan kunci sesuai kolom)."""
+        if isinstance(record, dict):
+            record = [record.get(col) for col in self.columns]
+        if self.sheet_rows >= self.max_rows:
+            self._add_sheet()
+            print(f"Batas baris Excel tercapai: data lanjut di Sheet{self.sheets} "
+                  f"(pakai format CSV/Parquet untuk satu tabel utuh).")
+        self.rows += 1
+        self.sheet_rows += 1
+        row = self.sheet_rows
+        for col, value in enumerate(record):
+            if isinstance(value, (datetime, date)):
+                result = self.worksheet.write_datetime(row, col, value, self.date_fmt)
+            elif isinstance(value, Cents):
+                result = self.worksheet.write_number(row, col, value / MINOR_UNITS)
+            else:
+                result = self.worksheet.write(row, col, "" if value is None else value)
+            if result == -1:
+                raise ValueError(f"Gagal menulis baris {self.rows} ke Excel (di luar batas sheet).")
+
+    def close(self):
+        self.workbook.close()
+
+
+class CanonicalMap:
+    """Pemetaan kolom parser (nama header) ke CANONICAL_COLUMNS."""
+
+    def __init__(self, columns):
+        self.columns = list(columns)
+        found = {}
+        for i, col in enumerate(self.columns):
+            header = str(col).upper()
+            if header.lower() in CANONICAL_COLUMNS and header.lower() not in found:
+                found[header.lower()] = i
+                continue
+            for name, keywords in CANONICAL_KEYWORDS:
+                if name not in found and any(k in header for k in keywords):
+                    found[name] = i
+                    break
+        self.sources = [found.get(name) for name in CANONICAL_COLUMNS]
+
+    def row(self, record):
+        """Satu record (list atau dict) -> list nilai kanonik (tanggal ISO, uang int sen, teks str)."""
+        if isinstance(record, dict):
+            record = [record.get(col) for col in self.columns]
+        return [_canonical_value(name, None if i is None else record[i])
+                for name, i in zip(CANONICAL_COLUMNS, self.sources)]
+
+    def frame(self, df):
+        """DataFrame parser -> DataFrame dengan CANONICAL_COLUMNS (versi kolom dari row())."""
+        import pandas as pd
+        cents = set(money_columns(df))
+        out = {}
+        for name, i in zip(CANONICAL_COLUMNS, self.sources):
+            col = pd.Series([None] * len(df), index=df.index, dtype=object) if i is None else df.iloc[:, i]
+            if name in AMOUNT_COLUMNS:
+                col = pd.to_numeric(col, errors="coerce")
+                if i is None or df.columns[i] not in cents:
+                    # Kolom angka rupiah yang tidak dinormalisasi parser
+                    col = (col * MINOR_UNITS).round()
+                col = col.astype("Int64")
+            elif pd.api.types.is_datetime64_any_dtype(col):
+                col = col.dt.strftime("%Y-%m-%d").astype(object).where(col.notna(), None)
+            else:
+                col = col.map(lambda v, n=name: _canonical_value(n, v)).astype(object)
+            out[name] = col
+        return pd.DataFrame(out, columns=CANONICAL_COLUMNS).reset_index(drop=True)
+
+def _canonical_value(name, value):
+    if value is None or value != value:  # None / NaN / NaT
+        return None
+    if name in AMOUNT_COLUMNS:
+        if isinstance(value, Cents):
+            return int(value)
+        try:
+            return round(float(value) * MINOR_UNITS)
+        except (TypeError, ValueError):
+            return None
+    if isinstance(value, (datetime, date)):
+        return value.strftime("%Y-%m-%d")
+    return str(value)
+
+
+class CsvStreamWriter:
+    """Writer CSV (UTF-8, kolom kanonik), baris langsung ditulis ke file."""
+
+    def __init__(self, output_path, columns):
+        import csv
+        self.mapping = CanonicalMap(columns)
+        self.file = open(output_path, "w", encoding="utf-8", newline="")
+        self.writer = csv.writer(self.file)
+        self.writer.writerow(CANONICAL_COLUMNS)
+        self.rows = 0
+
+    def write(self, record):
+        self.writer.writerow(self.mapping.row(record))
+        self.rows += 1
+
+    def close(self):
+        self.file.close()
+
+
+class _BatchedWriter:
+    """Basis writer Parquet/SQLite: baris dikumpulkan per BATCH_ROWS lalu ditulis sekaligus."""
+
+    def __init__(self, columns):
+        self.mapping = CanonicalMap(columns)
+        self.batch = []
+        self.rows = 0
+
+    def write(self, record):
+        self.batch.append(self.mapping.row(record))
+        self.rows += 1
+        if len(self.batch) >= BATCH_ROWS:
+            self.flush()
+
+    def flush(self):
+        if self.batch:
+            self._write_batch(self.batch)
+            self.batch = []
+
+
+def _arrow_schema():
+    import pyarrow as pa
+    return pa.schema([(name, pa.int64() if name in AMOUNT_COLUMNS else pa.string()) for name in CANONICAL_COLUMNS])
+
+
+class ParquetStreamWriter(_BatchedWriter):
+    """Writer Parquet (pyarrow, kolom kanonik), satu row group per batch."""
+
+    def __init__(self, output_path, columns):
+        import pyarrow.parquet as pq
+        super().__init__(columns)
+        self.schema = _arrow_schema()
+        self.writer = pq.ParquetWriter(output_path, self.schema)
+
+    def _write_batch(self, batch):
+        import pyarrow as pa
+        self.writer.write_table(pa.Table.from_pylist([dict(zip(CANONICAL_COLUMNS, row)) for row in batch],
+                                                     schema=self.schema))
+
+    def close(self):
+        self.flush()
+        self.writer.close()
+
+
+def _sqlite_create(conn):
+    cols = ", ".join(f'"{name}" {"INTEGER" if name in AMOUNT_COLUMNS else "TEXT"}' for name in CANONICAL_COLUMNS)
+    conn.execute(f'CREATE TABLE IF NOT EXISTS "{SQLITE_TABLE}" ({cols})')
+
+def _sqlite_insert(conn, rows):
+    marks = ", ".join("?" * len(CANONICAL_COLUMNS))
+    conn.executemany(f'INSERT INTO "{SQLITE_TABLE}" VALUES ({marks})', rows)
+
+
+class SqliteStreamWriter(_BatchedWriter):
+    """Writer SQLite (tabel `transactions`, kolom kanonik), satu executemany per batch, satu commit di akhir."""
+
+    def __init__(self, output_path, columns):
+        import sqlite3
+        super().__init__(columns)
+        self.conn = sqlite3.connect(output_path)
+        _sqlite_create(self.conn)
+
+    def _write_batch(self, batch):
+        _sqlite_insert(self.conn, batch)
+
+    def close(self):
+        self.flush()
+        self.conn.commit()
+        self.conn.close()
+
+
+STREAM_WRITERS = {"xlsx": XlsxStreamWriter, "csv": CsvStreamWriter,
+                  "parquet": ParquetStreamWriter, "sqlite": SqliteStreamWriter}
+
+
+def stream_to_file(records, output_path, columns):
+    """
+    Alirkan record satu per satu ke file output (format dari ekstensi path) dengan
+    memori konstan. `columns` boleh berupa callable yang dipanggil saat record
+    pertama datang (untuk header yang baru diketahui dari PDF). File tidak dibuat
+    jika tidak ada record. Return jumlah baris.
+    """
+    writer_cls = STREAM_WRITERS[output_format(output_path)]
+    writer = None
+    sink = getattr(_hooks, "row_sink", None)
+    try:
+        for record in records:
+            if writer is None:
+                columns = columns() if callable(columns) else columns
+                writer = writer_cls(output_path, columns)
+                mapping = CanonicalMap(columns)
+            writer.write(record)
+            if sink is not None:
+                sink.append(mapping.row(record))
+    finally:
+        if writer is not None:
+            writer.close()
+    return writer.rows if writer else 0
+
+
+def _frame_rows(df):
+    """Baris DataFrame sebagai tuple, NaN/NaT -> None."""
+    return df.astype(object).where(df.notna(), None).itertuples(index=False, name=None)
+
+def dataframe_to_file(df, output_path, canonical=True):
+    """
+    Tulis DataFrame parser ke file output (pengganti df.to_excel), format dari
+    ekstensi path. xlsx memakai kolom asli parser dengan format tanggal
+    dd/mm/yyyy dan kolom sen (set_money_columns) ditampilkan dalam rupiah;
+    CSV/Parquet/SQLite memakai CANONICAL_COLUMNS dengan uang dalam sen, kecuali
+    canonical=False (kolom DataFrame ditulis apa adanya, misal ekspor ledger).
+    """
+    import pandas as pd
+    fmt = output_format(output_path)
+    sink = getattr(_hooks, "row_sink", None)
+    frame = None
+    if sink is not None or (canonical and fmt != "xlsx"):
+        frame = CanonicalMap(df.columns).frame(df)
+    if sink is not None:
+        sink.extend(list(row) for row in _frame_rows(frame))
+    if fmt == "xlsx":
+        cents = money_columns(df)
+        if cents:
+            df = df.assign(**{col: df[col] / MINOR_UNITS for col in cents})
+        with pd.ExcelWriter(output_path, engine="xlsxwriter", date_format=DATE_FORMAT, datetime_format=DATE_FORMAT) as writer:
+            # Sama dengan XlsxStreamWriter: lebih dari XLSX_MAX_ROWS baris lanjut di sheet berikutnya
+            for n, start in enumerate(range(0, max(len(df), 1), XLSX_MAX_ROWS), 1):
+                df.iloc[start:start + XLSX_MAX_ROWS].to_excel(writer, sheet_name=f"Sheet{n}", index=False)
+        return
+    if canonical:
+        df = frame
+    if fmt == "csv":
+        df.to_csv(output_path, index=False, encoding="utf-8")
+    elif fmt == "parquet":
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+        pq.write_table(pa.Table.from_pandas(df, schema=_arrow_schema() if canonical else None, preserve_index=False),
+                       output_path)
+    elif fmt == "sqlite":
+        import sqlite3
+        conn = sqlite3.connect(output_path)
+        try:
+            if canonical:
+                _sqlite_create(conn)
+                _sqlite_insert(conn, _frame_rows(df))
+            else:
+                df.to_sql(SQLITE_TABLE, conn, index=False, if_exists="replace")
+            conn.commit()
+        finally:
+            conn.close()
@@ -0,0 +1,49 @@
+import os
+import re
+from fnmatch import fnmatch
+
+# Nomor rekening di nama file (deret angka panjang), dipakai sebagai kunci password
+ACCOUNT_PATTERN = re.compile(r"\d{6,}")
+
+
+def account_key(pdf_path):
+    """Nomor rekening dari nama file (deret angka terpanjang), atau None."""
+    found = ACCOUNT_PATTERN.findall(os.path.basename(pdf_path))
+    return max(found, key=len) if found else None
+
+
+class PasswordCache:
+    """
+    Password PDF yang diketahui selama satu batch. Hanya disimpan di memori dan
+    dibuang setelah batch selesai, tidak pernah ditulis ke disk.
+
+    Kandidat untuk satu file, urut: password kosong, password dari pola nama
+    file (glob) yang cocok, password yang berhasil untuk nomor rekening yang sama,
+    lalu semua password lain yang pernah berhasil di batch ini.
+    """
+
+    def __init__(self, patterns=None):
+        self.patterns = dict(patterns or {})  # glob nama file -> password
+        self.by_account = {}
+        self.known = []
+
+    def candidates(self, pdf_path):
+        name = os.path.basename(pdf_path)
+        found = [""]
+        found += [pw for pattern, pw in self.patterns.items() if fnmatch(name.lower(), pattern.lower())]
+        account = account_key(pdf_path)
+        if account in self.by_account:
+            found.append(self.by_account[account])
+        found += reversed(self.known)
+        # Urutan dipertahankan, duplikat dibuang
+        return list(dict.fromkeys(found))
+
+    def remember(self, pdf_path, password):
+        if not password:
+            return
+        account = account_key(pdf_path)
+        if account:
+            self.by_account[account] = password
+        if password in self.known:
+            self.known.remove(password)
+        self.known.append(password)
@@ -0,0 +1,102 @@
+"""
+Startup cepat: jendela ditampilkan dulu, modul berat (pdfplumber, pandas, pypdf,
+...) dan modul parser dimuat di thread background sesudahnya, jadi klik bank
+pertama tidak lagi menunggu import.
+
+Laporan waktu import cold start (proses Python baru):
+
+    python startup.py
+"""
+import os
+import sys
+import json
+import time
+import importlib
+import threading
+
+# Modul berat yang di-import lazy oleh parser & DocumentContext. Urutan penting:
+# waktu tiap modul tidak termasuk dependensi yang sudah dimuat modul sebelumnya.
+HEAVY_MODULES = ("pypdf", "pdfminer.high_level", "pdfplumber", "numpy", "pandas", "xlsxwriter")
+
+# Riwayat startup aplikasi (satu baris JSON per peluncuran), di folder metrik
+STARTUP_LOG = "startup.jsonl"
+
+
+class StartupReport:
+    """Waktu tiap fase startup (detik sejak proses mulai) dan waktu import per modul."""
+
+    def __init__(self, start=None):
+        self.start = time.perf_counter() if start is None else start
+        self.phases = {}
+        self.imports = {}
+
+    def mark(self, phase):
+        self.phases[phase] = time.perf_counter() - self.start
+
+    def timed_import(self, name):
+        """Import satu modul dan catat waktunya. Modul yang gagal di-import (misal tidak terpasang) dicatat None."""
+        if name in sys.modules:
+            return
+        t = time.perf_counter()
+        try:
+            importlib.import_module(name)
+        except Exception:
+            self.imports[name] = None
+            return
+        self.imports[name] = time.perf_counter() - t
+
+    def to_event(self):
+        return {
+            "type": "startup", "ts": round(time.time(), 3), "frozen": bool(getattr(sys, "frozen", False)),
+            "phases": {k: round(v, 4) for k, v in self.phases.items()},
+            "imports": {k: (round(v, 4) if v is not None else None) for k, v in self.imports.items()},
+        }
+
+    def save(self, metrics_dir):
+        """Tambahkan laporan ke <metrics_dir>/startup.jsonl."""
+        try:
+            os.makedirs(metrics_dir, exist_ok=True)
+            with open(os.path.join(metrics_dir, STARTUP_LOG), "a", encoding="utf-8") as f:
+                f.write(json.dumps(self.to_event()) + "\n")
+        except OSError: pass
+
+
+def warm_modules(report, parser_modules=()):
+    """Muat modul berat lalu modul parser, dicatat ke report. Fase 'prewarm' ditandai di akhir."""
+    for name in (*HEAVY_MODULES, *parser_modules):
+        report.timed_import(name)
+    report.mark("prewarm")
+
+def prewarm(report, parser_modules=(), on_done=None):
+    """Jalankan warm_modules di thread daemon. on_done(report) dipanggil dari thread itu."""
+    def run():
+        warm_modules(report, parser_modules)
+        if on_done:
+            on_done(report)
+
+    t = threading.Thread(target=run, name="prewarm", daemon=True)
+    t.start()
+    return t
+
+
+def main():
+    base_dir = os.path.dirname(os.path.abspath(__file__))
+    if base_dir not in sys.path:
+        sys.path.insert(0, base_dir)
+    from config import AUTO_BANKS
+
+    report = StartupReport()
+    report.timed_import("customtkinter")
+    for name in ("gui", "logic"):
+        report.timed_import(name)
+    report.mark("ui_imports")
+    warm_modules(report, [mod for mod, _, _ in AUTO_BANKS])
+
+    width = max(len(k) for k in report.imports)
+    for name, seconds in report.imports.items():
+        print(f"{name.ljust(width)}  {'gagal di-import' if seconds is None else f'{seconds * 1000:8.1f} ms'}")
+    print(f"{'TOTAL'.ljust(width)}  {report.phases['prewarm'] * 1000:8.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
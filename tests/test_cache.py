@@ -0,0 +1,48 @@
+import os
+import time
+
+import cache
+from cache import ResultCache
+
+
+def write(path, size=10, age=0):
+    with open(path, "wb") as f:
+        f.write(b"x" * size)
+    if age:
+        mtime = time.time() - age
+        os.utime(path, (mtime, mtime))
+
+
+def test_store_and_fetch(tmp_path):
+    rc = ResultCache(str(tmp_path / "cache"))
+    write(tmp_path / "out.xlsx")
+    rc.store("hash", "parser.BNI", 3, str(tmp_path / "out.xlsx"), rows=7)
+    assert rc.fetch("hash", "parser.BNI", 3, str(tmp_path / "copy.xlsx")) == 7
+    assert (tmp_path / "copy.xlsx").read_bytes() == b"x" * 10
+    # Versi parser lain = entry lain
+    assert rc.fetch("hash", "parser.BNI", 4, str(tmp_path / "copy2.xlsx")) is None
+
+
+def test_evict_least_recently_used(tmp_path):
+    rc = ResultCache(str(tmp_path / "cache"), max_bytes=25)
+    for i, name in enumerate(("a", "b", "c")):
+        write(tmp_path / f"{name}.xlsx")
+        rc.store(name, "m", 1, str(tmp_path / f"{name}.xlsx"), rows=1)
+        # mtime berbeda agar urutan LRU pasti
+        for entry in os.listdir(rc.cache_dir):
+            if entry.startswith(rc._key(name, "m", 1, ".xlsx")):
+                t = time.time() - 100 + i
+                os.utime(os.path.join(rc.cache_dir, entry), (t, t))
+    rc.evict()
+    assert rc.fetch("a", "m", 1, str(tmp_path / "x.xlsx")) is None
+    assert rc.fetch("c", "m", 1, str(tmp_path / "x.xlsx")) == 1
+
+
+def test_evict_sweeps_stale_tmp_files(tmp_path):
+    rc = ResultCache(str(tmp_path))
+    write(tmp_path / "crash.tmp", age=cache.STALE_TMP_SECONDS + 60)
+    write(tmp_path / "writing.tmp", age=5)
+    rc.evict()
+    assert not (tmp_path / "crash.tmp").exists()
+    # .tmp yang masih baru mungkin sedang ditulis proses lain
+    assert (tmp_path / "writing.tmp").exists()
@@ -0,0 +1,101 @@
+import threading
+
+import pytest
+
+from parser.common import (Cancelled, page_ranges, stitch_chunks, iter_pages,
+                           set_cancel, set_progress, set_recorder)
+
+
+def test_page_ranges_cover_every_page_once():
+    assert page_ranges(0, 50) == []
+    assert page_ranges(50, 50) == [(0, 50)]
+    assert page_ranges(120, 50) == [(0, 50), (50, 100), (100, 120)]
+    ranges = page_ranges(1001, 64)
+    assert [p for start, stop in ranges for p in range(start, stop)] == list(range(1001))
+
+
+def attach(record, head):
+    record[1] += " " + " ".join(head)
+
+
+def test_stitch_chunks_joins_heads_to_previous_record():
+    chunks = [
+        ([], [["1", "a"], ["2", "b"]]),
+        (["b-lanjutan"], [["3", "c"]]),
+        (["c-lanjutan"], []),             # rentang tanpa record baru
+        (["c-lagi"], [["4", "d"]]),
+    ]
+    assert list(stitch_chunks(chunks, attach)) == [
+        ["1", "a"], ["2", "b b-lanjutan"], ["3", "c c-lanjutan c-lagi"], ["4", "d"]]
+
+
+def test_stitch_chunks_drops_head_before_first_record():
+    chunks = [(["yatim"], []), (["yatim2"], [["1", "a"]])]
+    assert list(stitch_chunks(chunks, attach)) == [["1", "a"]]
+
+
+def test_stitch_chunks_without_attach():
+    chunks = [([], [["1", "a"]]), (["x"], [["2", "b"]])]
+    assert list(stitch_chunks(chunks)) == [["1", "a"], ["2", "b"]]
+
+
+class FakePage:
+    def __init__(self, number):
+        self.page_number = number
+        self.closed = False
+
+    def close(self):
+        self.closed = True
+
+
+class Recorder:
+    def __init__(self):
+        self.pages = []
+
+    def add_page(self, number, seconds):
+        self.pages.append(number)
+
+    def add_stage(self, name, seconds):
+        pass
+
+
+@pytest.fixture
+def hooks():
+    yield
+    set_recorder(None)
+    set_progress(None)
+    set_cancel(None)
+
+
+def test_iter_pages_records_reports_and_closes(hooks):
+    pages = [FakePage(i) for i in (1, 2, 3)]
+    recorder, progress = Recorder(), []
+    set_recorder(recorder)
+    set_progress(lambda done, total: progress.append((done, total)))
+    assert list(iter_pages(pages)) == pages
+    assert recorder.pages == [1, 2, 3]
+    assert progress == [(1, 3), (2, 3), (3, 3)]
+    assert all(p.closed for p in pages)
+
+
+def test_iter_pages_stops_on_cancel(hooks):
+    token = threading.Event()
+    set_cancel(token)
+    seen = []
+    with pytest.raises(Cancelled):
+        for page in iter_pages([FakePage(i) for i in (1, 2, 3)]):
+            seen.append(page.page_number)
+            token.set()
+    assert seen == [1]
+
+
+def test_hooks_are_per_thread(hooks):
+    token = threading.Event()
+    token.set()
+    set_cancel(token)
+    # Thread lain (batch lain) tidak melihat cancel token thread ini
+    result = []
+    thread = threading.Thread(target=lambda: result.append(len(list(iter_pages([FakePage(1)])))))
+    thread.start()
+    thread.join()
+    assert result == [1]
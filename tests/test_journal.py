@@ -0,0 +1,70 @@
+import os
+
+from journal import (BatchJournal, latest_unfinished, prune_journals,
+                     PENDING, DONE, FAILED, SKIPPED)
+
+FILES = ["/in/a.pdf", "/in/b.pdf", "/in/c.pdf", "/in/d.pdf"]
+
+
+def create(tmp_path, files=FILES):
+    return BatchJournal.create("AUTO", "", files, "/out", {"max_workers": 2, "password_patterns": {"*": "rahasia"}},
+                               journal_dir=str(tmp_path))
+
+
+def test_statuses_survive_reload(tmp_path):
+    journal = create(tmp_path)
+    journal.mark("/in/a.pdf", PENDING, "h-a", "/out/a.xlsx")
+    journal.mark("/in/a.pdf", DONE)
+    journal.mark("/in/b.pdf", FAILED, "h-b")
+    journal.mark("/in/c.pdf", SKIPPED)
+
+    loaded = BatchJournal.load(journal.path)
+    assert loaded.batch["files"] == FILES
+    assert loaded.status("/in/a.pdf") == DONE
+    # Status terakhir menang, hash/path output lama dipertahankan
+    assert loaded.files["/in/a.pdf"]["file_hash"] == "h-a"
+    assert loaded.output_paths() == {"/in/a.pdf": "/out/a.xlsx"}
+    # Pending (termasuk yang belum pernah dicatat) dan gagal, dalam urutan batch
+    assert loaded.unfinished() == ["/in/b.pdf", "/in/d.pdf"]
+
+
+def test_passwords_never_written(tmp_path):
+    journal = create(tmp_path)
+    assert "password_patterns" not in BatchJournal.load(journal.path).batch["settings"]
+    with open(journal.path, encoding="utf-8") as f:
+        assert "rahasia" not in f.read()
+
+
+def test_truncated_last_line_is_ignored(tmp_path):
+    journal = create(tmp_path)
+    journal.mark("/in/a.pdf", DONE)
+    with open(journal.path, "a", encoding="utf-8") as f:
+        f.write('{"type": "file", "pdf_path": "/in/b.pdf", "sta')
+    loaded = BatchJournal.load(journal.path)
+    assert loaded.status("/in/a.pdf") == DONE
+    assert loaded.status("/in/b.pdf") == PENDING
+
+
+def test_latest_unfinished_only_considers_newest_batch(tmp_path):
+    old = create(tmp_path)
+    new = create(tmp_path, ["/in/x.pdf"])
+    assert old.path != new.path
+    assert latest_unfinished(str(tmp_path)).path == new.path
+    new.mark("/in/x.pdf", DONE)
+    # Batch terbaru selesai: batch lama tidak muncul kembali
+    assert latest_unfinished(str(tmp_path)) is None
+
+
+def test_discard_and_prune(tmp_path):
+    old = create(tmp_path)
+    new = create(tmp_path)
+    prune_journals(keep=new.path, journal_dir=str(tmp_path))
+    assert os.listdir(tmp_path) == [os.path.basename(new.path)]
+    assert latest_unfinished(str(tmp_path)).path == new.path
+    new.discard()
+    assert latest_unfinished(str(tmp_path)) is None
+    assert not os.path.exists(old.path)
+
+
+def test_missing_journal_dir(tmp_path):
+    assert latest_unfinished(str(tmp_path / "tidak-ada")) is None
@@ -0,0 +1,76 @@
+import sqlite3
+from datetime import date
+
+import pytest
+
+import ledger
+from ledger import Ledger, LedgerImport, resolve_date, statement_period
+
+
+def test_statement_period_from_dates():
+    assert statement_period("PERIODE : 01/12/2024 - 31/01/2025") == (date(2024, 12, 1), date(2025, 1, 31))
+
+
+def test_statement_period_from_year_only():
+    assert statement_period("PERIODE OKTOBER 2025") == (date(2025, 1, 1), date(2025, 12, 31))
+    assert statement_period("LAPORAN REKENING") is None
+
+
+@pytest.mark.parametrize("value, expected", [
+    ("2025-01-02", "2025-01-02"),
+    ("05/12", "2024-12-05"),
+    ("05/01", "2025-01-05"),
+    ("31/02", None),
+    ("SALDO", None),
+])
+def test_resolve_date_across_year_end(value, expected):
+    assert resolve_date(value, (date(2024, 12, 1), date(2025, 1, 31))) == expected
+
+
+def test_resolve_date_without_period():
+    assert resolve_date("05/01") is None
+
+
+def rows(month, n):
+    return [(f"2025-{month:02d}-{day:02d}", None, "x", "", day * 100, 0, day * 1000) for day in range(1, n + 1)]
+
+
+def count(path):
+    conn = sqlite3.connect(path)
+    try:
+        return conn.execute("SELECT COUNT(*) FROM transactions").fetchone()[0]
+    finally:
+        conn.close()
+
+
+def test_append_is_idempotent(tmp_path):
+    book = Ledger(str(tmp_path / "ledger.sqlite"))
+    assert book.append("111", rows(1, 5), file_hash="h1") == 5
+    assert book.append("111", rows(1, 7), file_hash="h2") == 2
+    assert book.has_import("h1") and book.has_import("h2")
+    assert [r[1] for r in book.query("111", start="2025-01-06")] == ["2025-01-06", "2025-01-07"]
+
+
+def test_import_writes_in_chunks_and_rolls_back(tmp_path, monkeypatch):
+    monkeypatch.setattr(ledger, "CHUNK_ROWS", 2)
+    path = str(tmp_path / "ledger.sqlite")
+    book = Ledger(path)
+    book.append("111", rows(1, 3), file_hash="h0")
+    job = LedgerImport(book, "111", file_hash="h1")
+    job.extend(rows(2, 5))
+    # Chunk penuh sudah ditulis sebelum commit, sisanya masih di memori
+    assert count(path) == 7
+    assert len(job.batch) == 1
+    job.rollback()
+    assert count(path) == 3
+    assert not book.has_import("h1")
+
+
+def test_rows_without_year_are_rejected(tmp_path):
+    book = Ledger(str(tmp_path / "ledger.sqlite"))
+    job = LedgerImport(book, "111", file_hash="h1", period=lambda: None)
+    job.extend([("01/10", None, "x", "", 100, 0, 100), ("", None, "saldo awal", "", 0, 0, 100)])
+    assert job.commit() == 1
+    assert job.rejected == 1
+    # Impor dengan baris ditolak tidak dicatat, jadi file dicoba lagi di batch berikutnya
+    assert not book.has_import("h1")
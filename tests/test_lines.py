@@ -0,0 +1,70 @@
+import re
+
+import pytest
+
+from parser.BRI import BRI_LINES, FOOTER_RULES, TRANSACTION_PATTERN
+from parser.lines import LineRule, LineClassifier
+
+# Aturan BRI sebelum LineClassifier: daftar regex footer (search), lalu pola transaksi,
+# lalu pola lanjutan deskripsi. Classifier harus memberi hasil yang sama.
+_FOOTERS = [re.compile(p, re.IGNORECASE if ic else 0) for p, ic, _ in FOOTER_RULES]
+_CONTINUATION = re.compile(r"^(?!\d{2}/\d{2}/\d{2}\s+\d{2}:\d{2}:\d{2}).+")
+
+
+def baseline(line):
+    if any(p.search(line) for p in _FOOTERS):
+        return "footer", ()
+    m = TRANSACTION_PATTERN.match(line)
+    if m:
+        return "transaction", m.groups()
+    if _CONTINUATION.match(line):
+        return "continuation", ()
+    return "other", ()
+
+
+LINES = [
+    "01/02/25 08:15:02 TRANSFER KE REKENING 1234567 0.00 150,000.00 2,350,000.00",
+    "01/02/25 08:15:02 SETORAN TUNAI 1,000,000.00 0.00 3,350,000.00",
+    "01/02/25 08:15:02 BIAYA ADM 12345678 0.00 5,000.00 3,345,000.00",
+    "01/02/25 08:15:02 baris tanpa angka",
+    "lanjutan uraian transaksi",
+    "DARI PT MAJU JAYA",
+    "Halaman 2 dari 5",
+    "HALAMAN 12",
+    "Saldo Awal 1,000.00",
+    "SALDO AKHIR",
+    "Jumlah Mutasi",
+    "REKENING KORAN",
+    "Created By IBBIZ",
+    "created by ibbiz",
+    "Dicetak 01/02/2025 10:11:12",
+    "Opening Balance",
+    "Total Transaksi Debet 5",
+    "TOTAL CREDIT TRANSACTION",
+    "Terbilang: satu juta",
+    "Biaya Materai",
+    "REVENUE STAMP PAID",
+    "",
+]
+
+
+@pytest.mark.parametrize("line", LINES)
+def test_bri_classifier_matches_baseline(line):
+    assert BRI_LINES.classify(line) == baseline(line)
+
+
+def test_rule_order_is_priority():
+    rules = LineClassifier([
+        LineRule("footer", r"total", anywhere=True, ignore_case=True, literals=("total",)),
+        LineRule("amount", r"(\w+) (\d+)$"),
+    ])
+    assert rules.classify("Total 5") == ("footer", ())
+    assert rules.classify("Debit 5") == ("amount", ("Debit", "5"))
+    assert rules.classify("???") == ("other", ())
+
+
+def test_literal_prefilter_respects_case():
+    rules = LineClassifier([LineRule("tag", r"ABC", anywhere=True, literals=("ABC",))], default=None)
+    assert rules.classify("x ABC") == ("tag", ())
+    # Literal case-sensitive: 'abc' tidak mengaktifkan aturan
+    assert rules.classify("x abc") == (None, ())
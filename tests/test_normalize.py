@@ -0,0 +1,78 @@
+from datetime import datetime
+
+import pandas as pd
+import pytest
+
+from parser.normalize import (Cents, money_value, money_column, date_value, date_column,
+                              normalize_frame, normalize_row, money_columns)
+
+
+@pytest.mark.parametrize("text, minor, flag", [
+    ("1,234.56", 123456, ""),
+    ("1.234,56", 123456, ""),
+    ("1.234", 123400, ""),
+    ("12,5", 1250, ""),
+    ("1,000.00 D", 100000, "D"),
+    ("1,000.00 CR", 100000, "C"),
+    ("Rp 2,500.00", 250000, ""),
+    ("-1,000.00", -100000, ""),
+    ("1,000.00-", -100000, ""),
+    ("(1,000.00)", -100000, ""),
+    ("DB", 0, "D"),
+    ("", 0, ""),
+    (None, 0, ""),
+])
+def test_money_value(text, minor, flag):
+    value, found = money_value(text)
+    assert isinstance(value, Cents)
+    assert (value, found) == (minor, flag)
+
+
+def test_money_column_matches_money_value():
+    texts = ["1,234.56", "1.234,56", "1,000.00-", "(1,000.00)", "-5.00", "12,5", "", None, "0.00 CR"]
+    minor, flags = money_column(texts)
+    assert minor.dtype == "int64"
+    assert list(minor) == [money_value(t)[0] for t in texts]
+    assert list(flags) == [money_value(t)[1] for t in texts]
+
+
+@pytest.mark.parametrize("text, expected", [
+    ("31/01/2025", datetime(2025, 1, 31)),
+    ("31/01/25", datetime(2025, 1, 31)),
+    ("31-01-2025", datetime(2025, 1, 31)),
+    ("05 Jan 2025", datetime(2025, 1, 5)),
+    ("2025-01-31", datetime(2025, 1, 31)),
+    ("31/01/2025 14:02:11", datetime(2025, 1, 31)),
+])
+def test_date_value(text, expected):
+    assert date_value(text) == expected
+
+
+@pytest.mark.parametrize("text", ["01/10", "SALDO AWAL", "", "32/01/2025"])
+def test_date_value_keeps_incomplete_dates(text):
+    assert date_value(text) == text
+
+
+def test_date_column():
+    out = date_column(["31/01/2025", "01/02/25", ""])
+    assert pd.api.types.is_datetime64_any_dtype(out)
+    assert list(out[:2]) == [pd.Timestamp(2025, 1, 31), pd.Timestamp(2025, 2, 1)]
+    assert pd.isna(out[2])
+    # Tanggal tanpa tahun dibiarkan sebagai teks
+    mixed = date_column(["31/01/2025", "01/10"])
+    assert list(mixed) == [pd.Timestamp(2025, 1, 31), "01/10"]
+
+
+def test_normalize_frame_marks_money_columns():
+    df = pd.DataFrame({"Tanggal": ["31/01/2025"], "Debit": ["1,000.00-"], "Saldo": ["2,000.50"]})
+    normalize_frame(df, money=["Debit", "Saldo"], dates=["Tanggal"])
+    assert money_columns(df) == ["Debit", "Saldo"]
+    assert list(df["Debit"]) == [-100000]
+    assert list(df["Saldo"]) == [200050]
+    assert df["Tanggal"][0] == pd.Timestamp(2025, 1, 31)
+
+
+def test_normalize_row_matches_frame():
+    row = normalize_row(["31/01/2025", "x", "(1,000.00)"], money=[2], dates=[0])
+    assert row == [datetime(2025, 1, 31), "x", -100000]
+    assert isinstance(row[2], Cents)
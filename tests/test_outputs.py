@@ -0,0 +1,66 @@
+import os
+import time
+
+from outputs import OutputPlanner
+
+
+def touch(path, mtime=None):
+    with open(path, "w") as f:
+        f.write("x")
+    if mtime is not None:
+        os.utime(path, (mtime, mtime))
+
+
+def test_overwrite_keeps_default_name(tmp_path):
+    touch(tmp_path / "a.xlsx")
+    planner = OutputPlanner(str(tmp_path), "overwrite")
+    assert planner.plan("/in/a.pdf") == str(tmp_path / "a.xlsx")
+
+
+def test_skip_existing(tmp_path):
+    touch(tmp_path / "a.xlsx")
+    planner = OutputPlanner(str(tmp_path), "skip")
+    assert planner.plan("/in/a.pdf") is None
+    assert planner.plan("/in/b.pdf") == str(tmp_path / "b.xlsx")
+
+
+def test_version_picks_next_free_name(tmp_path):
+    touch(tmp_path / "a.xlsx")
+    touch(tmp_path / "a (2).xlsx")
+    planner = OutputPlanner(str(tmp_path), "version")
+    assert planner.plan("/in/a.pdf") == str(tmp_path / "a (3).xlsx")
+
+
+def test_newer_compares_mtime(tmp_path):
+    now = time.time()
+    pdf_old, pdf_new = tmp_path / "old.pdf", tmp_path / "new.pdf"
+    touch(pdf_old, now - 100)
+    touch(pdf_new, now)
+    touch(tmp_path / "old.xlsx", now - 50)
+    touch(tmp_path / "new.xlsx", now - 50)
+    planner = OutputPlanner(str(tmp_path), "newer")
+    assert planner.plan(str(pdf_old)) is None
+    assert planner.plan(str(pdf_new)) == str(tmp_path / "new.xlsx")
+
+
+def test_same_name_in_one_batch_never_collides(tmp_path):
+    planner = OutputPlanner(str(tmp_path), "overwrite")
+    first = planner.plan("/in/x/a.pdf")
+    second = planner.plan("/in/y/a.pdf")
+    assert first == str(tmp_path / "a.xlsx")
+    assert second == str(tmp_path / "a (2).xlsx")
+
+
+def test_pinned_paths_win_and_are_reserved(tmp_path):
+    touch(tmp_path / "a.xlsx")
+    pinned = {"/in/a.pdf": str(tmp_path / "a (2).xlsx")}
+    planner = OutputPlanner(str(tmp_path), "skip", pinned=pinned)
+    assert planner.plan("/in/a.pdf") == str(tmp_path / "a (2).xlsx")
+    # Path pinned dianggap terpakai oleh PDF lain bernama sama
+    planner.policy = "version"
+    assert planner.plan("/other/a.pdf") == str(tmp_path / "a (3).xlsx")
+
+
+def test_extension_follows_output_format(tmp_path):
+    planner = OutputPlanner(str(tmp_path), ext=".parquet")
+    assert planner.plan("/in/a.pdf") == str(tmp_path / "a.parquet")
@@ -0,0 +1,33 @@
+from passwords import PasswordCache, account_key
+
+
+def test_account_key_takes_longest_digit_run():
+    assert account_key("/in/BNI_123456_0987654321.pdf") == "0987654321"
+    assert account_key("/in/statement_2025.pdf") is None
+
+
+def test_candidates_order():
+    cache = PasswordCache({"bni_*.pdf": "pola"})
+    cache.remember("/in/BNI_1111111111_jan.pdf", "rekening")
+    cache.remember("/in/OCBC_2222222222.pdf", "lain")
+    assert cache.candidates("/in/BNI_1111111111_feb.pdf") == ["", "pola", "rekening", "lain"]
+
+
+def test_pattern_match_is_case_insensitive():
+    cache = PasswordCache({"*MANDIRI*": "rahasia"})
+    assert cache.candidates("/in/mandiri_jan.pdf") == ["", "rahasia"]
+
+
+def test_recent_passwords_first_without_duplicates():
+    cache = PasswordCache()
+    cache.remember("/in/a.pdf", "satu")
+    cache.remember("/in/b.pdf", "dua")
+    cache.remember("/in/c.pdf", "satu")
+    assert cache.candidates("/in/d.pdf") == ["", "satu", "dua"]
+
+
+def test_empty_password_not_remembered():
+    cache = PasswordCache()
+    cache.remember("/in/1234567890.pdf", "")
+    assert cache.candidates("/in/1234567890.pdf") == [""]
+    assert cache.by_account == {}
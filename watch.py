@@ -0,0 +1,336 @@
+"""
+Mode watch-folder tanpa GUI: PDF baru di folder inbox diekstrak otomatis
+(deteksi AUTO) ke pohon folder output yang sama strukturnya.
+
+    python watch.py <inbox> [<inbox> ...] --output <folder> [--workers N] [--interval 5] [--stable 5] [--once]
+
+Tanpa argumen, folder diambil dari setting `watch_folders` / `watch_output_folder`.
+File diproses setelah ukurannya tidak berubah selama --stable detik (selesai
+disalin). Hash isi tiap file dicatat di WATCH_STATE_FILE di folder output, jadi
+file yang sama (juga salinan dengan nama lain) tidak pernah diproses ulang,
+termasuk setelah daemon di-restart.
+"""
+import os
+import sys
+import time
+import signal
+import sqlite3
+import argparse
+import threading
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor, wait, FIRST_COMPLETED
+
+from config import MAX_WORKERS, CACHE_MAX_MB, OVERWRITE_POLICY, WATCH_INTERVAL, WATCH_STABLE_SECONDS
+from cache import ResultCache, file_sha256
+from document import DocumentContext
+from outputs import OutputPlanner
+from ledger import Ledger, LEDGER_FILE
+from passwords import PasswordCache
+from logic import CoreLogic, init_worker, run_job
+from parser.common import set_cancel
+from parser.writers import OUTPUT_FORMATS, check_format
+
+# Riwayat file yang sudah ditangani, di root folder output
+WATCH_STATE_FILE = ".finextract_watch.sqlite"
+
+# Job yang diantrekan ke pool per worker: worker langsung dapat file berikutnya
+# tanpa menunggu scan, tapi antrean tetap kecil jika daemon dihentikan
+QUEUE_PER_WORKER = 2
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS files (
+    source TEXT PRIMARY KEY,
+    size INTEGER,
+    mtime_ns INTEGER,
+    file_hash TEXT,
+    output TEXT,
+    status TEXT,
+    processed_at TEXT
+);
+CREATE INDEX IF NOT EXISTS files_hash ON files (file_hash);
+"""
+
+
+class WatchState:
+    """
+    Status file inbox yang sudah ditangani (done, failed, skipped, duplicate).
+    Dipakai hanya dari proses utama daemon.
+    """
+
+    def __init__(self, path):
+        self.conn = sqlite3.connect(path)
+        self.conn.executescript(_SCHEMA)
+
+    def known(self):
+        """
+        source -> (size, mtime_ns): file yang tidak perlu di-hash lagi selama tidak berubah.
+        File yang gagal dicoba lagi sekali tiap daemon dijalankan (misal setelah password_patterns ditambah).
+        """
+        rows = self.conn.execute("SELECT source, size, mtime_ns FROM files WHERE status != 'failed'")
+        return {src: (size, mtime) for src, size, mtime in rows}
+
+    def has_hash(self, file_hash):
+        """True jika isi file ini sudah pernah selesai ditangani (selain gagal)."""
+        return self.conn.execute("SELECT 1 FROM files WHERE file_hash = ? AND status != 'failed'",
+                                 (file_hash,)).fetchone() is not None
+
+    def record(self, source, stat, file_hash, status, output=None):
+        with self.conn:
+            self.conn.execute("INSERT OR REPLACE INTO files VALUES (?, ?, ?, ?, ?, ?, ?)",
+                              (source, stat[0], stat[1], file_hash, output, status, time.strftime("%Y-%m-%d %H:%M:%S")))
+
+    def close(self):
+        self.conn.close()
+
+
+class _HeadlessRequests:
+    """Pengganti request_queue GUI: tidak ada popup, PDF yang butuh password dari user dilewati."""
+
+    def __init__(self, log):
+        self.log = log
+
+    def put(self, request):
+        task_name, kwargs, result_q = request
+        if task_name == "ask_password":
+            self.log("Tanpa GUI tidak bisa minta password; tambahkan ke password_patterns.", "ERROR")
+        result_q.put(None)
+
+
+class _LastStatus(dict):
+    """Pengganti journal batch untuk CoreLogic: cukup status terakhir per file (misal "skipped")."""
+
+    def mark(self, pdf_path, status, file_hash=None, excel_path=None):
+        self[pdf_path] = status
+
+
+class FolderWatcher:
+    """
+    Daemon watch-folder di atas CoreLogic. Tahap persiapan (hash, cek enkripsi,
+    path output) berjalan di proses utama; ekstraksi di ProcessPoolExecutor yang
+    hidup selama daemon berjalan, jadi backlog besar memakai semua worker terus-menerus.
+    """
+
+    def __init__(self, folders, output_root, settings=None, workers=None,
+                 interval=WATCH_INTERVAL, stable_seconds=WATCH_STABLE_SECONDS):
+        self.settings = settings or {}
+        self.folders = [os.path.abspath(f) for f in folders]
+        self.output_root = os.path.abspath(output_root)
+        self.workers = workers or self.settings.get("max_workers") or MAX_WORKERS or os.cpu_count() or 1
+        self.interval = interval
+        self.stable_seconds = stable_seconds
+
+        self.ctx = multiprocessing.get_context("spawn")
+        self.status_queue = self.ctx.Queue()
+        self.logic = CoreLogic(self.status_queue, _HeadlessRequests(self._log))
+        self.logic.cancel_event = self.ctx.Event()
+        self.logic.journal = _LastStatus()
+        self.logic.passwords = PasswordCache(self.settings.get("password_patterns"))
+        self.logic.output_format = self.settings.get("output_format", self.logic.output_format)
+        if self.settings.get("ledger_enabled"):
+            self.logic.ledger = Ledger(os.path.join(self.output_root, LEDGER_FILE))
+        self.cache_max_bytes = None
+        if self.settings.get("cache_enabled"):
+            self.cache_max_bytes = int(self.settings.get("cache_max_mb", CACHE_MAX_MB)) * 1024 * 1024
+            self.logic.cache = ResultCache(max_bytes=self.cache_max_bytes)
+        self.stream_min_pages = self.settings.get("stream_min_pages", self.logic.stream_min_pages)
+        # Tidak ada yang bisa ditanya: "ask" menjadi "version" (output lama tidak pernah ditimpa diam-diam)
+        self.policy = self.settings.get("overwrite_policy", OVERWRITE_POLICY)
+        if self.policy == "ask":
+            self.policy = "version"
+
+        self.state = None
+        self.known = {}      # source -> (size, mtime_ns) yang sudah ditangani
+        self.pending = {}    # source -> ((size, mtime_ns), waktu pertama terlihat dengan stat itu)
+        self.ready = []      # (folder inbox, source, stat) siap diproses, urut ditemukan
+        self.inflight = {}   # future -> (source, stat, job)
+        self.planners = {}   # folder output -> OutputPlanner
+
+    def _log(self, message, level="DEFAULT"):
+        self.status_queue.put(("LOG", message, level))
+
+    def _print_events(self):
+        while True:
+            item = self.status_queue.get()
+            if item is None:
+                break
+            kind, message, level = item
+            if kind == "LOG":
+                print(f"{time.strftime('%H:%M:%S')} [{level}] {str(message).strip()}", flush=True)
+
+    # --- Scan ---
+    def _output_dir(self, folder, source):
+        rel = os.path.relpath(os.path.dirname(source), folder)
+        # Beberapa inbox: tiap inbox punya subfolder sendiri di output
+        root = os.path.join(self.output_root, os.path.basename(folder)) if len(self.folders) > 1 else self.output_root
+        return os.path.normpath(os.path.join(root, rel))
+
+    def _walk(self, folder):
+        stack = [folder]
+        while stack:
+            path = stack.pop()
+            try:
+                entries = list(os.scandir(path))
+            except OSError:
+                continue
+            for entry in entries:
+                if entry.name.startswith("."):
+                    continue
+                if entry.is_dir(follow_symlinks=False):
+                    # Folder output di dalam inbox tidak ikut dipantau
+                    if os.path.abspath(entry.path) != self.output_root:
+                        stack.append(entry.path)
+                elif entry.name.lower().endswith(".pdf"):
+                    try:
+                        st = entry.stat()
+                    except OSError:
+                        continue
+                    yield entry.path, (st.st_size, st.st_mtime_ns)
+
+    def scan(self):
+        """Pindahkan file yang ukurannya stabil selama stable_seconds ke antrean ready."""
+        now = time.monotonic()
+        busy = {source for _, source, _ in self.ready} | {source for source, _, _ in self.inflight.values()}
+        seen = set()
+        for folder in self.folders:
+            for source, stat in self._walk(folder):
+                seen.add(source)
+                if self.known.get(source) == stat or source in busy:
+                    continue
+                first = self.pending.get(source)
+                if first is None or first[0] != stat:
+                    self.pending[source] = (stat, now)
+                elif now - first[1] >= self.stable_seconds:
+                    del self.pending[source]
+                    self.ready.append((folder, source, stat))
+        # File yang dihapus/dipindah sebelum stabil
+        for source in set(self.pending) - seen:
+            del self.pending[source]
+
+    # --- Proses ---
+    def _planner(self, out_dir):
+        if out_dir not in self.planners:
+            os.makedirs(out_dir, exist_ok=True)
+            self.planners[out_dir] = OutputPlanner(out_dir, policy=self.policy,
+                                                   ext=OUTPUT_FORMATS[self.logic.output_format])
+        return self.planners[out_dir]
+
+    def _submit(self, pool, folder, source, stat):
+        try:
+            file_hash = file_sha256(source)
+        except OSError as e:
+            self._log(f"Gagal membaca {source}: {e}", level="ERROR")
+            return
+        inflight_hashes = {job['file_hash'] for _, _, job in self.inflight.values()}
+        if self.state.has_hash(file_hash) or file_hash in inflight_hashes:
+            self._log(f"Sudah pernah diproses (isi sama), dilewati: {source}", level="INFO")
+            self.state.record(source, stat, file_hash, "duplicate")
+            self.known[source] = stat
+            return
+
+        self._log(f"File baru: {source}", level="INFO")
+        with DocumentContext(source) as doc:
+            job = self.logic.prepare_file(doc, self._planner(self._output_dir(folder, source)), file_hash)
+        if not job:
+            # Dilewati kebijakan overwrite, atau gagal dibuka (password: dicoba lagi saat daemon di-restart)
+            self.state.record(source, stat, file_hash, self.logic.journal.pop(source, "failed"))
+            self.known[source] = stat
+            return
+        job.update(module_name="AUTO", function_name="", cache_max_bytes=self.cache_max_bytes,
+                   stream_min_pages=self.stream_min_pages,
+                   ledger_path=self.logic.ledger.path if self.logic.ledger else None)
+        self.inflight[pool.submit(run_job, job)] = (source, stat, job)
+
+    def _collect(self, futures):
+        for future in futures:
+            source, stat, job = self.inflight.pop(future)
+            try:
+                ok = future.result()
+            except Exception as e:
+                self._log(f"Error worker: {e}", level="ERROR")
+                ok = False
+            self.state.record(source, stat, job['file_hash'], "done" if ok else "failed", job['excel_path'])
+            self.known[source] = stat
+
+    def _loop(self, pool, once):
+        last_scan = None
+        while True:
+            if last_scan is None or time.monotonic() - last_scan >= self.interval:
+                self.scan()
+                last_scan = time.monotonic()
+            while self.ready and len(self.inflight) < self.workers * QUEUE_PER_WORKER:
+                self._submit(pool, *self.ready.pop(0))
+            if once and not self.ready and not self.inflight and not self.pending:
+                break
+            if self.inflight:
+                done, _ = wait(self.inflight, timeout=self.interval, return_when=FIRST_COMPLETED)
+                self._collect(done)
+            else:
+                time.sleep(self.interval)
+
+    def run(self, once=False):
+        """Loop utama. once=True: proses isi folder sekarang lalu berhenti (tanpa menunggu file baru)."""
+        error = check_format(self.logic.output_format)
+        if error:
+            print(error)
+            return 1
+        os.makedirs(self.output_root, exist_ok=True)
+        self.state = WatchState(os.path.join(self.output_root, WATCH_STATE_FILE))
+        self.known = self.state.known()
+        printer = threading.Thread(target=self._print_events, daemon=True)
+        printer.start()
+        set_cancel(self.logic.cancel_event)
+        self._log(f"Memantau {', '.join(self.folders)} -> {self.output_root} ({self.workers} worker).", level="INFO")
+
+        try:
+            with ProcessPoolExecutor(max_workers=self.workers, mp_context=self.ctx, initializer=init_worker,
+                                     initargs=(self.status_queue, self.logic.cancel_event)) as pool:
+                try:
+                    self._loop(pool, once)
+                except KeyboardInterrupt:
+                    # File yang sedang diproses tidak dicatat, jadi diproses lagi saat daemon jalan kembali
+                    self.logic.cancel()
+                    for future in self.inflight:
+                        future.cancel()
+                    self._log("Dihentikan.", level="INFO")
+        finally:
+            set_cancel(None)
+            self.state.close()
+            self.status_queue.put(None)
+            printer.join()
+        return 0
+
+
+def _stop(signum, frame):
+    # SIGTERM (service manager, kill) dihentikan sama seperti Ctrl+C
+    raise KeyboardInterrupt
+
+
+def main(argv=None):
+    settings = CoreLogic(None, None).load_settings()
+    ap = argparse.ArgumentParser(description="Ekstraksi otomatis PDF baru di folder inbox (tanpa GUI).")
+    ap.add_argument("folders", nargs="*", help="folder inbox (default: setting watch_folders)")
+    ap.add_argument("--output", help="folder output (default: setting watch_output_folder)")
+    ap.add_argument("--workers", type=int, help="jumlah worker proses (default: max_workers / jumlah CPU)")
+    ap.add_argument("--interval", type=float, default=WATCH_INTERVAL, help="detik antar scan folder")
+    ap.add_argument("--stable", type=float, default=WATCH_STABLE_SECONDS,
+                    help="detik ukuran file harus tetap sebelum diproses")
+    ap.add_argument("--once", action="store_true", help="proses isi folder sekarang lalu keluar")
+    args = ap.parse_args(argv)
+
+    folders = args.folders or settings.get("watch_folders") or []
+    output = args.output or settings.get("watch_output_folder")
+    if not folders or not output:
+        print("Folder inbox dan folder output harus diisi (argumen atau setting watch_folders/watch_output_folder).")
+        return 1
+    missing = [f for f in folders if not os.path.isdir(f)]
+    if missing:
+        print(f"Folder tidak ditemukan: {', '.join(missing)}")
+        return 1
+    signal.signal(signal.SIGTERM, _stop)
+    watcher = FolderWatcher(folders, output, settings, workers=args.workers,
+                            interval=args.interval, stable_seconds=args.stable)
+    return watcher.run(once=args.once)
+
+
+if __name__ == "__main__":
+    sys.exit(main())